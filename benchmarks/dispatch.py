@@ -0,0 +1,101 @@
+"""Measures EventManager.dispatch throughput for each dispatch mode.
+
+Usage:
+    python -m benchmarks.dispatch [--events N] [--callbacks N] [--modes task,batch,queue,sharded]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from newbial.core.events import BaseEvent
+from newbial.core.managers import EventManager
+
+
+class BenchEvent(BaseEvent):
+    __slots__ = ('n', 'channel_id')
+    __event_name__ = 'bench'
+
+    def __init__(self, n: int, channel_id: str) -> None:
+        self.n = n
+        self.channel_id = channel_id
+
+
+async def _drain() -> None:
+    current = asyncio.current_task()
+    while True:
+        tasks = [t for t in asyncio.all_tasks() if t is not current]
+        if not tasks:
+            return
+        await asyncio.gather(*tasks)
+
+
+async def run(
+    mode: Any,
+    events: int,
+    callbacks: int,
+    sync_ratio: float,
+    channels: int,
+) -> float:
+    manager = EventManager(mode=mode)
+    n_sync = int(callbacks * sync_ratio)
+
+    def sync_cb(event: BenchEvent) -> None:
+        pass
+
+    async def async_cb(event: BenchEvent) -> None:
+        pass
+
+    for i in range(callbacks):
+        manager.add_callback(BenchEvent, sync_cb if i < n_sync else async_cb)
+
+    dispatch = manager.dispatch
+    channel_ids = [f'C{i}' for i in range(channels)]
+    start = time.perf_counter()
+    for i in range(events):
+        dispatch(BenchEvent(i, channel_ids[i % channels]))
+        # Let the loop run scheduled callbacks regularly, as it would
+        # between socket frames
+        if not i % 100:
+            await asyncio.sleep(0)
+    if manager.queue is not None:
+        await manager.queue.join()
+        await manager.close()
+    await _drain()
+
+    return events / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=20_000)
+    parser.add_argument('--callbacks', type=int, default=12)
+    parser.add_argument('--sync-ratio', type=float, default=0.5)
+    parser.add_argument('--channels', type=int, default=50)
+    parser.add_argument('--modes', default='task,batch,queue,sharded')
+    args = parser.parse_args()
+
+    print(
+        f'{args.events} events, {args.callbacks} callbacks '
+        f'({args.sync_ratio:.0%} sync) per event'
+    )
+    results: dict[str, float] = {}
+    for mode in args.modes.split(','):
+        rate = asyncio.run(
+            run(mode, args.events, args.callbacks, args.sync_ratio, args.channels)
+        )
+        results[mode] = rate
+        print(f'  {mode:<8} {rate:>12,.0f} events/sec')
+
+    baseline = results.get('task')
+    if baseline:
+        for mode, rate in results.items():
+            if mode != 'task':
+                print(f'  {mode} vs task: {rate / baseline:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""A local stand-in for the parts of Slack the bot talks to.
+
+Serves socket mode (`apps.connections.open` and the websocket it returns)
+and a few Web API methods (`auth.test`, `chat.postMessage`, `users.info`
+and empty `users.list` / `conversations.list` for the state warm-up),
+with per-method rate limits answered by 429s. Point the bot at it with
+NEWBIAL_SLACK_BASE_URL (config slack.base_url).
+
+Usage:
+    python -m benchmarks.fake_slack [--host HOST] [--port PORT] [--no-limits]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, Callable
+
+from aiohttp import WSMsgType, web
+
+__all__ = ('FakeSlack',)
+
+# (requests per second, burst) per method and channel, like Slack's
+# "about one message per second per channel" for chat.postMessage
+DEFAULT_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    'chat.postMessage': (1.0, 5),
+    'users.info': (100.0, 100),
+}
+
+
+class _Bucket:
+    __slots__ = ('rate', 'tokens', 'capacity', 'updated')
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.capacity = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Takes a token, returns 0 or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class FakeSlack:
+    """The fake server. Messages are pushed to connected bots with
+    `send_message()`, which returns the ts of the message.
+
+    Sent envelopes, their acks and the bot's replies are timed with
+    `time.perf_counter()`: `ack_latencies` holds the seconds from sending
+    an envelope until its ack, `reply_latencies` the seconds from sending
+    a message until a `chat.postMessage` with it as `thread_ts`.
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        *,
+        rate_limits: dict[str, tuple[float, int]] | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.rate_limits = DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits
+        self.connections: list[web.WebSocketResponse] = []
+        self.ack_latencies: list[float] = []
+        self.reply_latencies: list[float] = []
+        self.sent = self.acked = self.replies = self.rate_limited = 0
+        self._clock = clock
+        self._runner: web.AppRunner | None = None
+        self._buckets: dict[tuple[str, str | None], _Bucket] = {}
+        self._envelopes: dict[str, float] = {}
+        self._messages: dict[str, float] = {}
+        self._ids = itertools.count()
+        self._next_connection = 0
+
+    def __repr__(self) -> str:
+        return f'<FakeSlack url={self.url!r} connections={len(self.connections)}>'
+
+    @property
+    def url(self) -> str:
+        """The Web API base URL."""
+        return f'http://{self.host}:{self.port}/api/'
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get('/link', self._websocket)
+        app.router.add_route('*', '/api/{method}', self._api)
+
+        self._runner = web.AppRunner(app, handle_signals=False)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        if not self.port:
+            server = site._server
+            assert server is not None
+            self.port = server.sockets[0].getsockname()[1]  # type: ignore
+
+    async def close(self) -> None:
+        for ws in tuple(self.connections):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def wait_for_connections(self, count: int, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        while len(self.connections) < count:
+            if time.monotonic() > deadline:
+                raise asyncio.TimeoutError(f'{len(self.connections)}/{count} connected')
+            await asyncio.sleep(0.01)
+
+    async def send_message(self, channel: str, user: str, text: str) -> str:
+        """Sends a `message` event to one of the connections, round robin."""
+        i = next(self._ids)
+        ts = f'{int(time.time())}.{i % 1_000_000:06d}'
+        envelope_id = f'env-{i}'
+        envelope = {
+            'envelope_id': envelope_id,
+            'type': 'events_api',
+            'accepts_response_payload': False,
+            'payload': {
+                'token': 'fake',
+                'team_id': 'T0',
+                'api_app_id': 'A0',
+                'type': 'event_callback',
+                'event_id': f'Ev{i:010d}',
+                'event_time': int(time.time()),
+                'event': {
+                    'type': 'message',
+                    'channel': channel,
+                    'user': user,
+                    'text': text,
+                    'ts': ts,
+                    'event_ts': ts,
+                    'channel_type': 'channel',
+                },
+            },
+        }
+
+        ws = self.connections[self._next_connection % len(self.connections)]
+        self._next_connection += 1
+
+        now = self._clock()
+        self._envelopes[envelope_id] = now
+        self._messages[ts] = now
+        self.sent += 1
+        await ws.send_str(json.dumps(envelope))
+
+        return ts
+
+    async def disconnect(self, index: int = 0) -> None:
+        """Asks a connection to reconnect, like Slack does every few hours."""
+        ws = self.connections[index]
+        await ws.send_str(
+            json.dumps({'type': 'disconnect', 'reason': 'refresh_requested'})
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'connections': len(self.connections),
+            'sent': self.sent,
+            'acked': self.acked,
+            'replies': self.replies,
+            'rate_limited': self.rate_limited,
+        }
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+
+        self.connections.append(ws)
+        await ws.send_str(
+            json.dumps({'type': 'hello', 'num_connections': len(self.connections)})
+        )
+
+        try:
+            async for message in ws:
+                if message.type is not WSMsgType.TEXT:
+                    continue
+                envelope_id = json.loads(message.data).get('envelope_id')
+                sent = self._envelopes.pop(envelope_id, None)
+                if sent is not None:
+                    self.acked += 1
+                    self.ack_latencies.append(self._clock() - sent)
+        finally:
+            self.connections.remove(ws)
+
+        return ws
+
+    async def _api(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+
+        params: dict[str, Any] = dict(request.query)
+        if request.can_read_body:
+            if request.content_type == 'application/json':
+                params.update(await request.json())
+            else:
+                params.update(await request.post())
+
+        retry_after = self._check_limit(method, params.get('channel'))
+        if retry_after:
+            self.rate_limited += 1
+            return web.json_response(
+                {'ok': False, 'error': 'ratelimited'},
+                status=429,
+                headers={'Retry-After': str(max(1, round(retry_after)))},
+            )
+
+        try:
+            handler = getattr(self, '_api_' + method.replace('.', '_'))
+        except AttributeError:
+            return web.json_response({'ok': False, 'error': 'unknown_method'})
+
+        return web.json_response(handler(params))
+
+    def _check_limit(self, method: str, channel: str | None) -> float:
+        try:
+            rate, burst = self.rate_limits[method]
+        except KeyError:
+            return 0.0
+
+        key = (method, channel)
+        try:
+            bucket = self._buckets[key]
+        except KeyError:
+            bucket = self._buckets[key] = _Bucket(rate, burst)
+
+        return bucket.take()
+
+    def _api_auth_test(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            'ok': True,
+            'url': 'https://fake.slack.com/',
+            'team': 'Fake',
+            'user': 'newbial',
+            'team_id': 'T0',
+            'user_id': 'U0',
+            'bot_id': 'B0',
+        }
+
+    def _api_apps_connections_open(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {'ok': True, 'url': f'ws://{self.host}:{self.port}/link'}
+
+    def _api_chat_postMessage(self, params: dict[str, Any]) -> dict[str, Any]:
+        thread_ts = params.get('thread_ts')
+        sent = self._messages.pop(thread_ts, None) if thread_ts else None
+        if sent is not None:
+            self.reply_latencies.append(self._clock() - sent)
+        self.replies += 1
+
+        ts = f'{int(time.time())}.{next(self._ids) % 1_000_000:06d}'
+        return {
+            'ok': True,
+            'channel': params.get('channel'),
+            'ts': ts,
+            'message': {
+                'type': 'message',
+                'user': 'U0',
+                'bot_id': 'B0',
+                'text': params.get('text', ''),
+                'ts': ts,
+                'thread_ts': thread_ts,
+            },
+        }
+
+    def _api_users_list(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {'ok': True, 'members': [], 'response_metadata': {'next_cursor': ''}}
+
+    def _api_conversations_list(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {'ok': True, 'channels': [], 'response_metadata': {'next_cursor': ''}}
+
+    def _api_users_info(self, params: dict[str, Any]) -> dict[str, Any]:
+        user_id = params.get('user', 'U0')
+        return {
+            'ok': True,
+            'user': {
+                'id': user_id,
+                'team_id': 'T0',
+                'name': user_id.lower(),
+                'real_name': f'User {user_id}',
+                'profile': {'display_name': user_id.lower()},
+                'is_bot': False,
+                'deleted': False,
+            },
+        }
+
+
+async def serve(host: str, port: int, limits: bool) -> None:
+    slack = FakeSlack(host, port, rate_limits=None if limits else {})
+    await slack.start()
+    print(f'Serving on {slack.url} (NEWBIAL_SLACK_BASE_URL={slack.url})')
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await slack.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--no-limits', action='store_true', help='never answer 429')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, not args.no_limits))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
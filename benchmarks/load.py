@@ -0,0 +1,127 @@
+"""Runs the bot against a local fake Slack and measures it under load.
+
+The fake sends RATE messages per second spread over CHANNELS channels for
+DURATION seconds. The bot replies in thread to every message, and the
+fake times each envelope until its ack and each message until its reply.
+
+Usage:
+    python -m benchmarks.load [--rate N] [--channels M] [--duration S] [--no-limits]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+os.environ.setdefault('SLACK_BOT_TOKEN', 'xoxb-load')
+os.environ.setdefault('SLACK_SOCKET_TOKEN', 'xapp-load')
+
+from slack_sdk.errors import SlackApiError
+
+from benchmarks.fake_slack import FakeSlack
+from newbial.slack.events import MessageEvent
+
+
+def percentiles(samples: list[float]) -> str:
+    if not samples:
+        return 'n/a'
+
+    samples = sorted(samples)
+    last = len(samples) - 1
+    values = (samples[int(last * q)] * 1e3 for q in (0.5, 0.9, 0.99))
+    return 'p50={:.2f}ms p90={:.2f}ms p99={:.2f}ms max={:.2f}ms'.format(
+        *values, samples[-1] * 1e3
+    )
+
+
+async def run(rate: float, channels: int, duration: float, limits: bool) -> None:
+    slack = FakeSlack(rate_limits=None if limits else {})
+    await slack.start()
+    os.environ['NEWBIAL_SLACK_BASE_URL'] = slack.url
+
+    from newbial.core.bot import Bot
+
+    bot = Bot()
+    handled = 0
+    errors: dict[str, int] = {}
+
+    async def reply(event: MessageEvent) -> None:
+        nonlocal handled
+        handled += 1
+        message = event.message
+        try:
+            await bot.web.chat_postMessage(
+                channel=message.channel_id, thread_ts=message.ts, text='pong'
+            )
+        except SlackApiError as exc:
+            error = exc.response.get('error', 'unknown')
+            errors[error] = errors.get(error, 0) + 1
+
+    bot.events.add_callback(MessageEvent, reply, subtype=None, bots=False)
+
+    await bot.web.connect()
+    sock_task = asyncio.create_task(bot.sock.connect())
+    await slack.wait_for_connections(len(bot.sock.clients), timeout=30.0)
+
+    count = int(rate * duration)
+    clock = time.perf_counter
+    start = clock()
+    for i in range(count):
+        delay = start + i / rate - clock()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slack.send_message(f'C{i % channels:08d}', f'U{i % 97:08d}', f'ping {i}')
+    sent = clock()
+
+    # Wait for the bot to catch up, then for replies still being retried
+    deadline = sent + max(5.0, duration)
+    while (slack.acked < count or handled < count) and clock() < deadline:
+        await asyncio.sleep(0.01)
+    handled_at = clock()
+    while slack.replies + sum(errors.values()) < count and clock() < deadline:
+        await asyncio.sleep(0.01)
+
+    elapsed = handled_at - start
+    print(f'{count} messages over {channels} channels in {sent - start:.3f}s')
+    print(
+        f'  handled   {handled} in {elapsed:.3f}s ({handled / elapsed:,.0f} events/sec)'
+    )
+    print(f'  acks      {slack.acked} {percentiles(slack.ack_latencies)}')
+    print(
+        f'  replies   {len(slack.reply_latencies)} {percentiles(slack.reply_latencies)}'
+    )
+    print(f'  errors    {errors or "none"} ({slack.rate_limited} answered 429)')
+    print(f'  socket    {bot.sock.stats()}')
+    print(f'  http      {bot.http.stats()}')
+
+    stats: dict[str, Any] = bot.events.stats()
+    print(f'  events    {stats}')
+
+    await asyncio.gather(
+        bot.web.close(),
+        bot.sock.close(),
+        bot.events.close(),
+        bot.executors.close(),
+        return_exceptions=True,
+    )
+    await sock_task
+    await bot.http.close()
+    await slack.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rate', type=float, default=200.0, help='messages per second')
+    parser.add_argument('--channels', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds')
+    parser.add_argument('--no-limits', action='store_true', help='never answer 429')
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rate, args.channels, args.duration, not args.no_limits))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""Replays a socket frame recording through the bot's state layer.
+
+Recordings are made by setting NEWBIAL_RECORDING (config recording.path)
+while the bot runs, or synthesized with --generate.
+
+Usage:
+    python -m benchmarks.replay RECORDING [--realtime] [--speed X] [--modules]
+    python -m benchmarks.replay RECORDING --generate N [--channels M]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any
+
+os.environ.setdefault('SLACK_BOT_TOKEN', 'xoxb-replay')
+os.environ.setdefault('SLACK_SOCKET_TOKEN', 'xapp-replay')
+
+from newbial.slack.clients import FrameRecorder, read_frames
+
+
+def percentiles(samples: list[float]) -> str:
+    if not samples:
+        return 'n/a'
+
+    samples = sorted(samples)
+    last = len(samples) - 1
+    values = (samples[int(last * q)] * 1e6 for q in (0.5, 0.9, 0.99))
+    return 'p50={:.1f}us p90={:.1f}us p99={:.1f}us max={:.1f}us'.format(
+        *values, samples[-1] * 1e6
+    )
+
+
+def generate(path: str, count: int, channels: int) -> None:
+    recorder = FrameRecorder(path)
+    recorder.open(truncate=True)
+
+    t = time.time()
+    for i in range(count):
+        ts = f'{int(t)}.{i:06d}'
+        event: dict[str, Any] = {
+            'type': 'message',
+            'channel': f'C{i % channels:08d}',
+            'user': f'U{i % 97:08d}',
+            'text': f'message number {i}',
+            'ts': ts,
+            'event_ts': ts,
+        }
+        if i % 10 == 9:
+            # Edit the previous message of the channel
+            prev = f'{int(t)}.{i - channels:06d}'
+            event = {
+                'type': 'message',
+                'subtype': 'message_changed',
+                'channel': event['channel'],
+                'ts': ts,
+                'event_ts': ts,
+                'message': {
+                    'type': 'message',
+                    'user': event['user'],
+                    'text': f'edited {i}',
+                    'ts': prev,
+                },
+            }
+        envelope = {
+            'envelope_id': f'env-{i}',
+            'type': 'events_api',
+            'payload': {
+                'token': 'x',
+                'team_id': 'T0',
+                'api_app_id': 'A0',
+                'type': 'event_callback',
+                'event_id': f'Ev{i:010d}',
+                'event_time': int(t),
+                'event': event,
+            },
+        }
+        recorder.write(json.dumps(envelope), t + i * 0.001)
+
+    recorder.close()
+    print(f'Wrote {count} frames to {path}')
+
+
+async def _drain(events: Any, ignored: set[asyncio.Task[Any]]) -> None:
+    # Waits for the tasks started by dispatching, long-running tasks
+    # (socket client loops, queue workers) are ignored
+    while events.stats().get('coalescing'):
+        await asyncio.sleep(0.01)
+
+    while True:
+        tasks = [
+            t
+            for t in asyncio.all_tasks() - ignored
+            if not t.get_name().startswith('EventManager worker')
+        ]
+        if not tasks:
+            return
+        await asyncio.wait(tasks)
+
+
+async def replay(path: str, realtime: bool, speed: float, load_modules: bool) -> None:
+    from newbial.core.bot import Bot
+
+    bot = Bot()
+    if load_modules:
+        await bot.modules.load()
+
+    ignored = asyncio.all_tasks()
+    callback = bot.state._message_callback
+    sock = bot.sock
+    loads = json.loads
+    clock = time.perf_counter
+    decode_times: list[float] = []
+    state_times: list[float] = []
+
+    frames = 0
+    first_t: float | None = None
+    start = clock()
+    for t, raw in read_frames(path):
+        if realtime:
+            if first_t is None:
+                first_t = t
+            delay = (t - first_t) / speed - (clock() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        t0 = clock()
+        data = loads(raw)
+        t1 = clock()
+        await callback(sock, data, raw)
+        t2 = clock()
+
+        decode_times.append(t1 - t0)
+        state_times.append(t2 - t1)
+        frames += 1
+
+        # Give dispatched callbacks a chance to run, like between socket frames
+        if not frames % 64:
+            await asyncio.sleep(0)
+
+    fed = clock()
+    if bot.events.queue is not None:
+        await bot.events.queue.join()
+    await _drain(bot.events, ignored)
+    end = clock()
+
+    elapsed = end - start
+    print(f'{frames} frames in {elapsed:.3f}s ({frames / elapsed:,.0f} events/sec)')
+    print(f'  decode    {percentiles(decode_times)}')
+    print(f'  state     {percentiles(state_times)}')
+    print(f'  handlers  drained {(end - fed) * 1e3:.1f}ms after the last frame')
+    print(f'  events    {bot.events.stats()}')
+
+    await asyncio.gather(
+        bot.sock.close(),
+        bot.events.close(),
+        bot.executors.close(),
+        bot.modules.unload(),
+        return_exceptions=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('recording')
+    parser.add_argument('--realtime', action='store_true', help='keep frame spacing')
+    parser.add_argument('--speed', type=float, default=1.0, help='realtime multiplier')
+    parser.add_argument('--modules', action='store_true', help='load configured modules')
+    parser.add_argument('--generate', type=int, metavar='N', help='write N frames')
+    parser.add_argument('--channels', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.generate:
+        generate(args.recording, args.generate, args.channels)
+    else:
+        asyncio.run(replay(args.recording, args.realtime, args.speed, args.modules))
+
+
+if __name__ == '__main__':
+    main()
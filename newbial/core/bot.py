@@ -7,13 +7,16 @@ from typing import TYPE_CHECKING, overload
 from newbial.core.events import ReadyEvent
 from newbial.core.managers import (
     EventManager,
+    ExecutorManager,
+    HTTPManager,
     IPCManager,
     StateManager,
     ModuleManager,
     TaskManager,
 )
 from newbial.slack.clients import (
-    SocketClient,
+    FrameRecorder,
+    SocketPool,
     WebClient,
 )
 from newbial.core.utils import Config
@@ -32,11 +35,14 @@ class Bot:
         closed: bool
         config: Config
         events: EventManager
+        executors: ExecutorManager
+        http: HTTPManager
         ipc: IPCManager
         logger: logging.Logger
         loop: asyncio.AbstractEventLoop
         modules: ModuleManager
-        sock: SocketClient
+        recorder: FrameRecorder | None
+        sock: SocketPool
         state: StateManager
         tasks: TaskManager
         web: WebClient
@@ -46,14 +52,22 @@ class Bot:
         self.loop = asyncio.get_event_loop()
         self.config = Config()
         self.logger = logging.getLogger(__name__)
+        self.http = HTTPManager(self)
         self.web = WebClient(self)
-        self.sock = SocketClient(self)
+        self.sock = SocketPool(self)
         self.ipc = IPCManager(self)
+        self.executors = ExecutorManager(self)
         self.events = EventManager(self)
         self.tasks = TaskManager(self)
         self.state = StateManager(self)
         self.modules = ModuleManager(self)
 
+        if self.config.recording and self.config.recording.path:
+            self.recorder = FrameRecorder(self.config.recording.path)
+            self.recorder.attach(self.sock)
+        else:
+            self.recorder = None
+
         self.events.add_callback(ReadyEvent, self._on_ready)
 
     def __repr__(self) -> str:
@@ -98,12 +112,14 @@ class Bot:
         try:
             self.logger.info('Connecting...')
             await self.ipc.connect()
+            await self.state.load()
             await self.modules.load()
 
-            await asyncio.gather(
-                self.web.connect(),
-                self.sock.connect(),
-            )
+            await self.web.connect()
+            # Runs alongside the socket connections and logs its own errors
+            self.state.start_warm_up()
+            # SocketPool.connect() only returns once the pool is closed
+            await self.sock.connect()
             self.logger.info('Connected.')
         except Exception as exc:
             self.logger.error('Something went wrong.', exc_info=exc)
@@ -120,6 +136,7 @@ class Bot:
             self.web.close(),
             self.sock.close(),
             self.modules.unload(),
+            self.events.close(),
             return_exceptions=True,
         ):
             if isinstance(result, Exception):
@@ -128,6 +145,18 @@ class Bot:
                     exc_info=result,
                 )
 
+        # The state snapshot is written once no more events come in,
+        # and before the executors it is written with are shut down
+        try:
+            await self.state.close()
+        except Exception as exc:
+            self.logger.error('Something went wrong during close().', exc_info=exc)
+        await self.executors.close()
+        await self.http.close()
+
+        if self.recorder is not None:
+            self.recorder.close()
+
         self.logger.info('Closed.')
 
     def _on_ready(self, event: ReadyEvent) -> None:
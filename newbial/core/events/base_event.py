@@ -1,9 +1,13 @@
-from typing import Any, Protocol, Sequence
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generic, Protocol, Sequence
 
+from newbial.types.core import T
 from newbial.types.events import Event
 
 __all__ = (
     'EVENT_MAPPING',
+    'EventPriority',
+    'lazy_attribute',
     'BaseEvent',
 )
 
@@ -11,8 +15,69 @@ __all__ = (
 EVENT_MAPPING: dict[str, Event] = {}
 
 
+class EventPriority(IntEnum):
+    # Lower values are handled first by queued dispatching
+    HIGH = 0
+    LOW = 1
+
+
+class _LazyAttribute(Generic[T]):
+    """An event attribute that is decoded from the payload on first access.
+
+    The value is stored in the slot named after the attribute with a leading
+    underscore, which the event class has to declare.
+
+    Examples
+    --------
+    ```py
+    class MyEvent(BaseEvent):
+        __slots__ = ('_data', '_subtype')
+
+        @lazy_attribute
+        def subtype(self) -> str | None:
+            return self._data.get('subtype')
+
+    ```"""
+
+    __slots__ = ('func', 'name', 'slot')
+
+    def __init__(self, func: Callable[[Any], T]) -> None:
+        self.func = func
+        self.name = self.slot = func.__name__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.slot = f'_{name}'
+
+    def __get__(self, instance: Any, owner: type | None = None) -> T:
+        if instance is None:
+            return self  # type: ignore
+
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.func(instance)
+            setattr(instance, self.slot, value)
+
+            return value
+
+    def __set__(self, instance: Any, value: T) -> None:
+        setattr(instance, self.slot, value)
+
+
+if TYPE_CHECKING:
+    # Type-checkers see the attribute as the value it decodes to, so lazy
+    # attributes can implement attributes declared by protocols (SlackEvent)
+    def lazy_attribute(func: Callable[[Any], T]) -> T:
+        ...
+
+else:
+    lazy_attribute = _LazyAttribute
+
+
 class BaseEvent(Event, Protocol):
     __slots__ = ()
+    __event_priority__: ClassVar[int] = EventPriority.HIGH
 
     def __repr__(self) -> str:
         attrs = ''.join(
@@ -52,12 +117,22 @@ class BaseEvent(Event, Protocol):
         else:
             attr_names.extend(d)
 
+        for cls in self.__class__.mro():
+            attr_names.extend(
+                k for k, v in cls.__dict__.items() if isinstance(v, _LazyAttribute)
+            )
+
         return tuple(set(attr_names))
 
     def toJSON(self) -> dict[str, Any]:
         d: dict[str, Any] = {}
 
         for k in self._get_attr_names():
+            # Private attributes (e.g. raw payloads behind lazy attributes)
+            # are not part of the snapshot
+            if k.startswith('_'):
+                continue
+
             v = getattr(self, k)
             try:
                 toJSON = v.toJSON
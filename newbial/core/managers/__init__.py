@@ -1,4 +1,6 @@
 from newbial.core.managers.event_manager import *
+from newbial.core.managers.executor_manager import *
+from newbial.core.managers.http_manager import *
 from newbial.core.managers.ipc_manager import *
 from newbial.core.managers.module_manager import *
 from newbial.core.managers.state_manager import *
@@ -2,59 +2,912 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING
+import pickle
+from inspect import isawaitable, iscoroutinefunction, ismethod
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, Generic, Hashable
 
-from newbial.core.events import ErrorEvent
-from newbial.core.utils import maybe_awaitable
+from newbial.core.events import EVENT_MAPPING, ErrorEvent, EventPriority
+from newbial.core.managers.executor_manager import ExecutorManager
+from newbial.core.utils import NULL, EventQueue, maybe_awaitable
+from newbial.types.events import EventT
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
     from typing_extensions import Self
 
     from newbial.core.bot import Bot
-    from newbial.types.core import EventT, EventCallback
+    from newbial.types.core import (
+        DispatchMode,
+        EventCallback,
+        OffloadKind,
+        OverflowPolicy,
+    )
     from newbial.types.events import Event
 
-__all__ = ('EventManager',)
+    _WaiterKey = tuple[type[Event], str | None, str | None]
+
+__all__ = (
+    'EventManager',
+    'EventStream',
+)
+
+# Filters that can be given to EventManager.add_callback(), see _Listener
+_FILTERS = ('channel', 'user', 'subtype', 'bots')
+
+
+class _Listener:
+    __slots__ = ('callback', 'invoke', 'seq', 'channel', 'user', 'subtype', 'bots')
+
+    if TYPE_CHECKING:
+        callback: EventCallback
+        # What is actually called on dispatch, differs from `callback`
+        # for callbacks offloaded to an executor
+        invoke: EventCallback
+        seq: int
+        # NULL means "not filtered"
+        channel: str
+        user: str
+        subtype: str | None
+        bots: bool
+
+    def __init__(
+        self,
+        callback: EventCallback,
+        invoke: EventCallback,
+        seq: int,
+        **filters: Any,
+    ) -> None:
+        self.callback = callback
+        self.invoke = invoke
+        self.seq = seq
+        for name in _FILTERS:
+            setattr(self, name, filters.get(name, NULL))
+
+    def __repr__(self) -> str:
+        filters = ''.join(
+            f' {name}={getattr(self, name)!r}'
+            for name in _FILTERS
+            if getattr(self, name) is not NULL
+        )
+        return f'<_Listener callback={self.callback}{filters}>'
+
+    @property
+    def filtered(self) -> bool:
+        return any(getattr(self, name) is not NULL for name in _FILTERS)
+
+    def matches(self, channel: Any, user: Any, subtype: Any, bot: Any) -> bool:
+        return (
+            (self.channel is NULL or self.channel == channel)
+            and (self.user is NULL or self.user == user)
+            and (self.subtype is NULL or self.subtype == subtype)
+            and (self.bots is NULL or self.bots == bot)
+        )
+
+
+class _CallbackIndex:
+    """The callbacks registered for an event type.
+
+    Filtered listeners are stored in a hash index keyed by their most
+    selective filter (channel, then user, then subtype), so dispatching
+    an event only has to look at the listeners that could match it.
+    """
+
+    __slots__ = (
+        'listeners',
+        'unfiltered',
+        'by_channel',
+        'by_user',
+        'by_subtype',
+        'filtered',
+        '_callbacks',
+        '_seq',
+    )
+
+    if TYPE_CHECKING:
+        listeners: list[_Listener]
+        unfiltered: list[_Listener]
+        by_channel: dict[str, list[_Listener]]
+        by_user: dict[str, list[_Listener]]
+        by_subtype: dict[str | None, list[_Listener]]
+        filtered: int
+        _callbacks: list[EventCallback]
+        _seq: int
+
+    def __init__(self) -> None:
+        self.listeners = []
+        self.unfiltered = []
+        self.by_channel = {}
+        self.by_user = {}
+        self.by_subtype = {}
+        self.filtered = 0
+        self._callbacks = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self.listeners)
+
+    def _index_for(self, listener: _Listener) -> tuple[dict[Any, list[_Listener]], Any]:
+        if listener.channel is not NULL:
+            return self.by_channel, listener.channel
+        elif listener.user is not NULL:
+            return self.by_user, listener.user
+        else:
+            return self.by_subtype, listener.subtype
+
+    def add(
+        self,
+        callback: EventCallback,
+        invoke: EventCallback,
+        **filters: Any,
+    ) -> _Listener:
+        self._seq += 1
+        listener = _Listener(callback, invoke, self._seq, **filters)
+
+        self.listeners.append(listener)
+        if listener.channel is listener.user is listener.subtype is NULL:
+            self.unfiltered.append(listener)
+        else:
+            index, key = self._index_for(listener)
+            index.setdefault(key, []).append(listener)
+        if listener.filtered:
+            self.filtered += 1
+        self._callbacks = [l.invoke for l in self.listeners]
+
+        return listener
+
+    def remove(self, callback: EventCallback) -> _Listener | None:
+        for listener in self.listeners:
+            if listener.callback == callback:
+                break
+        else:
+            return None
+
+        self.listeners.remove(listener)
+        if listener.channel is listener.user is listener.subtype is NULL:
+            self.unfiltered.remove(listener)
+        else:
+            index, key = self._index_for(listener)
+            bucket = index[key]
+            bucket.remove(listener)
+            if not bucket:
+                del index[key]
+        if listener.filtered:
+            self.filtered -= 1
+        self._callbacks = [l.invoke for l in self.listeners]
+
+        return listener
+
+    def match(self, event: Event) -> list[EventCallback]:
+        """Returns the callbacks that should be invoked for `event`,
+        in registration order.
+        """
+        if not self.filtered:
+            return self._callbacks
+
+        channel = getattr(event, 'channel_id', None)
+        user = getattr(event, 'user_id', None)
+        subtype = getattr(event, 'subtype', None)
+        bot = getattr(event, 'is_bot', None)
+
+        matched: list[_Listener] = []
+        buckets = 0
+        for bucket in (
+            self.by_channel.get(channel) if channel is not None else None,
+            self.by_user.get(user) if user is not None else None,
+            self.by_subtype.get(subtype),
+            self.unfiltered,
+        ):
+            if bucket:
+                buckets += 1
+                for listener in bucket:
+                    if listener.matches(channel, user, subtype, bot):
+                        matched.append(listener)
+
+        if buckets > 1:
+            matched.sort(key=lambda l: l.seq)
+
+        return [l.invoke for l in matched]
+
+
+def _check_picklable(callback: EventCallback) -> None:
+    # Checked on registration, pickling fails on every dispatch otherwise
+    if ismethod(callback):
+        # Pickling a method pickles its instance, e.g. a Module and the bot
+        raise TypeError(
+            f'Cannot run method {callback.__qualname__!r} in a process, '
+            'use a module-level function'
+        )
+
+    try:
+        pickle.dumps(callback)
+    except Exception as exc:
+        raise TypeError(
+            f'Cannot run {callback!r} in a process, it cannot be pickled '
+            '(use a module-level function)'
+        ) from exc
+
+
+def _check_filter(event: type[Event], name: str, attr: str) -> None:
+    if not hasattr(event, attr):
+        raise TypeError(
+            f'Event {event.__event_name__!r} does not support filtering by {name!r}'
+        )
+
+
+class _Waiter:
+    __slots__ = ('key', 'check', 'future', 'items', 'maxsize', 'ready', 'dropped')
+
+    if TYPE_CHECKING:
+        key: _WaiterKey
+        check: Callable[[Any], bool] | None
+        # Set for one-shot waiters (wait_for)
+        future: asyncio.Future[Any] | None
+        # Set for streams
+        items: deque[Any] | None
+        maxsize: int
+        ready: asyncio.Event | None
+        dropped: int
+
+    def __init__(
+        self,
+        key: _WaiterKey,
+        check: Callable[[Any], bool] | None,
+        future: asyncio.Future[Any] | None = None,
+        maxsize: int = 0,
+    ) -> None:
+        self.key = key
+        self.check = check
+        self.future = future
+        self.dropped = 0
+        if future is None:
+            self.items = deque()
+            self.maxsize = maxsize
+            self.ready = asyncio.Event()
+        else:
+            self.items = None
+            self.maxsize = 0
+            self.ready = None
+
+    def deliver(self, event: Event) -> bool:
+        """Hands `event` to the waiter if it passes the check.
+
+        Returns `True` if the waiter is done and should be removed.
+        """
+        future = self.future
+        if future is not None and future.done():
+            return True
+
+        if self.check is not None:
+            try:
+                if not self.check(event):
+                    return False
+            except Exception as exc:
+                if future is not None:
+                    future.set_exception(exc)
+                    return True
+                raise
+
+        if future is not None:
+            future.set_result(event)
+            return True
+
+        assert self.items is not None and self.ready is not None
+        if self.maxsize > 0 and len(self.items) >= self.maxsize:
+            self.items.popleft()
+            self.dropped += 1
+        self.items.append(event)
+        self.ready.set()
+
+        return False
+
+
+class EventStream(Generic[EventT]):
+    """An async iterator over dispatched events, see `EventManager.stream()`."""
+
+    __slots__ = ('_manager', '_waiter', '_timeout')
+
+    if TYPE_CHECKING:
+        _manager: EventManager
+        _waiter: _Waiter
+        _timeout: float | None
+
+    def __init__(
+        self,
+        manager: EventManager,
+        waiter: _Waiter,
+        timeout: float | None,
+    ) -> None:
+        self._manager = manager
+        self._waiter = waiter
+        self._timeout = timeout
+
+    def __repr__(self) -> str:
+        event, channel, user = self._waiter.key
+        return (
+            f'<EventStream event={event.__event_name__!r} channel={channel!r} '
+            f'user={user!r} closed={self.closed}>'
+        )
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> EventT:
+        waiter = self._waiter
+        assert waiter.items is not None and waiter.ready is not None
+
+        while not waiter.items:
+            if self.closed:
+                raise StopAsyncIteration
+
+            waiter.ready.clear()
+            try:
+                await asyncio.wait_for(waiter.ready.wait(), self._timeout)
+            except asyncio.TimeoutError:
+                self.close()
+                raise StopAsyncIteration
+
+        return waiter.items.popleft()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return not self._manager._has_waiter(self._waiter)
+
+    @property
+    def dropped(self) -> int:
+        return self._waiter.dropped
+
+    def close(self) -> None:
+        """Stops receiving events, already received events can still be iterated."""
+        waiter = self._waiter
+        self._manager._remove_waiter(waiter)
+        assert waiter.ready is not None
+        waiter.ready.set()
 
 
 class EventManager:
     if TYPE_CHECKING:
         _loop: AbstractEventLoop
         _logger: logging.Logger
-        _events: dict[type[Event], list[EventCallback]]
+        _mode: DispatchMode
+        _dispatch_callbacks: Callable[[Event, list[EventCallback], bool], None]
+        _events: dict[type[Event], _CallbackIndex]
+        _queue: EventQueue[tuple[Event, list[EventCallback]]] | None
+        _workers: list[asyncio.Task[None]]
+        # Tasks created by the "task", "batch" and "sharded" modes
+        _tasks: set[asyncio.Task[Any]]
+        _worker_count: int
+        _shards: dict[str, deque[tuple[Event, list[EventCallback]]]]
+        _waiters: dict[_WaiterKey, dict[_Waiter, None]]
+        _waiter_types: dict[type[Event], int]
+        _coalesce_windows: dict[type[Event], float]
+        # [event, handle_errors, timer] by coalescing key
+        _coalescing: dict[tuple[type[Event], Hashable], list[Any]]
+        _coalesced: int
+        _executors: ExecutorManager | None
+        # Created by _offloaded() when there is no bot, closed by close()
+        _owned_executors: ExecutorManager | None
 
-    def __init__(self, bot: Bot | None = None) -> None:
+    def __init__(
+        self,
+        bot: Bot | None = None,
+        *,
+        mode: DispatchMode | None = None,
+        workers: int | None = None,
+        queue_size: int | None = None,
+        overflow: OverflowPolicy | None = None,
+    ) -> None:
         if bot is not None:
             self._loop = bot.loop
+            config = bot.config.events
+            mode = mode or config.dispatch_mode
+            if config.queue:
+                workers = workers or config.queue.workers
+                queue_size = queue_size or config.queue.size
+                overflow = overflow or config.queue.overflow
+            coalesce = config.coalesce or {}
+            self._executors = bot.executors
         else:
             self._loop = asyncio.get_event_loop()
+            coalesce = {}
+            self._executors = None
+        self._owned_executors = None
         self._logger = logging.getLogger(__name__)
         self._events = {}
+        self._queue = None
+        self._workers = []
+        self._tasks = set()
+        self._shards = {}
+        self._waiters = {}
+        self._waiter_types = {}
+        self._coalesce_windows = {}
+        self._coalescing = {}
+        self._coalesced = 0
+
+        for event_name, window in coalesce.items():
+            try:
+                event = EVENT_MAPPING[event_name]
+            except KeyError:
+                self._logger.warning(f'Cannot coalesce unknown event "{event_name}"')
+            else:
+                self.set_coalesce_window(event, window)  # type: ignore
+
+        # "task" schedules a task per callback (one per callback per event)
+        # "batch" calls sync callbacks inline and runs the remaining
+        # (async) callbacks of an event sequentially in a single task
+        # "queue" puts events in a bounded queue consumed by a pool of workers
+        # "sharded" runs the callbacks of events from the same channel one
+        # event after another, while different channels run concurrently
+        if not mode:
+            mode = 'task'
+        try:
+            self._dispatch_callbacks = getattr(self, f'_dispatch_{mode}')
+        except AttributeError:
+            raise ValueError(f'Invalid dispatch mode {mode!r}') from None
+        self._mode = mode
+
+        if mode == 'queue':
+            self._worker_count = workers or 4
+            self._queue = EventQueue(
+                len(EventPriority),
+                queue_size or 1000,
+                overflow or 'block',
+                loop=self._loop,
+            )
 
     def __repr__(self) -> str:
         events = list(e.__event_name__ for e in self._events)
-        return f"<EventManager events={events}>"
+        return f"<EventManager mode={self._mode!r} events={events}>"
+
+    @property
+    def mode(self) -> DispatchMode:
+        return self._mode
+
+    @property
+    def queue(self) -> EventQueue[tuple[Event, list[EventCallback]]] | None:
+        return self._queue
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {'mode': self._mode}
+
+        if self._queue is not None:
+            stats['queue'] = self._queue.stats()
+            stats['workers'] = len(self._workers)
+
+        if self._mode == 'sharded':
+            stats['shards'] = len(self._shards)
+            stats['pending'] = sum(map(len, self._shards.values()))
+
+        if self._coalesce_windows:
+            stats['coalesced'] = self._coalesced
+            stats['coalescing'] = len(self._coalescing)
+
+        return stats
+
+    async def close(self) -> None:
+        # Events held back for coalescing are dispatched now, and their
+        # callbacks are left to finish
+        running = set(self._tasks)
+        for key in tuple(self._coalescing):
+            self._flush_coalesced(key)
+        flushed = self._tasks - running
+        if flushed:
+            await asyncio.gather(*flushed, return_exceptions=True)
+
+        tasks = [*self._workers, *self._tasks]
+        self._workers = []
+        self._tasks.clear()
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        executors = self._owned_executors
+        if executors is not None:
+            await executors.close()
+
+    async def wait_for_capacity(self, priority: int | None = None) -> None:
+        """Waits until an event of `priority` (or, by default, of any
+        priority) can be queued without exceeding the queue's bounds.
+
+        This only waits when dispatching with a queue using the "block"
+        overflow policy, where `dispatch()` refuses events once the queue is
+        full. Producers which can be suspended (such as the socket message
+        handler) should await this right before dispatching.
+        """
+        queue = self._queue
+        if queue is None or queue.policy != 'block':
+            return
+
+        if priority is not None:
+            await queue.wait_not_full(priority)
+            return
+
+        # Waiting for one lane can let the others fill up again
+        while True:
+            for lane in range(len(EventPriority)):
+                if queue.full(lane):
+                    await queue.wait_not_full(lane)
+                    break
+            else:
+                return
+
+    def has_subscribers(self, event: type[Event]) -> bool:
+        """Whether dispatching `event` would reach anything, i.e. a callback
+        (including those forwarding to remote modules) or a waiter.
+
+        Producers can use this to skip building events nobody listens to.
+        """
+        return event in self._events or event in self._waiter_types
+
+    def set_coalesce_window(self, event: type[Event], window: float | None) -> None:
+        """Coalesces dispatches of `event` over `window` seconds.
+
+        The first dispatched event is held back for `window` seconds, events
+        dispatched meanwhile with the same coalescing key (e.g. the same
+        edited message) are merged into it instead of being dispatched.
+        A window of `None` or `0` disables coalescing.
+
+        The event type has to implement `_coalesce_key()` and `_coalesce()`.
+        """
+        if not window:
+            self._coalesce_windows.pop(event, None)
+            return
+
+        if not hasattr(event, '_coalesce_key'):
+            raise TypeError(f'Event {event.__event_name__!r} cannot be coalesced')
+
+        self._coalesce_windows[event] = window
 
     def dispatch(self, event: Event, *, handle_errors: bool = True) -> None:
+        cls = event.__class__
+        if cls in self._coalesce_windows:
+            key = (cls, event._coalesce_key())  # type: ignore
+            try:
+                pending = self._coalescing[key]
+            except KeyError:
+                timer = self._loop.call_later(
+                    self._coalesce_windows[cls], self._flush_coalesced, key
+                )
+                self._coalescing[key] = [event, handle_errors, timer]
+            else:
+                pending[0] = pending[0]._coalesce(event)
+                self._coalesced += 1
+            return
+
+        self._dispatch(event, handle_errors)
+
+    def _flush_coalesced(self, key: tuple[type[Event], Hashable]) -> None:
         try:
-            callbacks = self._events[event.__class__]
+            event, handle_errors, timer = self._coalescing.pop(key)
         except KeyError:
             pass
         else:
-            create_task = self._loop.create_task
-            event_info = repr(event)
+            timer.cancel()
+            self._dispatch(event, handle_errors)
+
+    def _dispatch(self, event: Event, handle_errors: bool) -> None:
+        if event.__class__ in self._waiter_types:
+            self._resolve_waiters(event)
+
+        try:
+            index = self._events[event.__class__]
+        except KeyError:
+            pass
+        else:
+            callbacks = index.match(event)
+            if not callbacks:
+                return
+
+            if handle_errors:
+                self._dispatch_callbacks(event, callbacks, handle_errors)
+            else:
+                # Errors raised by inline callbacks would propagate into
+                # the dispatcher, so keep them contained in their own tasks
+                self._dispatch_task(event, callbacks, handle_errors)
+
+    async def wait_for(
+        self,
+        event: type[EventT],
+        check: Callable[[EventT], bool] | None = None,
+        *,
+        channel: str | None = None,
+        user: str | None = None,
+        timeout: float | None = None,
+    ) -> EventT:
+        """Waits for the next dispatched `event` from `channel` and/or `user`
+        for which `check` returns `True`.
+
+        Raises `asyncio.TimeoutError` if no matching event is dispatched
+        within `timeout` seconds.
+        """
+        waiter = self._add_waiter(
+            event, check, channel, user, future=self._loop.create_future()
+        )
+        assert waiter.future is not None
+
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        finally:
+            self._remove_waiter(waiter)
+
+    def stream(
+        self,
+        event: type[EventT],
+        check: Callable[[EventT], bool] | None = None,
+        *,
+        channel: str | None = None,
+        user: str | None = None,
+        timeout: float | None = None,
+        maxsize: int = 0,
+    ) -> EventStream[EventT]:
+        """Returns an async iterator over the matching dispatched events,
+        see `wait_for()` for the arguments.
+
+        Events are collected as soon as this is called. Iteration stops when
+        no event is received for `timeout` seconds or the stream is closed.
+        When more than `maxsize` events are pending the oldest is dropped.
+
+        ```py
+        async with bot.events.stream(MessageEvent, channel='C123') as stream:
+            async for event in stream:
+                ...
+        ```
+        """
+        waiter = self._add_waiter(event, check, channel, user, maxsize=maxsize)
+
+        return EventStream(self, waiter, timeout)
 
-            for callback in callbacks:
-                if handle_errors:
-                    coro = self._wrapped_callback(callback, event)
+    def _add_waiter(
+        self,
+        event: type[Event],
+        check: Callable[[Any], bool] | None,
+        channel: str | None,
+        user: str | None,
+        **kwargs: Any,
+    ) -> _Waiter:
+        if channel is not None:
+            _check_filter(event, 'channel', 'channel_id')
+        if user is not None:
+            _check_filter(event, 'user', 'user_id')
+
+        key = (event, channel, user)
+        waiter = _Waiter(key, check, **kwargs)
+
+        try:
+            waiters = self._waiters[key]
+        except KeyError:
+            waiters = self._waiters[key] = {}
+        waiters[waiter] = None
+
+        counts = self._waiter_types
+        counts[event] = counts.get(event, 0) + 1
+
+        return waiter
+
+    def _has_waiter(self, waiter: _Waiter) -> bool:
+        try:
+            return waiter in self._waiters[waiter.key]
+        except KeyError:
+            return False
+
+    def _remove_waiter(self, waiter: _Waiter) -> None:
+        key = waiter.key
+        try:
+            waiters = self._waiters[key]
+            del waiters[waiter]
+        except KeyError:
+            return
+
+        if not waiters:
+            del self._waiters[key]
+
+        event = key[0]
+        counts = self._waiter_types
+        counts[event] -= 1
+        if not counts[event]:
+            del counts[event]
+
+    def _resolve_waiters(self, event: Event) -> None:
+        cls = event.__class__
+        channel = getattr(event, 'channel_id', None)
+        user = getattr(event, 'user_id', None)
+
+        keys: list[_WaiterKey] = [(cls, None, None)]
+        if channel is not None:
+            keys.append((cls, channel, None))
+        if user is not None:
+            keys.append((cls, None, user))
+            if channel is not None:
+                keys.append((cls, channel, user))
+
+        waiters = self._waiters
+        for key in keys:
+            try:
+                bucket = waiters[key]
+            except KeyError:
+                continue
+
+            for waiter in tuple(bucket):
+                try:
+                    done = waiter.deliver(event)
+                except Exception as exc:
+                    # A stream's check failed
+                    self._handle_error(exc, event)
                 else:
-                    # Not handling errors here, they will propagate
-                    coro = maybe_awaitable(callback, event)
+                    if done:
+                        self._remove_waiter(waiter)
+
+    def _dispatch_task(
+        self,
+        event: Event,
+        callbacks: list[EventCallback],
+        handle_errors: bool,
+    ) -> None:
+        create_task = self._create_task
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        event_info = repr(event) if debug else None
+
+        for callback in callbacks:
+            if handle_errors:
+                coro = self._wrapped_callback(callback, event)
+            else:
+                # Not handling errors here, they will propagate
+                coro = maybe_awaitable(callback, event)
 
+            if debug:
                 details = f'{event_info} @ {callback}'
                 create_task(coro, name=details)
                 self._logger.debug(f'Dispatching: {details}')
+            else:
+                create_task(coro)
+
+    def _dispatch_batch(
+        self,
+        event: Event,
+        callbacks: list[EventCallback],
+        handle_errors: bool,
+    ) -> None:
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        pending: list[Awaitable[Any]] | None = None
+
+        for callback in callbacks:
+            if debug:
+                self._logger.debug(f'Dispatching: {event!r} @ {callback}')
+
+            try:
+                ret = callback(event)
+            except Exception as exc:
+                self._handle_error(exc, event)
+                continue
+
+            if isawaitable(ret):
+                if pending is None:
+                    pending = []
+                pending.append(ret)
+
+        if pending is not None:
+            coro = self._run_pending(event, pending)
+            if debug:
+                self._create_task(coro, name=f'{event!r} @ {len(pending)} callbacks')
+            else:
+                self._create_task(coro)
+
+    def _dispatch_queue(
+        self,
+        event: Event,
+        callbacks: list[EventCallback],
+        handle_errors: bool,
+    ) -> None:
+        if not self._workers:
+            self._start_workers()
+
+        assert self._queue is not None
+        priority = event.__event_priority__
+        # High priority (core) events are never dropped, they may go over the bound
+        force = priority == EventPriority.HIGH
+        if not self._queue.put_nowait((event, callbacks), priority, force=force):
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug(f'Queue full, dropped an event: {event!r}')
+
+    def _create_task(
+        self, coro: Coroutine[Any, Any, Any], name: str | None = None
+    ) -> None:
+        task = self._loop.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _start_workers(self) -> None:
+        create_task = self._loop.create_task
+
+        self._workers = [
+            create_task(self._worker(), name=f'EventManager worker {i}')
+            for i in range(self._worker_count)
+        ]
+        self._logger.debug(f'Started {self._worker_count} workers.')
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        get = self._queue.get
+        task_done = self._queue.task_done
+
+        while True:
+            event, callbacks = await get()
+            await self._invoke_callbacks(event, callbacks)
+            task_done()
+
+    def _dispatch_sharded(
+        self,
+        event: Event,
+        callbacks: list[EventCallback],
+        handle_errors: bool,
+    ) -> None:
+        key = getattr(event, 'channel_id', None)
+        if key is None:
+            # Not bound to a channel, no ordering to preserve
+            self._dispatch_batch(event, callbacks, handle_errors)
+            return
+
+        try:
+            shard = self._shards[key]
+        except KeyError:
+            shard = self._shards[key] = deque()
+            shard.append((event, callbacks))
+
+            coro = self._run_shard(key, shard)
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._create_task(coro, name=f'EventManager shard {key}')
+            else:
+                self._create_task(coro)
+        else:
+            shard.append((event, callbacks))
+
+    async def _run_shard(
+        self,
+        key: str,
+        shard: deque[tuple[Event, list[EventCallback]]],
+    ) -> None:
+        """Runs the events of a shard in order until it is empty,
+        the shard is discarded once idle.
+        """
+        try:
+            while shard:
+                event, callbacks = shard.popleft()
+                await self._invoke_callbacks(event, callbacks)
+        finally:
+            del self._shards[key]
+
+    async def _invoke_callbacks(
+        self,
+        event: Event,
+        callbacks: list[EventCallback],
+    ) -> None:
+        for callback in callbacks:
+            try:
+                await maybe_awaitable(callback, event)
+            except Exception as exc:
+                self._handle_error(exc, event)
+
+    async def _run_pending(
+        self,
+        event: Event,
+        pending: list[Awaitable[Any]],
+    ) -> None:
+        """Awaits the awaitables returned by the callbacks of `event`
+        one after another, handling any exceptions raised by them.
+        """
+        for awaitable in pending:
+            try:
+                await awaitable
+            except Exception as exc:
+                self._handle_error(exc, event)
 
     async def _wrapped_callback(
         self,
@@ -67,53 +920,105 @@ class EventManager:
         try:
             await maybe_awaitable(callback, event)
         except Exception as exc:
-            self._logger.error(
-                'Something went wrong while dispatching a callback '
-                f'for event {event} ("{event.__class__.__event_name__}")',
-                exc_info=exc,
-            )
+            self._handle_error(exc, event)
 
-            # Dispatch an "error" event without handling errors to
-            # Prevent recursion and to expose faulty error handlers
-            self.dispatch(ErrorEvent(exc), handle_errors=False)
+    def _handle_error(self, exc: Exception, event: Event) -> None:
+        self._logger.error(
+            'Something went wrong while dispatching a callback '
+            f'for event {event} ("{event.__class__.__event_name__}")',
+            exc_info=exc,
+        )
+
+        # Dispatch an "error" event without handling errors to
+        # Prevent recursion and to expose faulty error handlers
+        self.dispatch(ErrorEvent(exc), handle_errors=False)
 
     def add_callback(
         self,
         event: type[EventT],
         callback: EventCallback[EventT],
+        *,
+        channel: str = NULL,
+        user: str = NULL,
+        subtype: str | None = NULL,
+        bots: bool = NULL,
+        offload: OffloadKind | None = None,
     ) -> Self:
-        callbacks: list[EventCallback]
+        """Registers `callback` to be invoked when `event` is dispatched.
+
+        The keyword-only arguments filter the events `callback` is invoked
+        for. `subtype=None` only matches events without a subtype and
+        `bots=False` skips events caused by bots. Filters can only be used
+        with events that expose the matching attribute (`channel_id`,
+        `user_id`, `subtype` and `is_bot` respectively).
+
+        `offload` runs a sync callback in the bot's thread or process pool,
+        see `newbial.core.utils.offload()` which can be used instead.
+        """
+        filters: dict[str, Any] = {}
+        for name, attr, value in (
+            ('channel', 'channel_id', channel),
+            ('user', 'user_id', user),
+            ('subtype', 'subtype', subtype),
+            ('bots', 'is_bot', bots),
+        ):
+            if value is not NULL:
+                _check_filter(event, name, attr)
+                filters[name] = value
+
+        if offload is None:
+            offload = getattr(callback, '__newbial_offload__', None)
+        if offload is not None:
+            invoke = self._offloaded(callback, offload)
+        else:
+            invoke = callback
 
         try:
-            callbacks = self._events[event]
+            index = self._events[event]
         except KeyError:
-            callbacks = self._events[event] = []
+            index = self._events[event] = _CallbackIndex()
 
-        callbacks.append(callback)
-        self._logger.debug(f'Added callback for event {event.__event_name__}: {callback}')
+        listener = index.add(callback, invoke, **filters)
+        self._logger.debug(f'Added callback for event {event.__event_name__}: {listener}')
 
         return self
 
+    def _offloaded(self, callback: EventCallback, kind: OffloadKind) -> EventCallback:
+        if iscoroutinefunction(callback):
+            raise TypeError(f'Cannot offload coroutine function {callback!r}')
+        if kind == 'process':
+            _check_picklable(callback)
+
+        executors = self._executors
+        if executors is None:
+            executors = self._executors = self._owned_executors = ExecutorManager()
+        run = executors.run
+
+        if kind == 'process':
+            # Events hold references to unpicklable objects (state, clients),
+            # so processes get a snapshot of the event instead
+            return lambda event: run(kind, callback, event.toJSON())
+        elif kind == 'thread':
+            return lambda event: run(kind, callback, event)
+        else:
+            raise ValueError(f'Invalid offload kind {kind!r}')
+
     def remove_callback(
         self,
         event: type[EventT],
         callback: EventCallback[EventT],
     ) -> Self:
         try:
-            callbacks = self._events[event]
+            index = self._events[event]
         except KeyError:
             pass
         else:
-            try:
-                callbacks.remove(callback)
-            except ValueError:
-                pass
-            else:
+            if index.remove(callback) is not None:
                 self._logger.debug(
                     f'Removed callback for event {event.__event_name__}: {callback}'
                 )
 
-            if not len(callbacks):
+            if not len(index):
                 del self._events[event]
 
         return self
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+
+    from newbial.core.bot import Bot
+    from newbial.types.core import OffloadKind
+
+__all__ = ('ExecutorManager',)
+
+
+class ExecutorManager:
+    """Owns the thread and process pools used to run blocking callbacks
+    outside of the event loop.
+
+    Pools are created on first use and sized by `executors.threads` and
+    `executors.processes` in the config.
+    """
+
+    if TYPE_CHECKING:
+        _loop: AbstractEventLoop
+        _logger: logging.Logger
+        _sizes: dict[OffloadKind, int]
+        _pools: dict[OffloadKind, Executor]
+
+    def __init__(
+        self,
+        bot: Bot | None = None,
+        *,
+        threads: int | None = None,
+        processes: int | None = None,
+    ) -> None:
+        if bot is not None:
+            self._loop = bot.loop
+            config = bot.config.executors
+            if config:
+                threads = threads or config.threads
+                processes = processes or config.processes
+        else:
+            self._loop = asyncio.get_event_loop()
+        self._logger = logging.getLogger(__name__)
+
+        cpus = os.cpu_count() or 1
+        self._sizes = {
+            'thread': threads or min(32, cpus + 4),
+            'process': processes or cpus,
+        }
+        self._pools = {}
+
+    def __repr__(self) -> str:
+        return f'<ExecutorManager sizes={self._sizes} running={list(self._pools)}>'
+
+    def _get_pool(self, kind: OffloadKind) -> Executor:
+        try:
+            return self._pools[kind]
+        except KeyError:
+            pass
+
+        size = self._sizes[kind]
+        if kind == 'thread':
+            pool = ThreadPoolExecutor(size, thread_name_prefix='newbial')
+        elif kind == 'process':
+            pool = ProcessPoolExecutor(size)
+        else:
+            raise ValueError(f'Invalid executor kind {kind!r}')
+
+        self._logger.debug(f'Started {kind} pool with {size} workers.')
+        self._pools[kind] = pool
+
+        return pool
+
+    def run(
+        self,
+        kind: OffloadKind,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> asyncio.Future[Any]:
+        """Runs `func(*args)` in the `kind` pool.
+
+        With `"process"`, `func` and `args` must be picklable.
+        """
+        return self._loop.run_in_executor(self._get_pool(kind), func, *args)
+
+    async def close(self) -> None:
+        pools = self._pools
+        self._pools = {}
+
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from newbial.core.bot import Bot
+
+__all__ = ('HTTPManager',)
+
+
+class HTTPManager:
+    """Owns the aiohttp session shared by the Web API and socket mode
+    clients, so connections (and their TLS sessions) are reused across them.
+
+    The session is created on first use with a `TCPConnector` configured by
+    `http` in the config. Open websockets hold a connection each, and count
+    towards `limit` and `limit_per_host`.
+    """
+
+    if TYPE_CHECKING:
+        limit: int
+        limit_per_host: int
+        keepalive: float
+        dns_ttl: int | None
+        timeout: aiohttp.ClientTimeout
+        _logger: logging.Logger
+        _session: aiohttp.ClientSession | None
+
+    def __init__(self, bot: Bot) -> None:
+        self._logger = logging.getLogger(__name__)
+
+        config = bot.config.http or {}
+        self.limit = config.get('limit', 100)
+        self.limit_per_host = config.get('limit_per_host', 0)
+        self.keepalive = config.get('keepalive', 30.0)
+        self.dns_ttl = config.get('dns_ttl', 300)
+        self.timeout = aiohttp.ClientTimeout(
+            total=config.get('timeout', 30.0),
+            connect=config.get('connect_timeout', 10.0),
+        )
+        self._session = None
+
+    def __repr__(self) -> str:
+        return (
+            f'<HTTPManager limit={self.limit} limit_per_host={self.limit_per_host} '
+            f'open={self._session is not None and not self._session.closed}>'
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        session = self._session
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive,
+                ttl_dns_cache=self.dns_ttl,
+            )
+            session = self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+            )
+            self._logger.debug('Opened session.')
+
+        return session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+            self._logger.debug('Closed.')
+
+    def stats(self) -> dict[str, Any]:
+        """Connections of the pool: `acquired` are in use (including open
+        websockets), `idle` are kept alive for reuse and `acquiring` is the
+        number of requests waiting for a free connection."""
+        session = self._session
+        if session is None or session.closed:
+            return {'open': 0, 'idle': 0, 'acquired': 0, 'acquiring': 0}
+
+        connector = session.connector
+        assert isinstance(connector, aiohttp.TCPConnector)
+        # aiohttp has no public API for these
+        idle = sum(len(conns) for conns in connector._conns.values())
+        acquired = len(connector._acquired)
+        acquiring = sum(len(waiters) for waiters in connector._waiters.values())
+
+        return {
+            'open': idle + acquired,
+            'idle': idle,
+            'acquired': acquired,
+            'acquiring': acquiring,
+        }
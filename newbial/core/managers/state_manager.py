@@ -1,80 +1,194 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Any, Callable, ClassVar, Sequence
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Coroutine, cast
 
 from newbial.slack.events import (
+    ChannelRenameEvent,
     MessageEvent,
     MessageChangedEvent,
+    UserChangeEvent,
 )
-from newbial.slack.structures import Message
+from newbial.core.utils import (
+    CompactMessageCache,
+    MessageCache,
+    MessageIndex,
+    SeenSet,
+    SingleFlight,
+    StateSnapshot,
+    ThreadIndex,
+    maybe_awaitable,
+)
+from newbial.slack.structures import Channel, Message, User
 from newbial.types.events import (
+    ChannelData,
+    ChannelRenameEventPayload,
     MessageEventData,
     MessageEventPayload,
     MessageChangedEventPayload,
+    MessageDeletedEventPayload,
+    UserChangeEventPayload,
+    UserData,
 )
 
 if TYPE_CHECKING:
     from newbial.core.bot import Bot
+    from newbial.core.managers import EventManager, ExecutorManager
+    from newbial.core.utils.snapshot import MessageRow
     from newbial.slack.clients import (
-        SocketClient,
+        SocketPool,
         WebClient,
     )
     from newbial.types.core import FuncT, DispatchFunc
+    from newbial.types.events import Event
     from newbial.types.events import EventPayload
 
 __all__ = ('StateManager',)
 
 
+ParserKey = tuple[str, str | None]
+
+
 def _flatten_parsers(_cls: Any) -> type[StateManager]:
     cls: type[StateManager] = _cls
-    names: list[str]
-    names = cls.__parser_names__ = []
+    parsers: dict[ParserKey, str]
+    parsers = cls.__parser_names__ = {}
 
-    for base in cls.mro():
+    # Walk the MRO backwards so parsers of subclasses take precedence
+    for base in reversed(cls.mro()):
         for k, v in base.__dict__.items():
-            if hasattr(v, '__sm_parser__'):
-                names.append(k)
+            try:
+                keys = v.__sm_parser__
+            except AttributeError:
+                pass
+            else:
+                for key in keys:
+                    parsers[key] = k
 
     return cls
 
 
-def _parser(func: FuncT) -> FuncT:
-    """Declare a function as an event parser."""
-    func.__sm_parser__ = None
+def _parser(event: str, subtype: str | None = None) -> Callable[[FuncT], FuncT]:
+    """Declare a function as the parser of an event type, or of one of its
+    subtypes (e.g. `("message", "message_changed")`). Can be stacked."""
 
-    return func
+    def decorator(func: FuncT) -> FuncT:
+        func.__sm_parser__ = (*getattr(func, '__sm_parser__', ()), (event, subtype))
+
+        return func
+
+    return decorator
 
 
 @_flatten_parsers
 class StateManager:
     if TYPE_CHECKING:
         web: WebClient
-        sock: SocketClient
+        sock: SocketPool
         _logger: logging.Logger
+        _events: EventManager
         _dispatch: DispatchFunc
-        _parsers: dict[str, Callable[[EventPayload], Any]]
-        _messages: dict[str, dict[str, Message]]
-        __parser_names__: ClassVar[Sequence[str]]
+        _has_subscribers: Callable[[type[Event]], bool]
+        _parsers: dict[ParserKey, Callable[[Any], Any]]
+        _messages: MessageCache | CompactMessageCache
+        _threads: ThreadIndex
+        _search: MessageIndex | None
+        _seen: SeenSet | None
+        _executors: ExecutorManager
+        _snapshot: StateSnapshot | None
+        _snapshot_config: dict[str, Any]
+        _pending: dict[tuple[str, str], MessageRow]
+        _pending_users: dict[str, User]
+        _pending_channels: dict[str, Channel]
+        _pending_deletes: set[tuple[str, str]]
+        _write_behind_task: asyncio.Task[None] | None
+        _users: dict[str, User]
+        _channels: dict[str, Channel]
+        _fetches: SingleFlight[Any]
+        _warm_up_config: dict[str, Any]
+        _warm_up_task: asyncio.Task[None] | None
+        __parser_names__: ClassVar[dict[ParserKey, str]]
 
     def __init__(self, bot: Bot) -> None:
         self.web = bot.web
         self.sock = bot.sock
 
         self._logger = logging.getLogger(__name__)
+        self._events = bot.events
         self._dispatch = bot.events.dispatch
+        self._has_subscribers = bot.events.has_subscribers
         self._parsers = parsers = {}
-        self._messages = {}
+        config = bot.config.state.messages or {}
+        limits: dict[str, Any] = {
+            'max_size': config.get('max_size'),
+            'max_per_channel': config.get('max_per_channel'),
+            'ttl': config.get('ttl'),
+        }
+        backend = config.get('backend', 'lru')
+        if backend == 'compact':
+            self._messages = CompactMessageCache(self, **limits)
+        elif backend == 'lru':
+            self._messages = MessageCache(**limits)
+        else:
+            raise ValueError(f'Invalid message cache backend {backend!r}')
+
+        # Threads only index cached messages
+        self._threads = ThreadIndex()
+        self._messages.evict_listeners.append(self._threads.remove)
+        if (bot.config.state.search or {}).get('enabled'):
+            self._search = MessageIndex()
+            self._messages.evict_listeners.append(self._search.remove)
+        else:
+            self._search = None
+
+        dedup = bot.config.state.dedup or {}
+        window = dedup.get('window')
+        self._seen = SeenSet(window, dedup.get('max_size')) if window else None
+
+        self._executors = bot.executors
+        snapshot = bot.config.state.snapshot or {}
+        path = snapshot.get('path')
+        self._snapshot = StateSnapshot(path) if path else None
+        self._snapshot_config = {
+            'interval': snapshot.get('interval') or 5.0,
+            'warm': snapshot.get('warm') or 0,
+            'max_age': snapshot.get('max_age'),
+        }
+        # Rows not written to the snapshot yet
+        self._pending = {}
+        self._pending_users = {}
+        self._pending_channels = {}
+        self._pending_deletes = set()
+        self._write_behind_task = None
+
+        self._users = {}
+        self._channels = {}
+        self._fetches = SingleFlight()
+        warm_up = bot.config.state.warm_up or {}
+        self._warm_up_config = {
+            'users': warm_up.get('users', True),
+            'channels': warm_up.get('channels', True),
+            'page_size': warm_up.get('page_size') or 200,
+            # Other types need the groups:read, mpim:read and im:read scopes
+            'types': warm_up.get('types') or 'public_channel',
+        }
+        self._warm_up_task = None
+
         self.sock.message_listeners.append(self._message_callback)
 
         # .__parser_names__ is set by @_flatten_parsers
-        for name in self.__class__.__parser_names__:
-            parser = getattr(self, name)  # get the bound method
-            name = name[7:]  # remove "_parse_" prefix
-            parsers[name] = parser
+        for key, name in self.__class__.__parser_names__.items():
+            parsers[key] = getattr(self, name)  # get the bound method
 
         self._logger.debug(f'Registered parsers: {list(parsers)}')
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _flatten_parsers(cls)
+
     # Called when a socket message is received
     async def _message_callback(self, *args: Any) -> None:
         # Arguments given are (SocketClient, dict, str | None)
@@ -88,58 +202,509 @@ class StateManager:
             self._logger.debug(f'Skipping event "{data}"')
             return
 
+        # Slack retries deliveries (same event_id, new envelope) and frames can
+        # be received twice around reconnects (same envelope_id)
+        seen = self._seen
+        if seen is not None:
+            event_id = data['payload'].get('event_id')
+            envelope_id = data.get('envelope_id')
+            if (event_id is not None and not seen.add(event_id)) or (
+                envelope_id is not None and not seen.add(envelope_id)
+            ):
+                self._logger.debug(f'Dropping duplicate event "{event_id}"')
+                return
+
+        # Suspend reading more events while the event queue is full
+        await self._events.wait_for_capacity()
+
         payload: EventPayload = data['payload']
 
-        event = payload['event']['type']
+        event = payload['event']
+        key = (event['type'], event.get('subtype'))
+        parsers = self._parsers
+
+        parser = parsers.get(key)
+        if parser is None:
+            # Subtypes without a parser of their own are handled by the
+            # parser of the event type
+            parser = parsers.get((key[0], None))
+            if parser is None:
+                self._logger.warning(f'Parser not found for event "{key[0]}"')
+                return
+
+        await maybe_awaitable(parser, payload)
+
+    def add_parser(
+        self,
+        event: str,
+        parser: Callable[[Any], Any],
+        *,
+        subtype: str | None = None,
+    ) -> None:
+        """Registers `parser` for an event type (and optionally a subtype),
+        replacing the current parser. It is called with the event payload and
+        can be a coroutine function."""
+        self._parsers[(event, subtype)] = parser
+
+    def remove_parser(self, event: str, *, subtype: str | None = None) -> None:
+        """Removes a parser registered with `add_parser()`, restoring the
+        class-level one if there is one."""
+        key = (event, subtype)
         try:
-            parser = self._parsers[event]
+            name = self.__class__.__parser_names__[key]
         except KeyError:
-            self._logger.warning(f'Parser not found for event "{event}"')
+            self._parsers.pop(key, None)
         else:
-            self._logger.debug(f'Parsing event "{event}"')
-            parser(payload)
+            self._parsers[key] = getattr(self, name)
 
     def get_message(self, channel_id: str, ts: str) -> Message | None:
+        """Returns a cached message, see `fetch_message()` to also look it up
+        in the state snapshot."""
+        message = self._messages.get(channel_id, ts)
+        if message is None and self._pending:
+            row = self._pending.get((channel_id, ts))
+            if row is not None:
+                message = self._row_to_message(row)
+                self._cache_message(message)
+
+        return message
+
+    async def fetch_message(self, channel_id: str, ts: str) -> Message | None:
+        """Like `get_message()`, but messages that are not cached are read
+        from the state snapshot (if configured) in the thread pool."""
+        message = self.get_message(channel_id, ts)
+        snapshot = self._snapshot
+        if message is not None or snapshot is None or not snapshot.opened:
+            return message
+
+        row = await self._executors.run('thread', snapshot.get_message, channel_id, ts)
+        if row is None:
+            return None
+
+        # Cached meanwhile, e.g. by an event
+        message = self._messages.get(channel_id, ts)
+        if message is None:
+            message = self._row_to_message(row)
+            self._cache_message(message)
+
+        return message
+
+    def get_thread(self, channel_id: str, thread_ts: str) -> list[Message]:
+        """Returns the cached replies of a thread, oldest first.
+
+        The thread's parent message is not included, see `get_message()`.
+        """
+        messages = []
+        get = self._messages.get
+        # Copied, expired messages are removed from the index by get()
+        for ts in tuple(self._threads.get(channel_id, thread_ts)):
+            message = get(channel_id, ts)
+            if message is not None:
+                messages.append(message)
+
+        return messages
+
+    def search(
+        self,
+        query: str,
+        *,
+        channel_id: str | None = None,
+        limit: int | None = 50,
+    ) -> list[Message]:
+        """Searches the cached messages, newest first.
+
+        Requires `state.search.enabled`, see `MessageIndex` for the query syntax.
+
+        Examples
+        --------
+        ```py
+        bot.state.search('deploy* "release notes"', channel_id='C0123456')
+
+        ```"""
+        if self._search is None:
+            raise ValueError('Message search is disabled (state.search.enabled)')
+
+        messages = []
+        get = self._messages.get
+        for channel, ts in self._search.search(query, channel_id=channel_id, limit=limit):
+            message = get(channel, ts)
+            if message is not None:
+                messages.append(message)
+
+        return messages
+
+    def get_user(self, user_id: str) -> User | None:
+        return self._users.get(user_id)
+
+    def get_channel(self, channel_id: str) -> Channel | None:
+        return self._channels.get(channel_id)
+
+    async def fetch_user(self, user_id: str) -> User:
+        """Returns the cached user, or fetches it with `users.info`.
+
+        Concurrent fetches of the same user share one request.
+        """
         try:
-            messages = self._messages[channel_id]
+            return self._users[user_id]
         except KeyError:
-            pass
-        else:
-            return messages.get(ts)
+            return await self._fetches.run(
+                ('user', user_id), partial(self._fetch_user, user_id)
+            )
+
+    async def fetch_channel(self, channel_id: str) -> Channel:
+        """Returns the cached channel, or fetches it with `conversations.info`.
+
+        Concurrent fetches of the same channel share one request.
+        """
+        try:
+            return self._channels[channel_id]
+        except KeyError:
+            return await self._fetches.run(
+                ('channel', channel_id), partial(self._fetch_channel, channel_id)
+            )
+
+    def start_warm_up(self) -> None:
+        """Runs `warm_up()` in the background, see `state.warm_up` in the config."""
+        task = self._warm_up_task
+        if task is None or task.done():
+            self._warm_up_task = asyncio.create_task(
+                self.warm_up(), name='StateManager warm-up'
+            )
+
+    async def warm_up(self) -> None:
+        """Fills the user and channel caches with `users.list` and
+        `conversations.list` (see `state.warm_up` in the config).
+
+        Failures (e.g. missing scopes) are logged, the caches are filled
+        on demand instead."""
+        config = self._warm_up_config
+        limit = config['page_size']
+
+        async def users() -> int:
+            count = 0
+            async for page in self.web.paginate('users.list', limit=limit):
+                for data in cast(list[UserData], page['members']):
+                    self._store_user(data)
+                    count += 1
+            return count
+
+        async def channels() -> int:
+            count = 0
+            async for page in self.web.paginate(
+                'conversations.list', limit=limit, types=config['types']
+            ):
+                for data in cast(list[ChannelData], page['channels']):
+                    self._store_channel(data)
+                    count += 1
+            return count
+
+        warm_ups: dict[str, Coroutine[Any, Any, int]] = {}
+        if config['users']:
+            warm_ups['users'] = users()
+        if config['channels']:
+            warm_ups['channels'] = channels()
+
+        # Both lists are paged through at once, each method has its own rate limit
+        results = await asyncio.gather(*warm_ups.values(), return_exceptions=True)
+        for name, result in zip(warm_ups, results):
+            if isinstance(result, Exception):
+                self._logger.error(f'Failed to warm up {name}.', exc_info=result)
+            else:
+                self._logger.debug(f'Warmed up {result} {name}.')
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            'messages': self._messages.stats(),
+            'threads': self._threads.stats(),
+            'search': self._search.stats() if self._search is not None else None,
+            'users': len(self._users),
+            'channels': len(self._channels),
+            'fetches': self._fetches.stats(),
+        }
+        if self._seen is not None:
+            stats['dedup'] = self._seen.stats()
+        if self._snapshot is not None:
+            stats['snapshot'] = {
+                'opened': self._snapshot.opened,
+                'pending': (
+                    len(self._pending)
+                    + len(self._pending_deletes)
+                    + len(self._pending_users)
+                    + len(self._pending_channels)
+                ),
+            }
+
+        return stats
+
+    async def load(self) -> None:
+        """Opens the state snapshot (if configured) and starts writing to it.
+
+        Only the newest `state.snapshot.warm` messages are loaded into the
+        cache, other messages are read from the snapshot by `fetch_message()`.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.opened:
+            return
+
+        run = self._executors.run
+        warm = self._snapshot_config['warm']
+        await run('thread', snapshot.open)
+        rows = await run('thread', snapshot.recent_messages, warm)
+        for row in rows:
+            self._cache_message(self._row_to_message(row))
+        for data in await run('thread', snapshot.users):
+            user = User._from_json(self, data)
+            self._users[user.id] = user
+        for data in await run('thread', snapshot.channels):
+            channel = Channel._from_json(self, data)
+            self._channels[channel.id] = channel
+
+        self._logger.debug(
+            f'Loaded snapshot {snapshot.path!r} ({len(rows)} messages, '
+            f'{len(self._users)} users, {len(self._channels)} channels)'
+        )
+        self._write_behind_task = asyncio.create_task(
+            self._write_behind(), name='StateManager write-behind'
+        )
+
+    async def close(self) -> None:
+        """Stops the warm-up, writes the pending state to the snapshot and
+        closes it."""
+        task = self._warm_up_task
+        self._warm_up_task = None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.opened:
+            return
+
+        task = self._write_behind_task
+        self._write_behind_task = None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        await self._flush()
+        max_age = self._snapshot_config['max_age']
+        if max_age:
+            await self._executors.run('thread', snapshot.prune, time.time() - max_age)
+        snapshot.close()
+
+        self._logger.debug(f'Saved snapshot {snapshot.path!r}')
+
+    async def _write_behind(self) -> None:
+        interval = self._snapshot_config['interval']
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._flush()
+            except Exception as exc:
+                self._logger.error('Failed to write the state snapshot.', exc_info=exc)
+
+    async def _flush(self) -> None:
+        messages = self._pending
+        deleted = self._pending_deletes
+        users = self._pending_users
+        channels = self._pending_channels
+        if self._snapshot is None or not (messages or deleted or users or channels):
+            return
+
+        self._pending = {}
+        self._pending_deletes = set()
+        self._pending_users = {}
+        self._pending_channels = {}
+        try:
+            await self._executors.run(
+                'thread',
+                self._snapshot.write,
+                list(messages.values()),
+                [user.toJSON() for user in users.values()],
+                [channel.toJSON() for channel in channels.values()],
+                list(deleted),
+            )
+        except BaseException:
+            # Keep the rows for the next flush, unless they were updated since
+            messages.update(self._pending)
+            deleted.update(self._pending_deletes)
+            users.update(self._pending_users)
+            channels.update(self._pending_channels)
+            self._pending = messages
+            self._pending_deletes = deleted
+            self._pending_users = users
+            self._pending_channels = channels
+            raise
+
+    def _row_to_message(self, row: MessageRow) -> Message:
+        channel_id, ts, text, user_id, bot_id, hidden, thread_ts = row
+        return Message._from_fields(
+            self, ts, text, user_id, channel_id, bot_id, bool(hidden), thread_ts
+        )
+
+    def _cache_message(self, message: Message) -> None:
+        self._messages.add(message)
+        self._threads.add(message)
+        if self._search is not None:
+            self._search.add(message)
 
     def _add_message(self, message: Message) -> None:
-        messages = self._messages.setdefault(message.channel_id, {})
-        messages[message.ts] = message
+        self._cache_message(message)
+
+        if self._snapshot is not None:
+            self._pending[(message.channel_id, message.ts)] = (
+                message.channel_id,
+                message.ts,
+                message.text,
+                message.user_id,
+                message.bot_id,
+                message.hidden,
+                message.thread_ts,
+            )
+
+    def _remove_message(self, channel_id: str, ts: str) -> Message | None:
+        message = self._messages.remove(channel_id, ts)
+        if message is not None:
+            self._threads.remove(message)
+            if self._search is not None:
+                self._search.remove(message)
+
+        if self._snapshot is not None:
+            self._pending.pop((channel_id, ts), None)
+            self._pending_deletes.add((channel_id, ts))
+
+        return message
+
+    async def _fetch_user(self, user_id: str) -> User:
+        response = await self.web.users_info(user=user_id)
+        return self._store_user(cast(UserData, response['user']))
+
+    async def _fetch_channel(self, channel_id: str) -> Channel:
+        response = await self.web.conversations_info(channel=channel_id)
+        return self._store_channel(cast(ChannelData, response['channel']))
+
+    def _store_user(self, data: UserData) -> User:
+        user = self._users.get(data['id'])
+        if user is None:
+            user = self._users[data['id']] = User(state=self, data=data)
+        else:
+            user._update(data)
+
+        if self._snapshot is not None:
+            self._pending_users[user.id] = user
+
+        return user
+
+    def _store_channel(self, data: ChannelData) -> Channel:
+        channel = self._channels.get(data['id'])
+        if channel is None:
+            channel = self._channels[data['id']] = Channel(state=self, data=data)
+        else:
+            channel._update(data)
+
+        self._channel_changed(channel)
+
+        return channel
+
+    def _channel_changed(self, channel: Channel) -> None:
+        if self._snapshot is not None:
+            self._pending_channels[channel.id] = channel
 
     ## Event parsing
 
     # https://api.slack.com/events/message
-    @_parser
+    @_parser('message')
     def _parse_message(self, payload: MessageEventPayload) -> None:
-        data = payload['event']
-
-        try:
-            subtype = data['subtype']
-            parser = getattr(self, f'_parse_{subtype}')
-        except (KeyError, AttributeError):
-            message = Message(state=self, data=payload['event'])
+        message = Message(state=self, data=payload['event'])
 
-            self._add_message(message)
+        self._add_message(message)
 
+        if self._has_subscribers(MessageEvent):
             self._dispatch(MessageEvent(payload, message))
-        else:
-            parser(payload)
 
     # https://api.slack.com/events/message/message_changed
-    def _parse_message_changed(self, payload: MessageChangedEventPayload) -> None:
+    @_parser('message', 'message_changed')
+    async def _parse_message_changed(self, payload: MessageChangedEventPayload) -> None:
         data = payload['event']
-        d: MessageEventData = data['message'].copy().update(channel=data['channel'])  # type: ignore
+        d: MessageEventData = {**data['message'], 'channel': data['channel']}  # type: ignore
 
-        old_message = self.get_message(data['channel'], data['ts'])
+        if not self._has_subscribers(MessageChangedEvent):
+            # Only keep the cache up to date
+            self._add_message(Message(state=self, data=d))
+            return
+
+        # The edited message may only be in the snapshot
+        old_message = await self.fetch_message(data['channel'], d['ts'])
         message = Message(state=self, data=d)
 
+        self._add_message(message)
+
         self._dispatch(MessageChangedEvent(payload, old_message, message))
 
     # https://api.slack.com/events/message/message_deleted
-    def _parse_message_deleted(self, payload: dict[str, Any]) -> None:
-        ...
+    @_parser('message', 'message_deleted')
+    def _parse_message_deleted(self, payload: MessageDeletedEventPayload) -> None:
+        data = payload['event']
+
+        self._remove_message(data['channel'], data['deleted_ts'])
+
+    # https://api.slack.com/events/user_change
+    @_parser('user_change')
+    def _parse_user_change(self, payload: UserChangeEventPayload) -> None:
+        data = payload['event']['user']
+        self.web.invalidate(user=data['id'])
+
+        if not self._has_subscribers(UserChangeEvent):
+            self._store_user(data)
+            return
+
+        old_user = self._users.get(data['id'])
+        if old_user is not None:
+            # The cached user is updated in place
+            old_user = User._from_json(self, old_user.toJSON())
+        user = self._store_user(data)
+
+        self._dispatch(UserChangeEvent(payload, old_user, user))
+
+    # https://api.slack.com/events/team_join
+    @_parser('team_join')
+    def _parse_team_join(self, payload: UserChangeEventPayload) -> None:
+        self._store_user(payload['event']['user'])
+
+    # https://api.slack.com/events/channel_rename
+    @_parser('channel_rename')
+    @_parser('group_rename')
+    def _parse_channel_rename(self, payload: ChannelRenameEventPayload) -> None:
+        data = payload['event']['channel']
+        self.web.invalidate(channel=data['id'])
+
+        channel = self._channels.get(data['id'])
+        if channel is None:
+            old_name = None
+            channel = self._store_channel(data)
+        else:
+            old_name = channel.name
+            channel.name = data.get('name')
+            self._channel_changed(channel)
+
+        if self._has_subscribers(ChannelRenameEvent):
+            self._dispatch(ChannelRenameEvent(payload, old_name, channel))
+
+    # https://api.slack.com/events/channel_created
+    @_parser('channel_created')
+    def _parse_channel_created(self, payload: ChannelRenameEventPayload) -> None:
+        self._store_channel(payload['event']['channel'])
+
+    # https://api.slack.com/events/channel_archive
+    @_parser('channel_archive')
+    @_parser('channel_unarchive')
+    @_parser('group_archive')
+    @_parser('group_unarchive')
+    def _parse_channel_archive(self, payload: dict[str, Any]) -> None:
+        data = payload['event']
+        self.web.invalidate(channel=data['channel'])
+
+        channel = self._channels.get(data['channel'])
+        if channel is not None:
+            channel.is_archived = data['type'].endswith('_archive')
+            self._channel_changed(channel)
@@ -119,14 +119,17 @@ class Module(metaclass=ModuleMeta):
         self,
         event: type[EventT],
         callback: EventCallback[EventT],
+        **filters: Any,
     ) -> None:
+        """Registers `callback` for `event`, see `EventManager.add_callback()`
+        for the supported filters."""
+        self.bot.events.add_callback(event, callback, **filters)
+
         if self._bound_listeners is None:
             self._bound_listeners = []
 
         self._bound_listeners.append((event, callback))
 
-        self.bot.events.add_callback(event, callback)
-
     def remove_listener(
         self, event: type[EventT], callback: EventCallback[EventT]
     ) -> None:
@@ -1,3 +1,8 @@
+from newbial.core.utils.cache import *
+from newbial.core.utils.compact_cache import *
 from newbial.core.utils.config import *
+from newbial.core.utils.event_queue import *
 from newbial.core.utils.helpers import *
 from newbial.core.utils.logging import *
+from newbial.core.utils.search import *
+from newbial.core.utils.snapshot import *
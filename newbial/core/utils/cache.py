@@ -0,0 +1,484 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Generic, Hashable, Iterator
+
+from newbial.types.core import T
+
+if TYPE_CHECKING:
+    from newbial.slack.structures import Message
+
+__all__ = (
+    'MessageCache',
+    'SeenSet',
+    'SingleFlight',
+    'ThreadIndex',
+    'TTLCache',
+)
+
+
+class MessageCache:
+    """A bounded cache of messages keyed by `(channel_id, ts)`.
+
+    Messages are evicted in least recently used order once `max_size`
+    messages are cached, or once a channel holds `max_per_channel`
+    messages. Messages older than `ttl` seconds (since they were cached)
+    are expired. All operations are O(1).
+
+    Callables in `evict_listeners` are invoked with every message that
+    leaves the cache without being removed explicitly.
+    """
+
+    if TYPE_CHECKING:
+        max_size: int | None
+        max_per_channel: int | None
+        ttl: float | None
+        evict_listeners: list[Callable[[Message], Any]]
+        hits: int
+        misses: int
+        evictions: int
+        expirations: int
+        _clock: Callable[[], float]
+        _entries: OrderedDict[tuple[str, str], tuple[Message, float]]
+        _channels: dict[str, OrderedDict[str, None]]
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        max_per_channel: int | None = None,
+        ttl: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.max_per_channel = max_per_channel
+        self.ttl = ttl
+        self.evict_listeners = []
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._channels = {}
+
+    def __repr__(self) -> str:
+        return (
+            f'<MessageCache size={len(self._entries)} max_size={self.max_size} '
+            f'max_per_channel={self.max_per_channel} ttl={self.ttl}>'
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[Message]:
+        return (message for message, _ in self._entries.values())
+
+    def channel(self, channel_id: str) -> list[Message]:
+        """Returns the cached messages of a channel, least recently used first."""
+        entries = self._entries
+        return [entries[(channel_id, ts)][0] for ts in self._channels.get(channel_id, ())]
+
+    def get(self, channel_id: str, ts: str) -> Message | None:
+        key = (channel_id, ts)
+        try:
+            message, expires = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if self.ttl is not None and expires <= self._clock():
+            self._discard(key)
+            self.expirations += 1
+            self.misses += 1
+            self._evicted(message)
+            return None
+
+        self._entries.move_to_end(key)
+        self._channels[channel_id].move_to_end(ts)
+        self.hits += 1
+
+        return message
+
+    def add(self, message: Message) -> None:
+        channel_id = message.channel_id
+        key = (channel_id, message.ts)
+        entries = self._entries
+
+        expires = self._clock() + self.ttl if self.ttl is not None else 0.0
+        entries[key] = (message, expires)
+        entries.move_to_end(key)
+
+        try:
+            channel = self._channels[channel_id]
+        except KeyError:
+            channel = self._channels[channel_id] = OrderedDict()
+        channel[message.ts] = None
+        channel.move_to_end(message.ts)
+
+        if self.ttl is not None:
+            self._expire()
+
+        if self.max_per_channel is not None:
+            while len(channel) > self.max_per_channel:
+                ts = next(iter(channel))
+                self._evict((channel_id, ts))
+
+        if self.max_size is not None:
+            while len(entries) > self.max_size:
+                self._evict(next(iter(entries)))
+
+    def remove(self, channel_id: str, ts: str) -> Message | None:
+        key = (channel_id, ts)
+        try:
+            message, _ = self._entries[key]
+        except KeyError:
+            return None
+
+        self._discard(key)
+
+        return message
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._channels.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'size': len(self._entries),
+            'channels': len(self._channels),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def _expire(self) -> None:
+        # Entries are not strictly ordered by expiry (hits move them to the end),
+        # expired entries behind a live one are caught by get() instead
+        now = self._clock()
+        entries = self._entries
+
+        while entries:
+            key, (message, expires) = next(iter(entries.items()))
+            if expires > now:
+                break
+
+            self._discard(key)
+            self.expirations += 1
+            self._evicted(message)
+
+    def _evict(self, key: tuple[str, str]) -> None:
+        message, _ = self._entries[key]
+        self._discard(key)
+        self.evictions += 1
+        self._evicted(message)
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        del self._entries[key]
+
+        channel_id, ts = key
+        channel = self._channels[channel_id]
+        del channel[ts]
+        if not channel:
+            del self._channels[channel_id]
+
+    def _evicted(self, message: Message) -> None:
+        for listener in self.evict_listeners:
+            listener(message)
+
+
+class SeenSet:
+    """A time-windowed set of recently seen keys, such as event IDs.
+
+    Keys are forgotten `window` seconds after they were first added, or
+    in insertion order once more than `max_size` keys are held. All
+    operations are O(1) (amortized for expiry).
+    """
+
+    if TYPE_CHECKING:
+        window: float
+        max_size: int | None
+        duplicates: int
+        _clock: Callable[[], float]
+        _keys: OrderedDict[Hashable, float]
+
+    def __init__(
+        self,
+        window: float,
+        max_size: int | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window = window
+        self.max_size = max_size
+        self.duplicates = 0
+        self._clock = clock
+        self._keys = OrderedDict()
+
+    def __repr__(self) -> str:
+        return (
+            f'<SeenSet size={len(self._keys)} window={self.window} '
+            f'max_size={self.max_size} duplicates={self.duplicates}>'
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        try:
+            expires = self._keys[key]
+        except KeyError:
+            return False
+        return expires > self._clock()
+
+    def add(self, key: Hashable) -> bool:
+        """Adds `key`, returns `False` (and counts a duplicate) if it was
+        already seen within the window."""
+        now = self._clock()
+        keys = self._keys
+        self._expire(now)
+
+        if key in keys:
+            self.duplicates += 1
+            return False
+
+        keys[key] = now + self.window
+
+        if self.max_size is not None and len(keys) > self.max_size:
+            keys.popitem(last=False)
+
+        return True
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'size': len(self._keys),
+            'window': self.window,
+            'duplicates': self.duplicates,
+        }
+
+    def _expire(self, now: float) -> None:
+        # Keys are never refreshed, so they are ordered by expiry
+        keys = self._keys
+        while keys:
+            key, expires = next(iter(keys.items()))
+            if expires > now:
+                break
+            del keys[key]
+
+
+class SingleFlight(Generic[T]):
+    """Collapses concurrent calls for the same key into one.
+
+    While a call for a key is in flight, further `run()` calls with that key
+    wait for its result instead of starting their own. Cancelling a waiter
+    does not cancel the shared call.
+    """
+
+    if TYPE_CHECKING:
+        shared: int
+        _calls: dict[Hashable, asyncio.Future[T]]
+
+    def __init__(self) -> None:
+        # How many calls were served by an in-flight call
+        self.shared = 0
+        self._calls = {}
+
+    def __repr__(self) -> str:
+        return f'<SingleFlight in_flight={len(self._calls)} shared={self.shared}>'
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        calls = self._calls
+        try:
+            fut = calls[key]
+        except KeyError:
+            fut = calls[key] = asyncio.ensure_future(func())
+            fut.add_done_callback(lambda _: calls.pop(key, None))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(fut)
+
+    def stats(self) -> dict[str, Any]:
+        return {'in_flight': len(self._calls), 'shared': self.shared}
+
+
+class ThreadIndex:
+    """Maps `(channel_id, thread_ts)` to the sorted timestamps of the
+    thread's replies.
+
+    Only replies are indexed, a thread's parent message is not part of its
+    thread. Threads without replies are dropped.
+    """
+
+    if TYPE_CHECKING:
+        _threads: dict[tuple[str, str], list[str]]
+
+    def __init__(self) -> None:
+        self._threads = {}
+
+    def __repr__(self) -> str:
+        return f'<ThreadIndex threads={len(self._threads)}>'
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def get(self, channel_id: str, thread_ts: str) -> list[str]:
+        return self._threads.get((channel_id, thread_ts), [])
+
+    def add(self, message: Message) -> None:
+        thread_ts = message.thread_ts
+        if thread_ts is None or thread_ts == message.ts:
+            return
+
+        key = (message.channel_id, thread_ts)
+        try:
+            replies = self._threads[key]
+        except KeyError:
+            self._threads[key] = [message.ts]
+            return
+
+        ts = message.ts
+        # Replies mostly arrive in order
+        if ts > replies[-1]:
+            replies.append(ts)
+        else:
+            i = bisect_left(replies, ts)
+            if i == len(replies) or replies[i] != ts:
+                insort(replies, ts)
+
+    def remove(self, message: Message) -> None:
+        thread_ts = message.thread_ts
+        if thread_ts is None:
+            return
+
+        key = (message.channel_id, thread_ts)
+        try:
+            replies = self._threads[key]
+        except KeyError:
+            return
+
+        i = bisect_left(replies, message.ts)
+        if i < len(replies) and replies[i] == message.ts:
+            del replies[i]
+            if not replies:
+                del self._threads[key]
+
+    def clear(self) -> None:
+        self._threads.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'threads': len(self._threads),
+            'replies': sum(map(len, self._threads.values())),
+        }
+
+
+class TTLCache(Generic[T]):
+    """A bounded cache of values that expire `ttl` seconds after being set.
+
+    The least recently used entry is evicted once `max_size` entries are
+    held. Entries can be set with tags, `invalidate()` drops every entry
+    with a given tag.
+    """
+
+    if TYPE_CHECKING:
+        max_size: int | None
+        hits: int
+        misses: int
+        invalidations: int
+        _clock: Callable[[], float]
+        _entries: OrderedDict[Hashable, tuple[T, float, tuple[Hashable, ...]]]
+        _tags: dict[Hashable, set[Hashable]]
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.hits = self.misses = self.invalidations = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._tags = {}
+
+    def __repr__(self) -> str:
+        return f'<TTLCache size={len(self._entries)} max_size={self.max_size}>'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> T | None:
+        try:
+            value, expires, _ = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if expires <= self._clock():
+            self._discard(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(
+        self, key: Hashable, value: T, ttl: float, tags: tuple[Hashable, ...] = ()
+    ) -> None:
+        entries = self._entries
+        if key in entries:
+            self._discard(key)
+
+        entries[key] = (value, self._clock() + ttl, tags)
+        for tag in tags:
+            try:
+                self._tags[tag].add(key)
+            except KeyError:
+                self._tags[tag] = {key}
+
+        if self.max_size is not None:
+            while len(entries) > self.max_size:
+                self._discard(next(iter(entries)))
+
+    def invalidate(self, tag: Hashable) -> int:
+        """Drops the entries tagged with `tag`, returns how many."""
+        keys = self._tags.pop(tag, ())
+        for key in tuple(keys):
+            self._discard(key)
+        self.invalidations += len(keys)
+
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+        }
+
+    def _discard(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
@@ -0,0 +1,475 @@
+from __future__ import annotations
+
+import heapq
+import time
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    from newbial.core.managers import StateManager
+    from newbial.slack.structures import Message
+
+__all__ = ('CompactMessageCache',)
+
+_HIDDEN = 1
+_REMOVED = 2
+
+
+def _pack_ts(ts: str) -> int | None:
+    """Packs a Slack timestamp (`"1655000000.123456"`) into one integer,
+    returns `None` if `ts` does not have the usual format.
+    """
+    seconds, _, micros = ts.partition('.')
+    if len(micros) != 6 or not seconds.isdigit() or not micros.isdigit():
+        return None
+    return int(seconds) * 1_000_000 + int(micros)
+
+
+def _unpack_ts(value: int) -> str:
+    return f'{value // 1_000_000}.{value % 1_000_000:06d}'
+
+
+class _Columns:
+    """The messages of one channel, stored column-wise and sorted by ts."""
+
+    __slots__ = ('ts', 'users', 'bots', 'threads', 'flags', 'texts', 'start', 'live')
+
+    if TYPE_CHECKING:
+        ts: array[int]
+        users: array[int]
+        bots: array[int]
+        # Packed thread_ts, -1 if not in a thread
+        threads: array[int]
+        flags: bytearray
+        texts: list[str | None]
+        # Rows before `start` are evicted and only kept until compaction
+        start: int
+        live: int
+
+    def __init__(self) -> None:
+        self.ts = array('q')
+        self.users = array('l')
+        self.bots = array('l')
+        self.threads = array('q')
+        self.flags = bytearray()
+        self.texts = []
+        self.start = 0
+        self.live = 0
+
+    def find(self, packed: int) -> int:
+        ts = self.ts
+        i = bisect_left(ts, packed, self.start)
+        if i < len(ts) and ts[i] == packed and not self.flags[i] & _REMOVED:
+            return i
+        return -1
+
+    def oldest(self) -> int:
+        """Skips leading removed rows and returns the ts of the first live row."""
+        flags = self.flags
+        i = self.start
+        while flags[i] & _REMOVED:
+            i += 1
+        self.start = i
+        return self.ts[i]
+
+    def compact(self) -> None:
+        """Drops removed rows once they make up half of the rows."""
+        size = len(self.ts)
+        dead = size - self.live
+        if not dead or dead * 2 < size:
+            return
+
+        start = self.start
+        if dead == start:
+            # Only evicted rows, at the front
+            del self.ts[:start]
+            del self.users[:start]
+            del self.bots[:start]
+            del self.threads[:start]
+            del self.flags[:start]
+            del self.texts[:start]
+        else:
+            flags = self.flags
+            keep = [i for i in range(start, size) if not flags[i] & _REMOVED]
+            self.ts = array('q', [self.ts[i] for i in keep])
+            self.users = array('l', [self.users[i] for i in keep])
+            self.bots = array('l', [self.bots[i] for i in keep])
+            self.threads = array('q', [self.threads[i] for i in keep])
+            self.flags = bytearray(flags[i] for i in keep)
+            self.texts = [self.texts[i] for i in keep]
+        self.start = 0
+
+
+class CompactMessageCache:
+    """A memory efficient alternative to `MessageCache`.
+
+    Messages are not kept as objects: user and bot IDs are interned
+    and each channel stores its messages in `array` columns sorted by ts.
+    Removed rows are dropped once they make up half of a channel's rows,
+    and interned IDs once no cached message refers to them.
+    `Message` objects are built on access, so repeated `get()` calls return
+    equal but distinct objects.
+
+    Unlike `MessageCache`, eviction goes by message age rather than recent
+    use: the oldest message (by ts) is evicted first, and `ttl` is measured
+    from the message's ts.
+    """
+
+    if TYPE_CHECKING:
+        max_size: int | None
+        max_per_channel: int | None
+        ttl: float | None
+        evict_listeners: list[Callable[[Message], Any]]
+        hits: int
+        misses: int
+        evictions: int
+        expirations: int
+        _state: StateManager
+        _clock: Callable[[], float]
+        _size: int
+        _channels: dict[str, _Columns]
+        _oldest: list[tuple[int, str]]
+        _strings: list[str]
+        _string_ids: dict[str, int]
+        _string_refs: list[int]
+        _free_ids: list[int]
+        _fallback: dict[tuple[str, str], Message]
+
+    def __init__(
+        self,
+        state: StateManager,
+        max_size: int | None = None,
+        max_per_channel: int | None = None,
+        ttl: float | None = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_size = max_size
+        self.max_per_channel = max_per_channel
+        self.ttl = ttl
+        self.evict_listeners = []
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self._state = state
+        self._clock = clock
+        self._size = 0
+        self._channels = {}
+        # Heap of (oldest ts, channel), entries are checked lazily
+        self._oldest = []
+        self._strings = []
+        self._string_ids = {}
+        # Rows referring to each interned string, unreferenced IDs are reused
+        self._string_refs = []
+        self._free_ids = []
+        # Messages with a ts that cannot be packed are kept as is
+        self._fallback = {}
+
+    def __repr__(self) -> str:
+        return (
+            f'<CompactMessageCache size={len(self)} max_size={self.max_size} '
+            f'max_per_channel={self.max_per_channel} ttl={self.ttl}>'
+        )
+
+    def __len__(self) -> int:
+        return self._size + len(self._fallback)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        channel_id, ts = key
+        packed = _pack_ts(ts)
+        if packed is None:
+            return key in self._fallback
+
+        try:
+            columns = self._channels[channel_id]
+        except KeyError:
+            return False
+        return columns.find(packed) != -1
+
+    def __iter__(self) -> Iterator[Message]:
+        for channel_id in tuple(self._channels):
+            yield from self.channel(channel_id)
+        yield from tuple(self._fallback.values())
+
+    def _intern(self, value: str | None) -> int:
+        if value is None:
+            return -1
+        try:
+            i = self._string_ids[value]
+        except KeyError:
+            if self._free_ids:
+                i = self._free_ids.pop()
+                self._strings[i] = value
+                self._string_refs[i] = 1
+            else:
+                i = len(self._strings)
+                self._strings.append(value)
+                self._string_refs.append(1)
+            self._string_ids[value] = i
+        else:
+            self._string_refs[i] += 1
+        return i
+
+    def _release(self, i: int) -> None:
+        if i == -1:
+            return
+        refs = self._string_refs
+        refs[i] -= 1
+        if not refs[i]:
+            del self._string_ids[self._strings[i]]
+            self._strings[i] = ''
+            self._free_ids.append(i)
+
+    def _build(self, channel_id: str, columns: _Columns, i: int) -> Message:
+        from newbial.slack.structures import Message
+
+        strings = self._strings
+        user = columns.users[i]
+        bot = columns.bots[i]
+        thread = columns.threads[i]
+        text = columns.texts[i]
+        assert text is not None
+
+        return Message._from_fields(
+            self._state,
+            _unpack_ts(columns.ts[i]),
+            text,
+            strings[user] if user != -1 else None,
+            channel_id,
+            strings[bot] if bot != -1 else None,
+            bool(columns.flags[i] & _HIDDEN),
+            _unpack_ts(thread) if thread != -1 else None,
+        )
+
+    def channel(self, channel_id: str) -> list[Message]:
+        """Returns the cached messages of a channel, oldest first."""
+        try:
+            columns = self._channels[channel_id]
+        except KeyError:
+            return []
+
+        flags = columns.flags
+        return [
+            self._build(channel_id, columns, i)
+            for i in range(columns.start, len(flags))
+            if not flags[i] & _REMOVED
+        ]
+
+    def get(self, channel_id: str, ts: str) -> Message | None:
+        packed = _pack_ts(ts)
+        if packed is None:
+            message = self._fallback.get((channel_id, ts))
+            if message is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return message
+
+        try:
+            columns = self._channels[channel_id]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        i = columns.find(packed)
+        if i == -1:
+            self.misses += 1
+            return None
+
+        if self.ttl is not None and packed < self._cutoff():
+            self.misses += 1
+            self._expire()
+            return None
+
+        self.hits += 1
+        return self._build(channel_id, columns, i)
+
+    def add(self, message: Message) -> None:
+        channel_id = message.channel_id
+        packed = _pack_ts(message.ts)
+        if message.thread_ts is None:
+            thread = -1
+        else:
+            thread = _pack_ts(message.thread_ts)
+        if packed is None or thread is None:
+            self._fallback[(channel_id, message.ts)] = message
+            return
+
+        try:
+            columns = self._channels[channel_id]
+        except KeyError:
+            columns = self._channels[channel_id] = _Columns()
+
+        ts = columns.ts
+        user = self._intern(message.user_id)
+        bot = self._intern(message.bot_id)
+        flags = _HIDDEN if message.hidden else 0
+
+        if not len(ts) or packed > ts[-1]:
+            i = len(ts)
+            ts.append(packed)
+            columns.users.append(user)
+            columns.bots.append(bot)
+            columns.threads.append(thread)
+            columns.flags.append(flags)
+            columns.texts.append(message.text)
+        else:
+            i = bisect_left(ts, packed, columns.start)
+            if i < len(ts) and ts[i] == packed:
+                # Replace an existing (possibly removed) row
+                if not columns.flags[i] & _REMOVED:
+                    columns.live -= 1
+                    self._size -= 1
+                    self._release(columns.users[i])
+                    self._release(columns.bots[i])
+                columns.users[i] = user
+                columns.bots[i] = bot
+                columns.threads[i] = thread
+                columns.flags[i] = flags
+                columns.texts[i] = message.text
+            else:
+                ts.insert(i, packed)
+                columns.users.insert(i, user)
+                columns.bots.insert(i, bot)
+                columns.threads.insert(i, thread)
+                columns.flags.insert(i, flags)
+                columns.texts.insert(i, message.text)
+
+        columns.live += 1
+        self._size += 1
+        if i == columns.start:
+            heap = self._oldest
+            heapq.heappush(heap, (packed, channel_id))
+            if len(heap) > 2 * len(self._channels) + 16:
+                # Drop the stale entries left by out of order inserts
+                heap[:] = [(c.oldest(), ch) for ch, c in self._channels.items()]
+                heapq.heapify(heap)
+
+        if self.ttl is not None:
+            self._expire()
+
+        if self.max_per_channel is not None:
+            while columns.live > self.max_per_channel:
+                self._evict_oldest(channel_id, columns)
+                self.evictions += 1
+
+        if self.max_size is not None:
+            while self._size > self.max_size:
+                self._pop_oldest()
+                self.evictions += 1
+
+    def remove(self, channel_id: str, ts: str) -> Message | None:
+        packed = _pack_ts(ts)
+        if packed is None:
+            return self._fallback.pop((channel_id, ts), None)
+
+        try:
+            columns = self._channels[channel_id]
+        except KeyError:
+            return None
+
+        i = columns.find(packed)
+        if i == -1:
+            return None
+
+        message = self._build(channel_id, columns, i)
+        self._remove_row(channel_id, columns, i)
+
+        return message
+
+    def clear(self) -> None:
+        self._channels.clear()
+        self._oldest.clear()
+        self._fallback.clear()
+        self._strings.clear()
+        self._string_ids.clear()
+        self._string_refs.clear()
+        self._free_ids.clear()
+        self._size = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'size': len(self),
+            'channels': len(self._channels),
+            'interned': len(self._string_ids),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def _cutoff(self) -> int:
+        assert self.ttl is not None
+        return int((self._clock() - self.ttl) * 1_000_000)
+
+    def _remove_row(self, channel_id: str, columns: _Columns, i: int) -> None:
+        columns.flags[i] |= _REMOVED
+        columns.texts[i] = None
+        columns.live -= 1
+        self._size -= 1
+        self._release(columns.users[i])
+        self._release(columns.bots[i])
+
+        if not columns.live:
+            del self._channels[channel_id]
+        else:
+            columns.compact()
+
+    def _evict_oldest(self, channel_id: str, columns: _Columns) -> None:
+        columns.oldest()
+        i = columns.start
+
+        if self.evict_listeners:
+            message = self._build(channel_id, columns, i)
+        else:
+            message = None
+
+        columns.start += 1
+        self._remove_row(channel_id, columns, i)
+
+        if message is not None:
+            for listener in self.evict_listeners:
+                listener(message)
+
+    def _pop_oldest(self, before: int | None = None) -> int | None:
+        """Evicts the oldest message across all channels, returns its packed ts.
+
+        With `before`, nothing is evicted unless that message is older.
+        """
+        heap = self._oldest
+        channels = self._channels
+
+        while heap:
+            packed, channel_id = heap[0]
+            columns = channels.get(channel_id)
+            if columns is None:
+                heapq.heappop(heap)
+                continue
+
+            oldest = columns.oldest()
+            if oldest != packed:
+                # Stale entry, the channel's oldest message changed
+                heapq.heapreplace(heap, (oldest, channel_id))
+                continue
+
+            if before is not None and packed >= before:
+                return None
+
+            heapq.heappop(heap)
+            self._evict_oldest(channel_id, columns)
+            if channel_id in channels:
+                heapq.heappush(heap, (columns.oldest(), channel_id))
+
+            return packed
+
+        return None
+
+    def _expire(self) -> None:
+        cutoff = self._cutoff()
+        heap = self._oldest
+
+        while heap and heap[0][0] < cutoff:
+            # The entry checked here may be stale, so the cutoff is checked
+            # again once it is repaired
+            if self._pop_oldest(cutoff) is None:
+                break
+            self.expirations += 1
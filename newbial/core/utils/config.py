@@ -81,11 +81,16 @@ def _recursive_dict_update(target: dict[str, Any], source: dict[str, Any]) -> No
         except KeyError:
             target[k] = v
         else:
+            # Unset "!ENV" keys are None, and can be set to anything
+            if existing is None or v is None:
+                target[k] = v
+                continue
+
             assert (
                 existing.__class__ is v.__class__
             ), f'Type of key {k} in source does not match the type in target'
 
-            if existing.__class__ is dict and v.__class__ is dict:
+            if isinstance(existing, dict):
                 _recursive_dict_update(existing, v)
             else:
                 target[k] = v
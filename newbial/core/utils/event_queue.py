@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, Any, Generic
+
+from newbial.types.core import T
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+
+    from newbial.types.core import OverflowPolicy
+
+__all__ = ('EventQueue',)
+
+
+class EventQueue(Generic[T]):
+    """A bounded queue made of multiple priority lanes.
+
+    Lane `0` has the highest priority, items from a lane are only
+    returned by `get()` once all lanes before it are empty.
+
+    What happens when an item is put in a full lane depends on `policy`:
+
+    - `"drop_oldest"`: the oldest item of the lane is dropped.
+    - `"drop_newest"`: the new item is dropped.
+    - `"block"`: `put()` waits until the lane has room. `put_nowait()`
+      cannot wait, so the item is refused and counted as overflowed.
+
+    `put_nowait(..., force=True)` ignores the bound (and `policy`) entirely.
+    """
+
+    if TYPE_CHECKING:
+        maxsize: int
+        policy: OverflowPolicy
+        dropped: list[int]
+        overflowed: list[int]
+        _loop: AbstractEventLoop
+        _lanes: list[deque[T]]
+        _not_empty: asyncio.Event
+        _finished: asyncio.Event
+        _unfinished: int
+        _putters: list[deque[asyncio.Future[None]]]
+
+    def __init__(
+        self,
+        lanes: int,
+        maxsize: int,
+        policy: OverflowPolicy = 'block',
+        *,
+        loop: AbstractEventLoop | None = None,
+    ) -> None:
+        if policy not in ('block', 'drop_oldest', 'drop_newest'):
+            raise ValueError(f'Invalid overflow policy {policy!r}')
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = [0] * lanes
+        self.overflowed = [0] * lanes
+        self._loop = loop or asyncio.get_event_loop()
+        self._lanes = [deque() for _ in range(lanes)]
+        self._not_empty = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self._unfinished = 0
+        self._putters = [deque() for _ in range(lanes)]
+
+    def __repr__(self) -> str:
+        return (
+            f'<EventQueue depth={self.depth()} maxsize={self.maxsize} '
+            f'policy={self.policy!r} dropped={self.dropped}>'
+        )
+
+    def __len__(self) -> int:
+        return sum(map(len, self._lanes))
+
+    def depth(self) -> list[int]:
+        return [len(lane) for lane in self._lanes]
+
+    def full(self, lane: int) -> bool:
+        return self.maxsize > 0 and len(self._lanes[lane]) >= self.maxsize
+
+    def put_nowait(self, item: T, lane: int, *, force: bool = False) -> bool:
+        """Adds `item` to `lane` without waiting.
+
+        Returns `False` if the item was dropped (or refused, see `policy`).
+        With `force` the item is always added, even if the lane is full.
+        """
+        items = self._lanes[lane]
+
+        if not force and self.maxsize > 0 and len(items) >= self.maxsize:
+            policy = self.policy
+            if policy == 'drop_newest':
+                self.dropped[lane] += 1
+                return False
+            elif policy == 'drop_oldest':
+                items.popleft()
+                self.dropped[lane] += 1
+                self._unfinished -= 1
+            else:
+                self.overflowed[lane] += 1
+                return False
+
+        items.append(item)
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+
+        return True
+
+    async def put(self, item: T, lane: int) -> bool:
+        if self.policy == 'block':
+            await self.wait_not_full(lane)
+
+        return self.put_nowait(item, lane)
+
+    async def wait_not_full(self, lane: int) -> None:
+        """Waits until `lane` has room for another item."""
+        putters = self._putters[lane]
+
+        while self.full(lane):
+            fut = self._loop.create_future()
+            putters.append(fut)
+            try:
+                await fut
+            finally:
+                if not fut.done():
+                    fut.cancel()
+                try:
+                    putters.remove(fut)
+                except ValueError:
+                    pass
+
+    async def get(self) -> T:
+        not_empty = self._not_empty
+
+        while True:
+            for lane, items in enumerate(self._lanes):
+                if items:
+                    item = items.popleft()
+                    self._wake_putter(lane)
+
+                    return item
+
+            not_empty.clear()
+            await not_empty.wait()
+
+    def task_done(self) -> None:
+        """Marks an item returned by `get()` as processed."""
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Waits until every queued item has been processed."""
+        await self._finished.wait()
+
+    def _wake_putter(self, lane: int) -> None:
+        putters = self._putters[lane]
+
+        while putters:
+            fut = putters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                break
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'depth': self.depth(),
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+            'dropped': self.dropped.copy(),
+            'overflowed': self.overflowed.copy(),
+        }
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from inspect import isawaitable
+from inspect import isawaitable, iscoroutinefunction
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -12,11 +12,12 @@ from typing import (
 if TYPE_CHECKING:
     from typing_extensions import NoReturn
 
-    from newbial.types.core import P, T
+    from newbial.types.core import FuncT, OffloadKind, P, T
 
 __all__ = (
     'NULL',
     'maybe_awaitable',
+    'offload',
 )
 
 
@@ -43,6 +44,39 @@ async def maybe_awaitable(
     return ret
 
 
+def offload(kind: OffloadKind) -> Callable[[FuncT], FuncT]:
+    """Marks a sync event callback to be run in the bot's thread or process pool
+    instead of on the event loop.
+
+    Callbacks run in the process pool receive the event's `toJSON()` snapshot
+    instead of the event and must be picklable (i.e. module-level functions,
+    not methods), `EventManager.add_callback()` raises `TypeError` otherwise.
+    Coroutine functions cannot be offloaded and raise `TypeError` too.
+
+    Examples
+    --------
+    ```py
+    @offload('process')
+    def analyse(event):
+        ...
+
+    bot.events.add_callback(MessageEvent, analyse)
+
+    ```"""
+    if kind not in ('thread', 'process'):
+        raise ValueError(f'Invalid offload kind {kind!r}')
+
+    def decorator(func: FuncT) -> FuncT:
+        # Executors would only create the coroutine, it would never be awaited
+        if iscoroutinefunction(func):
+            raise TypeError(f'Cannot offload coroutine function {func!r}')
+
+        func.__newbial_offload__ = kind  # type: ignore
+        return func
+
+    return decorator
+
+
 class _NullType:
     __slots__ = ()
 
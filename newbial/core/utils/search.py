@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import heapq
+import re
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from newbial.slack.structures import Message
+
+__all__ = (
+    'tokenize',
+    'MessageIndex',
+)
+
+_TOKEN_RE = re.compile(r'\w+')
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+_MessageKey = tuple[str, str]
+_by_ts = itemgetter(1)
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class MessageIndex:
+    """An inverted index of message texts, keyed by `(channel_id, ts)`.
+
+    Queries are made of space separated parts, all of which have to match:
+
+    - `word`: messages containing the token `word`.
+    - `wor*`: messages containing a token starting with `wor`.
+    - `"two words"`: messages containing the tokens next to each other.
+
+    Matching is case insensitive. Only posting sets are intersected, so
+    lookups do not depend on the number of indexed messages but on the
+    number of messages matching the rarest part of the query.
+    """
+
+    if TYPE_CHECKING:
+        _postings: dict[str, set[_MessageKey]]
+        _prefixes: dict[str, set[str]]
+        _docs: dict[_MessageKey, tuple[str, ...]]
+
+    def __init__(self) -> None:
+        self._postings = {}
+        # Tokens by their first two characters, for prefix queries
+        self._prefixes = {}
+        self._docs = {}
+
+    def __repr__(self) -> str:
+        return f'<MessageIndex messages={len(self._docs)} tokens={len(self._postings)}>'
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: _MessageKey) -> bool:
+        return key in self._docs
+
+    def add(self, message: Message) -> None:
+        """Indexes a message, replacing its previous text if it was indexed."""
+        key = (message.channel_id, message.ts)
+        tokens = tuple(tokenize(message.text))
+
+        old = self._docs.get(key)
+        if old is not None:
+            if old == tokens:
+                return
+            self._unindex(key, old)
+
+        self._docs[key] = tokens
+        postings = self._postings
+        for token in set(tokens):
+            try:
+                postings[token].add(key)
+            except KeyError:
+                postings[token] = {key}
+                try:
+                    self._prefixes[token[:2]].add(token)
+                except KeyError:
+                    self._prefixes[token[:2]] = {token}
+
+    def remove(self, message: Message) -> None:
+        key = (message.channel_id, message.ts)
+        try:
+            tokens = self._docs.pop(key)
+        except KeyError:
+            return
+
+        self._unindex(key, tokens)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._prefixes.clear()
+        self._docs.clear()
+
+    def search(
+        self,
+        query: str,
+        *,
+        channel_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[_MessageKey]:
+        """Returns the keys of the messages matching `query`, newest first."""
+        sets: list[set[_MessageKey] | frozenset[_MessageKey]] = []
+        phrases: list[tuple[str, ...]] = []
+
+        for phrase, part in _QUERY_RE.findall(query):
+            if phrase:
+                tokens = tuple(tokenize(phrase))
+                if not tokens:
+                    continue
+                if len(tokens) > 1:
+                    phrases.append(tokens)
+                sets.extend(self._postings.get(token, frozenset()) for token in tokens)
+            elif part.endswith('*'):
+                prefix = part[:-1].lower()
+                sets.append(self._prefix_postings(prefix))
+            else:
+                tokens = tokenize(part)
+                sets.extend(self._postings.get(token, frozenset()) for token in tokens)
+
+        if not sets:
+            return []
+
+        sets.sort(key=len)
+        matched: Iterable[_MessageKey] = sets[0]
+        for s in sets[1:]:
+            matched = s.intersection(matched)
+        if channel_id is not None:
+            matched = [key for key in matched if key[0] == channel_id]
+        if phrases:
+            docs = self._docs
+            matched = [
+                key for key in matched if all(_contains(docs[key], p) for p in phrases)
+            ]
+
+        if limit is not None:
+            return heapq.nlargest(limit, matched, key=_by_ts)
+
+        return sorted(matched, key=_by_ts, reverse=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {'messages': len(self._docs), 'tokens': len(self._postings)}
+
+    def _prefix_postings(self, prefix: str) -> set[_MessageKey]:
+        postings = self._postings
+        if len(prefix) >= 2:
+            tokens: Iterable[str] = self._prefixes.get(prefix[:2], ())
+        else:
+            # Rare, and still bounded by the vocabulary
+            tokens = postings
+
+        matched: set[_MessageKey] = set()
+        for token in tokens:
+            if token.startswith(prefix):
+                matched |= postings[token]
+
+        return matched
+
+    def _unindex(self, key: _MessageKey, tokens: tuple[str, ...]) -> None:
+        postings = self._postings
+        for token in set(tokens):
+            keys = postings[token]
+            keys.discard(key)
+            if not keys:
+                del postings[token]
+                bucket = self._prefixes[token[:2]]
+                bucket.discard(token)
+                if not bucket:
+                    del self._prefixes[token[:2]]
+
+
+def _contains(tokens: tuple[str, ...], phrase: tuple[str, ...]) -> bool:
+    size = len(phrase)
+    first = phrase[0]
+    for i in range(len(tokens) - size + 1):
+        if tokens[i] == first and tokens[i : i + size] == phrase:
+            return True
+    return False
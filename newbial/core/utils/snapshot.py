@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    MessageRow = tuple[str, str, str, str | None, str | None, bool, str | None]
+
+__all__ = ('StateSnapshot',)
+
+_MESSAGE_COLUMNS = 'channel_id, ts, text, user_id, bot_id, hidden, thread_ts'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS messages (
+    channel_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    text TEXT NOT NULL,
+    user_id TEXT,
+    bot_id TEXT,
+    hidden INTEGER NOT NULL,
+    thread_ts TEXT,
+    PRIMARY KEY (channel_id, ts)
+) WITHOUT ROWID;
+-- Slack timestamps have a fixed width, so they sort correctly as text
+CREATE INDEX IF NOT EXISTS messages_ts ON messages (ts);
+CREATE TABLE IF NOT EXISTS users (id TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS channels (id TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID;
+'''
+
+
+class StateSnapshot:
+    """An SQLite file that keeps cached state across restarts.
+
+    Nothing is loaded up front: rows are read one at a time on cache misses
+    (or in bounded batches with `recent_messages()`), so opening a large
+    snapshot is cheap. Writes go through a separate connection so they can
+    run in a thread while the event loop keeps reading (the file is in WAL
+    mode).
+
+    Message rows are `(channel_id, ts, text, user_id, bot_id, hidden,
+    thread_ts)` tuples, users and channels are stored as their `toJSON()` output.
+    """
+
+    if TYPE_CHECKING:
+        path: str
+        _reader: sqlite3.Connection | None
+        _writer: sqlite3.Connection | None
+        _lock: threading.Lock
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'<StateSnapshot path={self.path!r} opened={self.opened}>'
+
+    @property
+    def opened(self) -> bool:
+        return self._reader is not None
+
+    def open(self) -> None:
+        if self._reader is not None:
+            return
+
+        writer = sqlite3.connect(self.path, check_same_thread=False)
+        writer.execute('PRAGMA journal_mode=WAL')
+        # A crash may lose the last transaction, but never corrupts the file
+        writer.execute('PRAGMA synchronous=NORMAL')
+        writer.executescript(_SCHEMA)
+        writer.commit()
+
+        self._writer = writer
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in (self._reader, self._writer):
+                if conn is not None:
+                    conn.close()
+            self._reader = self._writer = None
+
+    def get_message(self, channel_id: str, ts: str) -> MessageRow | None:
+        reader = self._reader
+        if reader is None:
+            return None
+
+        return reader.execute(
+            f'SELECT {_MESSAGE_COLUMNS} FROM messages WHERE channel_id = ? AND ts = ?',
+            (channel_id, ts),
+        ).fetchone()
+
+    def recent_messages(self, limit: int) -> list[MessageRow]:
+        """Returns up to `limit` of the newest messages, oldest first."""
+        reader = self._reader
+        if reader is None or limit <= 0:
+            return []
+
+        rows = reader.execute(
+            f'SELECT {_MESSAGE_COLUMNS} FROM messages ORDER BY ts DESC LIMIT ?',
+            (limit,),
+        ).fetchall()
+        rows.reverse()
+
+        return rows
+
+    def users(self) -> list[dict[str, Any]]:
+        return self._load_objects('users')
+
+    def channels(self) -> list[dict[str, Any]]:
+        return self._load_objects('channels')
+
+    def _load_objects(self, table: str) -> list[dict[str, Any]]:
+        reader = self._reader
+        if reader is None:
+            return []
+
+        loads = json.loads
+        return [loads(data) for data, in reader.execute(f'SELECT data FROM {table}')]
+
+    def write(
+        self,
+        messages: Iterable[MessageRow] = (),
+        users: Iterable[dict[str, Any]] = (),
+        channels: Iterable[dict[str, Any]] = (),
+        deleted: Iterable[tuple[str, str]] = (),
+    ) -> None:
+        """Inserts or replaces rows in one transaction.
+
+        This blocks, and is meant to be run in a thread.
+        """
+        dumps = json.dumps
+        with self._lock:
+            writer = self._writer
+            if writer is None:
+                return
+
+            with writer:
+                writer.executemany(
+                    'INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    messages,
+                )
+                writer.executemany(
+                    'DELETE FROM messages WHERE channel_id = ? AND ts = ?', deleted
+                )
+                writer.executemany(
+                    'INSERT OR REPLACE INTO users VALUES (?, ?)',
+                    ((d['id'], dumps(d)) for d in users),
+                )
+                writer.executemany(
+                    'INSERT OR REPLACE INTO channels VALUES (?, ?)',
+                    ((d['id'], dumps(d)) for d in channels),
+                )
+
+    def prune(self, before: float) -> int:
+        """Deletes messages older than the `before` timestamp, returns how many."""
+        with self._lock:
+            writer = self._writer
+            if writer is None:
+                return 0
+
+            with writer:
+                cursor = writer.execute(
+                    'DELETE FROM messages WHERE ts < ?', (f'{before:.6f}',)
+                )
+
+            return cursor.rowcount
@@ -1,2 +1,6 @@
+from newbial.slack.clients.outbound import *
+from newbial.slack.clients.rate_limiter import *
+from newbial.slack.clients.recorder import *
 from newbial.slack.clients.socket_client import *
+from newbial.slack.clients.socket_pool import *
 from newbial.slack.clients.web_client import *
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+    from newbial.slack.clients.web_client import WebClient
+
+__all__ = ('OutboundQueue',)
+
+_BatchKey = tuple[str, 'str | None']
+
+
+class _Batch:
+    __slots__ = ('parts', 'length', 'futures', 'handle')
+
+    if TYPE_CHECKING:
+        parts: list[str]
+        length: int
+        futures: list[asyncio.Future[AsyncSlackResponse]]
+        handle: asyncio.TimerHandle | None
+
+    def __init__(self) -> None:
+        self.parts = []
+        self.length = 0
+        self.futures = []
+        self.handle = None
+
+
+class OutboundQueue:
+    """Merges messages posted to the same channel (and thread) within
+    `window` seconds into one `chat.postMessage` call.
+
+    Texts are joined with newlines up to `max_length` characters, a message
+    that does not fit starts the next post. Each queued message gets a
+    future that resolves with the response of the post it was merged into.
+    """
+
+    if TYPE_CHECKING:
+        window: float
+        max_length: int
+        posts: int
+        merged: int
+        _client: WebClient
+        _logger: logging.Logger
+        _batches: dict[_BatchKey, _Batch]
+        _tasks: set[asyncio.Task[None]]
+
+    def __init__(
+        self, client: WebClient, window: float = 1.0, max_length: int = 4000
+    ) -> None:
+        self.window = window
+        self.max_length = max_length
+        self.posts = self.merged = 0
+        self._client = client
+        self._logger = logging.getLogger(__name__)
+        self._batches = {}
+        self._tasks = set()
+
+    def __repr__(self) -> str:
+        return (
+            f'<OutboundQueue window={self.window} max_length={self.max_length} '
+            f'pending={len(self._batches)}>'
+        )
+
+    def add(
+        self, channel: str, text: str, *, thread_ts: str | None = None
+    ) -> asyncio.Future[AsyncSlackResponse]:
+        key = (channel, thread_ts)
+        batch = self._batches.get(key)
+
+        # Joining adds a newline
+        if batch is not None and batch.length + 1 + len(text) > self.max_length:
+            self._flush(key)
+            batch = None
+
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            loop = asyncio.get_running_loop()
+            batch.handle = loop.call_later(self.window, self._flush, key)
+        else:
+            batch.length += 1
+            self.merged += 1
+
+        batch.parts.append(text)
+        batch.length += len(text)
+        future = asyncio.get_running_loop().create_future()
+        batch.futures.append(future)
+
+        if batch.length >= self.max_length:
+            self._flush(key)
+
+        return future
+
+    async def flush(self) -> None:
+        """Posts every pending batch now and waits for all posts to land."""
+        for key in tuple(self._batches):
+            self._flush(key)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'pending': sum(len(b.futures) for b in self._batches.values()),
+            'posts': self.posts,
+            'merged': self.merged,
+        }
+
+    def _flush(self, key: _BatchKey) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+
+        if batch.handle is not None:
+            batch.handle.cancel()
+
+        task = asyncio.create_task(self._post(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _post(self, key: _BatchKey, batch: _Batch) -> None:
+        channel, thread_ts = key
+        try:
+            response = await self._client.chat_postMessage(
+                channel=channel,
+                thread_ts=thread_ts,
+                text='\n'.join(batch.parts),
+            )
+        except Exception as exc:
+            self._logger.debug(
+                f'Failed to post {len(batch.futures)} messages to {channel}.'
+            )
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.posts += 1
+        for future in batch.futures:
+            if not future.done():
+                future.set_result(response)
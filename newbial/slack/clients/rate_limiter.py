@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+__all__ = (
+    'RequestPriority',
+    'request_priority',
+    'RateLimiter',
+)
+
+
+class RequestPriority(IntEnum):
+    # Lower values are sent first when calls have to wait
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+_priority: ContextVar[RequestPriority] = ContextVar(
+    'request_priority', default=RequestPriority.NORMAL
+)
+
+
+@contextlib.contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Sets the priority of the Web API calls made in this block (and in
+    the tasks started from it).
+
+    Examples
+    --------
+    ```py
+    with request_priority(RequestPriority.LOW):
+        await bot.web.users_info(user=user_id)
+    ```
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# Requests per minute of Slack's rate limit tiers
+_TIERS = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Opening socket connections is spaced out by SocketPool and retried by
+# slack_sdk, holding it back here would only delay reconnects
+_UNSCHEDULED = frozenset({'apps.connections.open'})
+
+_METHOD_TIERS = {
+    'auth.test': 4,
+    'chat.delete': 3,
+    'chat.getPermalink': 4,
+    'chat.postEphemeral': 4,
+    'chat.update': 3,
+    'conversations.history': 3,
+    'conversations.info': 3,
+    'conversations.list': 2,
+    'conversations.members': 4,
+    'conversations.replies': 3,
+    'files.upload': 2,
+    'reactions.add': 3,
+    'reactions.remove': 2,
+    'team.info': 3,
+    'users.info': 4,
+    'users.list': 2,
+    'users.lookupByEmail': 3,
+    'views.open': 4,
+    'views.publish': 4,
+    'views.update': 4,
+}
+_DEFAULT_TIER = 3
+
+# chat.postMessage has its own limits: about one message per second per
+# channel with short bursts, and several hundred per minute in total
+_POST_MESSAGE = 'chat.postMessage'
+_CHANNEL_RATE = 1.0
+_CHANNEL_BURST = 3
+_POST_MESSAGE_PER_MINUTE = 300
+
+# Seconds between sweeps of idle per-channel buckets
+_SWEEP_INTERVAL = 60.0
+
+
+class _Bucket:
+    """A token bucket whose waiters are served by priority."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'waiters', 'handle')
+
+    if TYPE_CHECKING:
+        rate: float
+        capacity: float
+        tokens: float
+        updated: float
+        waiters: list[tuple[int, int, asyncio.Future[None]]]
+        handle: asyncio.TimerHandle | None
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+        self.waiters = []
+        self.handle = None
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available, after `refill()`."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Schedules Web API calls to stay under Slack's rate limits.
+
+    Each method has a token bucket refilled at its tier's rate (times
+    `headroom`), and `chat.postMessage` has one per channel as well. Calls
+    that would exceed a limit wait, and waiting calls are let through by
+    `RequestPriority` and then in order. A `Retry-After` given with a 429
+    pauses every call, see `pause()`.
+
+    Per-channel buckets that are full again and have no waiters are dropped
+    every `_SWEEP_INTERVAL` seconds, as a new bucket would be the same.
+    """
+
+    if TYPE_CHECKING:
+        headroom: float
+        waited: int
+        _buckets: dict[tuple[str, str | None], _Bucket]
+        _paused_until: float
+        _next_sweep: float
+        _counter: Iterator[int]
+        _clock: Callable[[], float]
+
+    def __init__(
+        self,
+        headroom: float = 0.9,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.headroom = headroom
+        self.waited = 0
+        self._buckets = {}
+        self._paused_until = 0.0
+        self._counter = itertools.count()
+        self._clock = clock
+        self._next_sweep = clock() + _SWEEP_INTERVAL
+
+    def __repr__(self) -> str:
+        return f'<RateLimiter buckets={len(self._buckets)} headroom={self.headroom}>'
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_until > self._clock()
+
+    async def acquire(self, method: str, channel: str | None = None) -> None:
+        """Waits until a call to `method` (posting to `channel`) can be made."""
+        if method in _UNSCHEDULED:
+            return
+
+        priority = _priority.get()
+        if method == _POST_MESSAGE and channel is not None:
+            if self._clock() >= self._next_sweep:
+                self._sweep()
+            await self._take(self._bucket(method, channel), priority)
+        await self._take(self._bucket(method, None), priority)
+
+    def pause(self, seconds: float) -> None:
+        """Holds back every call for `seconds`."""
+        now = self._clock()
+        self._paused_until = max(self._paused_until, now + seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'buckets': len(self._buckets),
+            'waiting': sum(len(b.waiters) for b in self._buckets.values()),
+            'waited': self.waited,
+            'paused': max(0.0, self._paused_until - self._clock()),
+        }
+
+    def _sweep(self) -> None:
+        now = self._clock()
+        self._next_sweep = now + _SWEEP_INTERVAL
+
+        buckets = self._buckets
+        for key, bucket in tuple(buckets.items()):
+            if key[1] is None or bucket.waiters or bucket.handle is not None:
+                continue
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del buckets[key]
+
+    def _bucket(self, method: str, channel: str | None) -> _Bucket:
+        key = (method, channel)
+        try:
+            return self._buckets[key]
+        except KeyError:
+            pass
+
+        if channel is not None:
+            rate, capacity = _CHANNEL_RATE, _CHANNEL_BURST
+        else:
+            if method == _POST_MESSAGE:
+                per_minute = _POST_MESSAGE_PER_MINUTE
+            else:
+                per_minute = _TIERS[_METHOD_TIERS.get(method, _DEFAULT_TIER)]
+            rate = per_minute / 60
+            # Slack tolerates short bursts, up to a few seconds' worth
+            capacity = max(1.0, rate * 3)
+
+        bucket = self._buckets[key] = _Bucket(
+            rate * self.headroom, capacity, self._clock()
+        )
+        return bucket
+
+    async def _take(self, bucket: _Bucket, priority: int) -> None:
+        now = self._clock()
+        if not bucket.waiters and self._paused_until <= now:
+            bucket.refill(now)
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return
+
+        self.waited += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(bucket.waiters, (priority, next(self._counter), future))
+        if bucket.handle is None:
+            self._schedule(bucket)
+
+        await future
+
+    def _schedule(self, bucket: _Bucket) -> None:
+        now = self._clock()
+        bucket.refill(now)
+        delay = max(bucket.delay(), self._paused_until - now)
+
+        loop = asyncio.get_running_loop()
+        bucket.handle = loop.call_later(delay, self._wake, bucket)
+
+    def _wake(self, bucket: _Bucket) -> None:
+        bucket.handle = None
+        now = self._clock()
+        waiters = bucket.waiters
+
+        if self._paused_until <= now:
+            bucket.refill(now)
+            while waiters and bucket.tokens >= 1:
+                future = heapq.heappop(waiters)[2]
+                if future.done():
+                    # Cancelled while waiting
+                    continue
+                bucket.tokens -= 1
+                future.set_result(None)
+
+        # Cancelled waiters are dropped without holding up the schedule
+        while waiters and waiters[0][2].done():
+            heapq.heappop(waiters)
+        if waiters:
+            self._schedule(bucket)
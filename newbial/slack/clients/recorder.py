@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import struct
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator
+
+if TYPE_CHECKING:
+    from slack_sdk.socket_mode.async_client import AsyncBaseSocketModeClient
+
+    from newbial.slack.clients.socket_pool import SocketPool
+
+__all__ = (
+    'FrameRecorder',
+    'read_frames',
+)
+
+# Every frame is stored as a header (payload length, receive time)
+# followed by the raw JSON payload sent by Slack, encoded as UTF-8
+_HEADER = struct.Struct('>Id')
+
+
+def _open(path: str, mode: str) -> BinaryIO:
+    if path.endswith('.gz'):
+        return gzip.open(path, mode)  # type: ignore
+    return open(path, mode)  # type: ignore
+
+
+def read_frames(path: str) -> Iterator[tuple[float, str]]:
+    """Yields the `(receive time, raw payload)` pairs stored in a
+    recording made by `FrameRecorder`.
+    """
+    header_size = _HEADER.size
+    unpack = _HEADER.unpack
+
+    with _open(path, 'rb') as file:
+        read = file.read
+        while True:
+            header = read(header_size)
+            if len(header) < header_size:
+                return
+
+            size, t = unpack(header)
+            yield t, read(size).decode()
+
+
+class FrameRecorder:
+    """Appends the raw socket mode envelopes received by a socket client
+    to a file, to be replayed later with `read_frames()`.
+
+    Paths ending with `.gz` are compressed.
+    """
+
+    if TYPE_CHECKING:
+        path: str
+        frames: int
+        _file: BinaryIO | None
+        _logger: logging.Logger
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.frames = 0
+        self._file = None
+        self._logger = logging.getLogger(__name__)
+
+    def __repr__(self) -> str:
+        return f'<FrameRecorder path={self.path!r} frames={self.frames}>'
+
+    def open(self, *, truncate: bool = False) -> None:
+        if self._file is None:
+            self._file = _open(self.path, 'wb' if truncate else 'ab')
+            self._logger.info(f'Recording socket frames to "{self.path}"')
+
+    def attach(self, client: AsyncBaseSocketModeClient | SocketPool) -> None:
+        self.open()
+        client.message_listeners.insert(0, self._message_callback)
+
+    def detach(self, client: AsyncBaseSocketModeClient | SocketPool) -> None:
+        try:
+            client.message_listeners.remove(self._message_callback)
+        except ValueError:
+            pass
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+            self._logger.debug(f'Recorded {self.frames} frames.')
+
+    def write(self, raw: str, t: float | None = None) -> None:
+        if self._file is None:
+            return
+
+        data = raw.encode()
+        self._file.write(_HEADER.pack(len(data), time.time() if t is None else t))
+        self._file.write(data)
+        self.frames += 1
+
+    async def _message_callback(self, *args: Any) -> None:
+        # Arguments given are (SocketClient, dict, str | None)
+        raw: str | None = args[2]
+
+        if raw is not None:
+            self.write(raw)
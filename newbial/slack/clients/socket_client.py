@@ -1,56 +1,240 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import re
+import time
+from collections import deque
 from typing import TYPE_CHECKING, Any
 
-import aiohttp
 from slack_sdk.socket_mode.aiohttp import SocketModeClient
 
-from newbial.core.events import ReadyEvent
-
 if TYPE_CHECKING:
     from newbial.core.bot import Bot
+    from newbial.slack.clients import SocketPool
 
 __all__ = ('SocketClient',)
 
+# Envelope IDs are only read from the raw frame, so acks do not wait for the
+# full decode. Quotes inside JSON strings are escaped, so this only matches keys
+_ENVELOPE_ID_RE = re.compile(r'"envelope_id"\s*:\s*"([^"]+)"')
+
+
+def _percentiles(samples: deque[float]) -> dict[str, float] | None:
+    if not samples:
+        return None
+
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    return {
+        'p50': ordered[int(last * 0.5)],
+        'p90': ordered[int(last * 0.9)],
+        'p99': ordered[int(last * 0.99)],
+        'max': ordered[-1],
+    }
+
 
 class SocketClient(SocketModeClient):
     if TYPE_CHECKING:
         _bot: Bot
-
-    def __init__(self, bot: Bot) -> None:
+        _pool: SocketPool | None
+        name: str
+        connects: int
+        frames: int
+        last_frame: float | None
+        in_flight: int
+        _frame_slots: asyncio.Semaphore | None
+        ack_delay: float
+        acks_sent: int
+        acks_failed: int
+        _acks: list[tuple[str, float]]
+        _ack_handle: asyncio.Handle | None
+        _ack_task: asyncio.Task[None] | None
+        _ack_latencies: deque[float]
+
+    def __init__(
+        self,
+        bot: Bot,
+        *,
+        pool: SocketPool | None = None,
+        name: str = 'socket',
+    ) -> None:
         self._bot = bot
-        self._logger = logging.getLogger(__name__)
+        self._pool = pool
+        self._logger = logging.getLogger(f'{__name__}.{name}')
+        self.name = name
+        self.connects = self.frames = self.in_flight = 0
+        self.last_frame = None
 
         super().__init__(
             web_client=bot.web,
             app_token=bot.config.slack.socket_token,
         )
-
-        self.message_listeners.append(self._message_callback)
+        # slack_sdk always opens a session of its own (its constructor takes
+        # none), the bot's shared one is used instead (see connect()). Nothing
+        # was connected yet, detaching just drops the unused connector
+        session = self.aiohttp_client_session
+        if session is not None:
+            session.detach()
+
+        config = bot.config.socket or {}
+        # Acks received within this many seconds are sent together
+        self.ack_delay = config.get('ack_delay') or 0.0
+        self.acks_sent = self.acks_failed = 0
+        self._acks = []
+        self._ack_handle = None
+        self._ack_task = None
+        self._ack_latencies = deque(maxlen=config.get('ack_samples') or 1000)
+
+        # Frames being decoded or handled by listeners. The connections of a
+        # pool share the limit
+        if pool is not None:
+            self._frame_slots = pool._frame_slots
+        else:
+            max_in_flight = config.get('max_in_flight', 1000)
+            self._frame_slots = (
+                asyncio.Semaphore(max_in_flight) if max_in_flight else None
+            )
 
     async def connect(self):
-        if self.aiohttp_client_session.closed:
-            self.aiohttp_client_session = aiohttp.ClientSession()
+        # Also called by slack_sdk to reconnect, so this must not block
+        self.aiohttp_client_session = self._bot.http.session
 
         await super().connect()
+        self.connects += 1
 
         self._logger.debug('Connected.')
 
-        self._bot.events.dispatch(ReadyEvent())
-
-        assert self.current_session_monitor is not None
+    async def close(self) -> None:
+        # Keeps slack_sdk from closing the shared session
+        self.aiohttp_client_session = None  # type: ignore
+        await super().close()
+
+        # Frames still queued are never handled, give their slots back
+        queue = self.message_queue
+        while not queue.empty():
+            queue.get_nowait()
+            self._release_frame()
+
+    async def connect_to_new_endpoint(self, force: bool = False) -> None:
+        pool = self._pool
+        if pool is None or not (force or not await self.is_connected()):
+            return await super().connect_to_new_endpoint(force)
+
+        # Connections of a pool reconnect one at a time, the others keep
+        # receiving in the meantime
+        async with pool._reconnect_slot():
+            await super().connect_to_new_endpoint(force)
+
+    @property
+    def connected(self) -> bool:
+        return (
+            not self.closed
+            and self.current_session is not None
+            and not self.current_session.closed
+        )
 
+    async def enqueue_message(self, message: str) -> None:
+        self.frames += 1
+        self.last_frame = time.monotonic()
+
+        # Called by the receive loop with each raw frame, so envelopes are
+        # acked before the frame is decoded and handed to listeners
+        match = _ENVELOPE_ID_RE.search(message)
+        if match is not None:
+            self._queue_ack(match.group(1))
+
+        # slack_sdk handles every frame in a task of its own, so the receive
+        # loop is held here until a slot frees up. That stops reading from the
+        # socket while listeners (and the event queue behind them) are busy
+        slots = self._frame_slots
+        if slots is not None:
+            await slots.acquire()
+        self.in_flight += 1
+
+        await super().enqueue_message(message)
+
+    async def process_message(self) -> None:
+        # Same as slack_sdk's, but the slot taken in enqueue_message() is given
+        # back once the frame is done with, even if it fails to decode
+        raw_message = await self.message_queue.get()
         try:
-            await self.current_session_monitor
-        except asyncio.CancelledError:
-            pass
-
-    async def _message_callback(self, *args: Any) -> None:
-        d: dict[str, Any] = args[1]
+            message = json.loads(raw_message) if raw_message.startswith('{') else {}
+        except Exception:
+            self._release_frame()
+            raise
 
-        envelope_id: int = d['envelope_id']
+        asyncio.ensure_future(self._handle_frame(message, raw_message))
 
-        self._logger.debug(f'Sending ack for envelope "{envelope_id}"')
-        await self.send_socket_mode_response({'envelope_id': envelope_id})
+    async def _handle_frame(self, message: dict, raw_message: str) -> None:
+        try:
+            await self.run_message_listeners(message, raw_message)
+        finally:
+            self._release_frame()
+
+    def stats(self) -> dict[str, Any]:
+        """Connection health, ack counters and latencies (in seconds, from
+        receiving a frame until its ack was written) over the last
+        `socket.ack_samples` acks."""
+        last_frame = self.last_frame
+        return {
+            'name': self.name,
+            'connected': self.connected,
+            'reconnects': max(self.connects - 1, 0),
+            'frames': self.frames,
+            'in_flight': self.in_flight,
+            'idle': time.monotonic() - last_frame if last_frame is not None else None,
+            'acks_sent': self.acks_sent,
+            'acks_failed': self.acks_failed,
+            'acks_pending': len(self._acks),
+            'ack_latency': _percentiles(self._ack_latencies),
+        }
+
+    def _release_frame(self) -> None:
+        self.in_flight -= 1
+        if self._frame_slots is not None:
+            self._frame_slots.release()
+
+    def _queue_ack(self, envelope_id: str) -> None:
+        self._acks.append((envelope_id, time.perf_counter()))
+
+        # A running sender picks up new acks by itself
+        if self._ack_handle is None and not self._sending_acks():
+            loop = asyncio.get_running_loop()
+            if self.ack_delay > 0:
+                self._ack_handle = loop.call_later(self.ack_delay, self._flush_acks)
+            else:
+                self._ack_handle = loop.call_soon(self._flush_acks)
+
+    def _sending_acks(self) -> bool:
+        return self._ack_task is not None and not self._ack_task.done()
+
+    def _flush_acks(self) -> None:
+        self._ack_handle = None
+
+        if not self._sending_acks():
+            self._ack_task = asyncio.create_task(self._send_acks())
+
+    async def _send_acks(self) -> None:
+        clock = time.perf_counter
+        latencies = self._ack_latencies
+
+        while self._acks:
+            acks = self._acks
+            self._acks = []
+
+            for envelope_id, received in acks:
+                try:
+                    await self.send_message(json.dumps({'envelope_id': envelope_id}))
+                except Exception as exc:
+                    self.acks_failed += 1
+                    self._logger.error(
+                        f'Failed to send ack for envelope "{envelope_id}"', exc_info=exc
+                    )
+                else:
+                    self.acks_sent += 1
+                    latencies.append(clock() - received)
+
+            self._logger.debug(f'Sent {len(acks)} acks')
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
+
+from newbial.core.events import ReadyEvent
+from newbial.slack.clients.socket_client import SocketClient
+
+if TYPE_CHECKING:
+    from newbial.core.bot import Bot
+
+    MessageListener = Callable[
+        [SocketClient, dict[str, Any], 'str | None'], Awaitable[None]
+    ]
+
+__all__ = ('SocketPool',)
+
+
+class SocketPool:
+    """Several socket mode connections of the same app, used as one.
+
+    Connections are opened and reconnected `socket.stagger` seconds apart,
+    so while one reconnects the others keep receiving. Frames received by
+    any connection are passed to `message_listeners` (with the same
+    arguments as `SocketClient.message_listeners`). Envelopes received twice
+    around reconnects are dropped by `StateManager` (`state.dedup`). At
+    most `socket.max_in_flight` frames are handled at once across all
+    connections, further frames are left unread until one is done.
+    """
+
+    if TYPE_CHECKING:
+        clients: list[SocketClient]
+        stagger: float
+        message_listeners: list[MessageListener]
+        _bot: Bot
+        _logger: logging.Logger
+        _frame_slots: asyncio.Semaphore | None
+        _reconnect_lock: asyncio.Lock
+        _last_reconnect: float
+        _closed: asyncio.Event
+
+    def __init__(self, bot: Bot) -> None:
+        self._bot = bot
+        self._logger = logging.getLogger(__name__)
+
+        config = bot.config.socket or {}
+        size = config.get('connections') or 1
+        self.stagger = config.get('stagger') or 0.0
+        self.message_listeners = []
+        max_in_flight = config.get('max_in_flight', 1000)
+        self._frame_slots = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self.clients = []
+        for i in range(size):
+            client = SocketClient(bot, pool=self, name=f'socket-{i}')
+            client.message_listeners.append(self._message_callback)
+            self.clients.append(client)
+
+        self._reconnect_lock = asyncio.Lock()
+        self._last_reconnect = 0.0
+        self._closed = asyncio.Event()
+
+    def __repr__(self) -> str:
+        connected = sum(client.connected for client in self.clients)
+        return f'<SocketPool size={len(self.clients)} connected={connected}>'
+
+    async def connect(self) -> None:
+        """Opens the connections and waits until the pool is closed."""
+        self._closed.clear()
+
+        ready = False
+        error: Exception | None = None
+        for i, client in enumerate(self.clients):
+            if i and self.stagger:
+                await asyncio.sleep(self.stagger)
+            if self._closed.is_set():
+                return
+
+            try:
+                await client.connect()
+            except Exception as exc:
+                error = exc
+                self._logger.error(f'Failed to connect {client.name}.', exc_info=exc)
+                continue
+
+            if not ready:
+                ready = True
+                self._bot.events.dispatch(ReadyEvent())
+
+        if not ready:
+            assert error is not None
+            raise error
+
+        self._logger.debug(f'Connected ({len(self.clients)} connections).')
+
+        await self._closed.wait()
+
+    async def close(self) -> None:
+        self._closed.set()
+
+        await asyncio.gather(*(client.close() for client in self.clients))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'connections': [client.stats() for client in self.clients],
+        }
+
+    @contextlib.asynccontextmanager
+    async def _reconnect_slot(self) -> AsyncIterator[None]:
+        async with self._reconnect_lock:
+            delay = self._last_reconnect + self.stagger - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                yield
+            finally:
+                self._last_reconnect = time.monotonic()
+
+    async def _message_callback(self, *args: Any) -> None:
+        # Arguments given are (SocketClient, dict, str | None)
+        for listener in self.message_listeners:
+            try:
+                await listener(*args)
+            except Exception as exc:
+                self._logger.error('Failed to run a message listener.', exc_info=exc)
@@ -1,28 +1,93 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
-import aiohttp
+from slack_sdk.errors import SlackApiError
 from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+from newbial.core.utils import SingleFlight, TTLCache
+from newbial.slack.clients.outbound import OutboundQueue
+from newbial.slack.clients.rate_limiter import RateLimiter
 
 if TYPE_CHECKING:
     from newbial.core.bot import Bot
 
 __all__ = ('WebClient',)
 
+# Read-only methods whose responses may be cached, with their default TTL
+# (seconds). Responses are shared between callers and must not be mutated
+_CACHEABLE = {
+    'bots.info': 3600.0,
+    'conversations.info': 300.0,
+    'team.info': 3600.0,
+    'users.info': 300.0,
+    'users.profile.get': 300.0,
+}
+
+# Arguments cached responses are tagged with, for invalidate()
+_TAGS = ('user', 'channel')
+
+# Put after the last page by paginate()'s fetching task
+_DONE = object()
+
+
+def _next_cursor(response: AsyncSlackResponse) -> str | None:
+    return (response.get('response_metadata') or {}).get('next_cursor') or None
+
 
 class WebClient(AsyncWebClient):
+    if TYPE_CHECKING:
+        _bot: Bot
+        rate_limiter: RateLimiter | None
+        max_retries: int
+        rate_limited: int
+        prefetch: int
+        outbound: OutboundQueue
+        response_cache: TTLCache[AsyncSlackResponse]
+        _cache_ttls: dict[str, float]
+        _flights: SingleFlight[AsyncSlackResponse]
+        _generation: int
+
     def __init__(self, bot: Bot) -> None:
+        self._bot = bot
+
         super().__init__(
             token=bot.config.slack.bot_token,
+            base_url=bot.config.slack.get('base_url') or AsyncWebClient.BASE_URL,
         )
 
         self.__logger = logging.getLogger(__name__)
 
+        config = bot.config.web or {}
+        if config.get('rate_limit', True):
+            self.rate_limiter = RateLimiter(config.get('headroom') or 0.9)
+        else:
+            self.rate_limiter = None
+        self.max_retries = config.get('max_retries', 3)
+        self.rate_limited = 0
+        self.prefetch = config.get('prefetch', 1)
+
+        batch = config.get('batch') or {}
+        self.outbound = OutboundQueue(
+            self, batch.get('window', 1.0), batch.get('max_length', 4000)
+        )
+
+        cache = config.get('cache') or {}
+        ttls = {**_CACHEABLE, **(cache.get('ttl') or {})}
+        self._cache_ttls = {
+            method: ttl for method, ttl in ttls.items() if method in _CACHEABLE and ttl
+        }
+        self.response_cache = TTLCache(cache.get('max_size', 1000))
+        self._flights = SingleFlight()
+        # Bumped by invalidate(), responses requested before are not cached
+        self._generation = 0
+
     async def connect(self) -> None:
-        await self.close()
-        self.session = aiohttp.ClientSession()
+        self.session = self._bot.http.session
 
         await self.auth_test()
 
@@ -30,6 +95,189 @@ class WebClient(AsyncWebClient):
 
     async def close(self) -> None:
         if self.session is not None:
-            await self.session.close()
+            await self.outbound.flush()
+
+            # The session is shared, it is closed by the bot's HTTPManager
+            self.session = None
 
             self.__logger.debug('Closed.')
+
+    async def api_call(
+        self,
+        api_method: str,
+        *,
+        http_verb: str = 'POST',
+        files: dict[str, Any] | None = None,
+        data: Any = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        headers: dict[str, Any] | None = None,
+        auth: dict[str, Any] | None = None,
+    ) -> AsyncSlackResponse:
+        kwargs: dict[str, Any] = {
+            'http_verb': http_verb,
+            'files': files,
+            'data': data,
+            'params': params,
+            'json': json,
+            'headers': headers,
+            'auth': auth,
+        }
+
+        args: dict[str, Any] = {}
+        for d in (params, json, data):
+            if isinstance(d, dict):
+                args.update(d)
+
+        ttl = self._cache_ttls.get(api_method)
+        if ttl is None or files is not None:
+            return await self._scheduled_call(api_method, args.get('channel'), kwargs)
+
+        try:
+            key = (api_method, frozenset(args.items()))
+        except TypeError:
+            # Unhashable arguments, these calls are not worth caching
+            return await self._scheduled_call(api_method, args.get('channel'), kwargs)
+
+        response = self.response_cache.get(key)
+        if response is not None:
+            return response
+
+        return await self._flights.run(
+            key, partial(self._cached_call, key, ttl, args, kwargs)
+        )
+
+    def queue_message(
+        self, channel: str, text: str, *, thread_ts: str | None = None
+    ) -> asyncio.Future[AsyncSlackResponse]:
+        """Posts `text` to `channel`, merged with the other messages queued
+        for the channel (and thread) within `web.batch.window` seconds.
+
+        Returns a future resolving with the response of the merged post.
+        """
+        return self.outbound.add(channel, text, thread_ts=thread_ts)
+
+    async def paginate(
+        self,
+        method: str,
+        *,
+        prefetch: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[AsyncSlackResponse]:
+        """Iterates over the pages of a cursor-paginated method.
+
+        While a page is being processed, up to `prefetch` (`web.prefetch` by
+        default) following pages are requested ahead. Requests go through
+        the rate limiter with the priority set where iteration started.
+
+        Examples
+        --------
+        ```py
+        async for page in bot.web.paginate('users.list', limit=200):
+            for user in page['members']:
+                ...
+        ```
+        """
+        params = {k: v for k, v in kwargs.items() if v is not None}
+        depth = self.prefetch if prefetch is None else prefetch
+
+        if depth <= 0:
+            while True:
+                response = await self.api_call(method, http_verb='GET', params=params)
+                yield response
+
+                cursor = _next_cursor(response)
+                if cursor is None:
+                    return
+                params = {**params, 'cursor': cursor}
+
+        pages: asyncio.Queue[Any] = asyncio.Queue(depth)
+
+        async def fetch() -> None:
+            nonlocal params
+            try:
+                while True:
+                    response = await self.api_call(method, http_verb='GET', params=params)
+                    await pages.put(response)
+
+                    cursor = _next_cursor(response)
+                    if cursor is None:
+                        break
+                    params = {**params, 'cursor': cursor}
+            except Exception as exc:
+                await pages.put(exc)
+            else:
+                await pages.put(_DONE)
+
+        task = asyncio.create_task(fetch())
+        try:
+            while True:
+                page = await pages.get()
+                if page is _DONE:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            task.cancel()
+
+    def invalidate(self, *, user: str | None = None, channel: str | None = None) -> None:
+        """Drops the cached responses of calls made with this user or channel."""
+        self._generation += 1
+        if user is not None:
+            self.response_cache.invalidate(('user', user))
+        if channel is not None:
+            self.response_cache.invalidate(('channel', channel))
+
+    async def _cached_call(
+        self,
+        key: tuple[str, frozenset[tuple[str, Any]]],
+        ttl: float,
+        args: dict[str, Any],
+        kwargs: dict[str, Any],
+    ) -> AsyncSlackResponse:
+        generation = self._generation
+        response = await self._scheduled_call(key[0], args.get('channel'), kwargs)
+
+        # Not cached if an invalidation came in while it was in flight
+        if generation == self._generation:
+            tags = tuple((name, args[name]) for name in _TAGS if name in args)
+            self.response_cache.set(key, response, ttl, tags)
+
+        return response
+
+    async def _scheduled_call(
+        self, api_method: str, channel: str | None, kwargs: dict[str, Any]
+    ) -> AsyncSlackResponse:
+        limiter = self.rate_limiter
+        if limiter is None:
+            return await super().api_call(api_method, **kwargs)
+
+        retries = 0
+        while True:
+            await limiter.acquire(api_method, channel)
+            try:
+                return await super().api_call(api_method, **kwargs)
+            except SlackApiError as exc:
+                response = exc.response
+                if response.status_code != 429 or retries >= self.max_retries:
+                    raise
+
+                self.rate_limited += 1
+                retries += 1
+                retry_after = float(response.headers.get('Retry-After', 1))
+                self.__logger.warning(
+                    f'Rate limited on {api_method}, pausing calls for {retry_after}s.'
+                )
+                limiter.pause(retry_after)
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            'rate_limited': self.rate_limited,
+            'cache': self.response_cache.stats(),
+            'shared': self._flights.shared,
+            'outbound': self.outbound.stats(),
+        }
+        if self.rate_limiter is not None:
+            stats['scheduler'] = self.rate_limiter.stats()
+        return stats
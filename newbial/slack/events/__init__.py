@@ -1 +1,3 @@
+from newbial.slack.events.channel_events import *
 from newbial.slack.events.message_events import *
+from newbial.slack.events.user_events import *
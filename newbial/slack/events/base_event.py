@@ -1,15 +1,26 @@
-from typing import Protocol
+from typing import Any, Mapping, Protocol
 
-from newbial.core.events import BaseEvent as BaseCoreEvent
-from newbial.types.events import SlackEvent, EventData
+from newbial.core.events import BaseEvent as BaseCoreEvent, EventPriority, lazy_attribute
+from newbial.types.events import SlackEvent
 
 
 class BaseEvent(BaseCoreEvent, SlackEvent, Protocol):
-    __slots__ = ('type', 'ts')
+    __slots__ = ('_data', '_type', '_ts')
+    __event_priority__ = EventPriority.LOW
 
-    def __init__(self, data: EventData) -> None:
-        self.type = data['type']
-        self.ts = data['event_ts']
+    # Not EventData: the event data types narrow "type" to literals, which
+    # (TypedDict fields being mutable) makes them incompatible with it
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        # Fields are decoded by lazy attributes when first accessed
+        self._data = data
+
+    @lazy_attribute
+    def type(self) -> str:
+        return self._data['type']
+
+    @lazy_attribute
+    def ts(self) -> str:
+        return self._data['event_ts']
 
     # https://github.com/python/cpython/pull/31628
     # typing.Protocol replaces __init__() (patched in 3.11)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from newbial.slack.events.base_event import BaseEvent
+
+if TYPE_CHECKING:
+    from newbial.slack.structures import Channel
+    from newbial.types.events import ChannelRenameEventPayload
+
+__all__ = ('ChannelRenameEvent',)
+
+
+class ChannelRenameEvent(BaseEvent):
+    __slots__ = ('old_name', 'channel')
+    __event_name__ = 'channel_rename'
+
+    def __init__(
+        self,
+        payload: ChannelRenameEventPayload,
+        old_name: str | None,
+        channel: Channel,
+    ) -> None:
+        self.old_name = old_name
+        self.channel = channel
+
+        super().__init__(payload['event'])
+
+    @property
+    def channel_id(self) -> str:
+        return self.channel.id
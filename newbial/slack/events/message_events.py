@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from newbial.core.events import lazy_attribute
 from newbial.slack.events.base_event import BaseEvent
 
 if TYPE_CHECKING:
+    from typing_extensions import Self
+
     from newbial.slack.structures import Message
     from newbial.types.events import (
+        MessageEventData,
         MessageEventPayload,
         MessageChangedEventPayload,
     )
@@ -18,7 +22,10 @@ __all__ = (
 
 
 class MessageEvent(BaseEvent):
-    __slots__ = ('message', 'subtype')
+    if TYPE_CHECKING:
+        _data: MessageEventData
+
+    __slots__ = ('message', '_subtype')
     __event_name__ = 'message'
 
     def __init__(
@@ -27,14 +34,25 @@ class MessageEvent(BaseEvent):
         message: Message,
     ) -> None:
         self.message = message
-        self.subtype = payload['event'].get('subtype')
 
         super().__init__(payload['event'])
 
+    @lazy_attribute
+    def subtype(self) -> str | None:
+        return self._data.get('subtype')
+
     @property
     def text(self) -> str:
         return self.message.text
 
+    @property
+    def channel_id(self) -> str:
+        return self.message.channel_id
+
+    @property
+    def user_id(self) -> str | None:
+        return self.message.user_id
+
     @property
     def is_bot(self) -> bool:
         return self.message.bot_id is not None
@@ -54,3 +72,26 @@ class MessageChangedEvent(BaseEvent):
         self.message = message
 
         super().__init__(payload['event'])
+
+    @property
+    def channel_id(self) -> str:
+        return self.message.channel_id
+
+    @property
+    def user_id(self) -> str | None:
+        return self.message.user_id
+
+    @property
+    def is_bot(self) -> bool:
+        return self.message.bot_id is not None
+
+    def _coalesce_key(self) -> tuple[str, str]:
+        return (self.message.channel_id, self.message.ts)
+
+    def _coalesce(self, newer: MessageChangedEvent) -> Self:
+        # Keep the message from before the first edit
+        # and the content after the last one
+        self.message = newer.message
+        self.ts = newer.ts
+
+        return self
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from newbial.slack.events.base_event import BaseEvent
+
+if TYPE_CHECKING:
+    from newbial.slack.structures import User
+    from newbial.types.events import UserChangeEventPayload
+
+__all__ = ('UserChangeEvent',)
+
+
+class UserChangeEvent(BaseEvent):
+    __slots__ = ('old_user', 'user')
+    __event_name__ = 'user_change'
+
+    def __init__(
+        self,
+        payload: UserChangeEventPayload,
+        old_user: User | None,
+        user: User,
+    ) -> None:
+        # old_user is a copy of the cached user from before the change
+        self.old_user = old_user
+        self.user = user
+
+        super().__init__(payload['event'])
+
+    @property
+    def user_id(self) -> str:
+        return self.user.id
+
+    @property
+    def is_bot(self) -> bool:
+        return self.user.is_bot
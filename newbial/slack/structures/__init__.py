@@ -1 +1,3 @@
+from newbial.slack.structures.channel import Channel
 from newbial.slack.structures.message import Message
+from newbial.slack.structures.user import User
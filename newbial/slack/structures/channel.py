@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from newbial.core.managers import StateManager
+    from newbial.types.events import ChannelData
+
+__all__ = ('Channel',)
+
+
+class Channel:
+    if TYPE_CHECKING:
+        _state: StateManager
+        id: str
+        name: str | None
+        is_private: bool
+        is_archived: bool
+        is_im: bool
+
+    __slots__ = (
+        '_state',
+        'id',
+        'name',
+        'is_private',
+        'is_archived',
+        'is_im',
+    )
+
+    def __init__(self, *, state: StateManager, data: ChannelData) -> None:
+        self._state = state
+        self.id = data['id']
+        self._update(data)
+
+    def __repr__(self) -> str:
+        return f'<Channel id={self.id!r} name={self.name!r}>'
+
+    @classmethod
+    def _from_json(cls, state: StateManager, data: dict[str, Any]) -> Self:
+        """Builds a channel from its `toJSON()` output."""
+        self = cls.__new__(cls)
+        self._state = state
+        for k, v in data.items():
+            setattr(self, k, v)
+
+        return self
+
+    def _update(self, data: ChannelData) -> None:
+        # IMs have no name
+        self.name = data.get('name')
+        self.is_private = data.get('is_private', False)
+        self.is_archived = data.get('is_archived', False)
+        self.is_im = data.get('is_im', False)
+
+    def toJSON(self) -> dict[str, Any]:
+        return {
+            k: getattr(self, k) for k in self.__class__.__slots__ if not k.startswith('_')
+        }
@@ -3,7 +3,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from typing_extensions import Self
+
     from newbial.core.managers import StateManager
+    from newbial.slack.structures import Channel, User
     from newbial.types.events import MessageEventData
 
 __all__ = ('Message',)
@@ -14,10 +17,12 @@ class Message:
         _state: StateManager
         ts: str
         text: str
-        user_id: str
+        # None for messages posted by bots (subtype "bot_message")
+        user_id: str | None
         channel_id: str
         bot_id: str | None
         hidden: bool
+        thread_ts: str | None
 
     __slots__ = (
         '_state',
@@ -27,16 +32,60 @@ class Message:
         'channel_id',
         'bot_id',
         'hidden',
+        'thread_ts',
     )
 
     def __init__(self, *, state: StateManager, data: MessageEventData) -> None:
         self._state = state
         self.ts = data['ts']
         self.text = data['text']
-        self.user_id = data['user']
+        self.user_id = data.get('user')
         self.channel_id = data['channel']
         self.bot_id = data.get('bot_id')
         self.hidden = data.get('hidden', False)
+        self.thread_ts = data.get('thread_ts')
+
+    @classmethod
+    def _from_fields(
+        cls,
+        state: StateManager,
+        ts: str,
+        text: str,
+        user_id: str | None,
+        channel_id: str,
+        bot_id: str | None = None,
+        hidden: bool = False,
+        thread_ts: str | None = None,
+    ) -> Self:
+        """Builds a message from already decoded fields, bypassing the payload."""
+        self = cls.__new__(cls)
+        self._state = state
+        self.ts = ts
+        self.text = text
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.bot_id = bot_id
+        self.hidden = hidden
+        self.thread_ts = thread_ts
+
+        return self
+
+    @property
+    def is_reply(self) -> bool:
+        """Whether this message is a reply in a thread (not the thread's parent)."""
+        return self.thread_ts is not None and self.thread_ts != self.ts
+
+    @property
+    def user(self) -> User | None:
+        """The author, if cached. See `StateManager.fetch_user()`."""
+        if self.user_id is None:
+            return None
+        return self._state.get_user(self.user_id)
+
+    @property
+    def channel(self) -> Channel | None:
+        """The channel, if cached. See `StateManager.fetch_channel()`."""
+        return self._state.get_channel(self.channel_id)
 
     def toJSON(self) -> dict[str, Any]:
         return {
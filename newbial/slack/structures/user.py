@@ -3,12 +3,65 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from typing_extensions import Self
+
     from newbial.core.managers import StateManager
+    from newbial.types.events import UserData
+
+__all__ = ('User',)
 
 
 class User:
-    __slots__ = ()
+    if TYPE_CHECKING:
+        _state: StateManager
+        id: str
+        team_id: str | None
+        name: str
+        real_name: str | None
+        display_name: str | None
+        is_bot: bool
+        deleted: bool
+
+    __slots__ = (
+        '_state',
+        'id',
+        'team_id',
+        'name',
+        'real_name',
+        'display_name',
+        'is_bot',
+        'deleted',
+    )
 
-    def __init__(self, state: StateManager, data: dict[str, Any]) -> None:
+    def __init__(self, *, state: StateManager, data: UserData) -> None:
         self._state = state
         self.id = data['id']
+        self._update(data)
+
+    def __repr__(self) -> str:
+        return f'<User id={self.id!r} name={self.name!r}>'
+
+    @classmethod
+    def _from_json(cls, state: StateManager, data: dict[str, Any]) -> Self:
+        """Builds a user from its `toJSON()` output."""
+        self = cls.__new__(cls)
+        self._state = state
+        for k, v in data.items():
+            setattr(self, k, v)
+
+        return self
+
+    def _update(self, data: UserData) -> None:
+        profile = data.get('profile', {})
+
+        self.team_id = data.get('team_id')
+        self.name = data['name']
+        self.real_name = profile.get('real_name') or data.get('real_name')
+        self.display_name = profile.get('display_name') or None
+        self.is_bot = data.get('is_bot', False)
+        self.deleted = data.get('deleted', False)
+
+    def toJSON(self) -> dict[str, Any]:
+        return {
+            k: getattr(self, k) for k in self.__class__.__slots__ if not k.startswith('_')
+        }
@@ -2,10 +2,27 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
+from newbial.types.core import DispatchMode, MessageBackend, OverflowPolicy
+
 __all__ = (
     'Config',
     'Slack',
+    'Socket',
+    'Web',
+    'WebCache',
+    'WebBatch',
+    'Http',
+    'Events',
+    'EventsQueue',
+    'Executors',
+    'State',
+    'StateMessages',
+    'StateDedup',
+    'StateSnapshot',
+    'StateWarmUp',
+    'StateSearch',
     'Ipc',
+    'Recording',
     'Logging',
     'LoggingLevels',
     'Modules',
@@ -21,15 +38,128 @@ __all__ = (
 
 class Config(Mapping[str, Any]):
     slack: Slack
+    socket: Socket  # *
+    web: Web  # *
+    http: Http  # *
+    events: Events
+    executors: Executors  # *
+    state: State  # *
     ipc: Ipc
+    recording: Recording  # *
     logging: Logging
     modules: Modules
 
 
 # config.slack
-class Slack(Mapping[str, str]):
+class Slack(Mapping[str, Any]):
     bot_token: str
     socket_token: str
+    base_url: str | None  # * (Web API URL, ending with "/")
+
+
+# config.socket
+class Socket(Mapping[str, Any]):
+    connections: int  # *
+    stagger: float  # * (seconds)
+    ack_delay: float  # * (seconds)
+    ack_samples: int  # *
+    max_in_flight: int  # * (frames handled at once, 0 -> no limit)
+
+
+# config.web
+class Web(Mapping[str, Any]):
+    rate_limit: bool  # * (schedule calls under Slack's rate limits)
+    headroom: float  # * (fraction of each limit used)
+    max_retries: int  # * (retries after a 429)
+    prefetch: int  # * (pages requested ahead by paginate())
+    cache: WebCache  # *
+    batch: WebBatch  # *
+
+
+# config.web.cache
+class WebCache(Mapping[str, Any]):
+    max_size: int  # *
+    ttl: Mapping[str, float]  # * (seconds by method, 0 disables caching)
+
+
+# config.web.batch
+class WebBatch(Mapping[str, Any]):
+    window: float  # * (seconds messages are merged for)
+    max_length: int  # * (characters per merged post)
+
+
+# config.http
+class Http(Mapping[str, Any]):
+    limit: int  # * (connections in total, 0 -> no limit)
+    limit_per_host: int  # * (0 -> no limit)
+    keepalive: float  # * (seconds idle connections are kept)
+    dns_ttl: int | None  # * (seconds, null caches forever)
+    timeout: float  # * (seconds per request)
+    connect_timeout: float  # * (seconds)
+
+
+# config.events
+class Events(Mapping[str, Any]):
+    dispatch_mode: DispatchMode
+    queue: EventsQueue  # *
+    coalesce: Mapping[str, float]  # *
+
+
+# config.events.queue
+class EventsQueue(Mapping[str, Any]):
+    workers: int
+    size: int
+    overflow: OverflowPolicy
+
+
+# config.executors
+class Executors(Mapping[str, int]):
+    threads: int  # *
+    processes: int  # *
+
+
+# config.state
+class State(Mapping[str, Any]):
+    messages: StateMessages  # *
+    dedup: StateDedup  # *
+    snapshot: StateSnapshot  # *
+    warm_up: StateWarmUp  # *
+    search: StateSearch  # *
+
+
+# config.state.messages
+class StateMessages(Mapping[str, Any]):
+    backend: MessageBackend  # *
+    max_size: int  # *
+    max_per_channel: int  # *
+    ttl: float  # * (seconds)
+
+
+# config.state.dedup
+class StateDedup(Mapping[str, Any]):
+    window: float  # (seconds, 0 disables deduplication)
+    max_size: int  # *
+
+
+# config.state.snapshot
+class StateSnapshot(Mapping[str, Any]):
+    path: str | None  # (SQLite file, unset disables snapshots)
+    interval: float  # * (seconds between writes)
+    warm: int  # * (messages loaded into the cache on start)
+    max_age: float  # * (seconds, older messages are pruned on close)
+
+
+# config.state.warm_up
+class StateWarmUp(Mapping[str, Any]):
+    users: bool  # *
+    channels: bool  # *
+    page_size: int  # *
+    types: str  # * (conversations.list types, comma separated)
+
+
+# config.state.search
+class StateSearch(Mapping[str, Any]):
+    enabled: bool  # *
 
 
 # config.ipc
@@ -38,6 +168,11 @@ class Ipc(Mapping[str, Any]):
     port: int
 
 
+# config.recording
+class Recording(Mapping[str, Any]):
+    path: str | None
+
+
 # config.logging
 class Logging(Mapping[str, Any]):
     enabled: bool
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import (
     Any,
     Callable,
+    Literal,
     Protocol,
     TypeVar,
     TYPE_CHECKING,
@@ -22,6 +23,10 @@ __all__ = (
     'ModuleT',
     'BaseExcT',
     'DispatchFunc',
+    'DispatchMode',
+    'OverflowPolicy',
+    'OffloadKind',
+    'MessageBackend',
     'EventCallback',
 )
 
@@ -39,4 +44,8 @@ class DispatchFunc(Protocol):
         ...
 
 
+DispatchMode = Literal['task', 'batch', 'queue', 'sharded']
+OverflowPolicy = Literal['block', 'drop_oldest', 'drop_newest']
+OffloadKind = Literal['thread', 'process']
+MessageBackend = Literal['lru', 'compact']
 EventCallback = Callable[['EventT'], Any]
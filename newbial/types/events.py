@@ -12,6 +12,14 @@ __all__ = (
     'MessageEventPayload',
     'MessageChangedEventData',
     'MessageChangedEventPayload',
+    'MessageDeletedEventData',
+    'MessageDeletedEventPayload',
+    'UserData',
+    'ChannelData',
+    'UserChangeEventData',
+    'UserChangeEventPayload',
+    'ChannelRenameEventData',
+    'ChannelRenameEventPayload',
 )
 
 EventT = TypeVar('EventT', bound='Event')
@@ -48,10 +56,39 @@ class _MessageEditedField(TypedDict):
 
 class _ChangedMessage(TypedDict):
     type: Literal['message']
-    user: str
+    user: NotRequired[str]
     text: str
     ts: str
     edited: _MessageEditedField
+    thread_ts: NotRequired[str]
+
+
+class _UserProfileField(TypedDict):
+    real_name: NotRequired[str]
+    display_name: NotRequired[str]
+
+
+## Objects
+# https://api.slack.com/types/user
+
+
+class UserData(TypedDict):
+    id: str
+    team_id: NotRequired[str]
+    name: str
+    real_name: NotRequired[str]
+    profile: NotRequired[_UserProfileField]
+    is_bot: NotRequired[bool]
+    deleted: NotRequired[bool]
+
+
+# https://api.slack.com/types/conversation
+class ChannelData(TypedDict):
+    id: str
+    name: NotRequired[str]
+    is_private: NotRequired[bool]
+    is_archived: NotRequired[bool]
+    is_im: NotRequired[bool]
 
 
 ## Abstract event types
@@ -59,6 +96,7 @@ class _ChangedMessage(TypedDict):
 
 class Event(Protocol):
     __event_name__: ClassVar[str]
+    __event_priority__: ClassVar[int]
 
 
 class SlackEvent(Event, Protocol):
@@ -85,12 +123,14 @@ class MessageEventData(_BaseEventData):
     type: Literal['message']
     subtype: NotRequired[str]
     channel: str
-    user: str
+    # Missing from bot messages
+    user: NotRequired[str]
     text: str
     ts: str
     edited: NotRequired[_MessageEditedField]
     bot_id: NotRequired[str]
     hidden: NotRequired[bool]
+    thread_ts: NotRequired[str]
 
 
 class MessageEventPayload(_BaseEventPayload):
@@ -112,3 +152,53 @@ class MessageChangedEventData(_BaseEventData):
 
 class MessageChangedEventPayload(_BaseEventPayload):
     event: MessageChangedEventData
+
+
+## Message deleted event
+# https://api.slack.com/events/message/message_deleted
+
+
+class MessageDeletedEventData(_BaseEventData):
+    type: Literal['message']
+    subtype: Literal['message_deleted']
+    hidden: NotRequired[bool]
+    channel: str
+    ts: str
+    deleted_ts: str
+    previous_message: NotRequired[_ChangedMessage]
+
+
+class MessageDeletedEventPayload(_BaseEventPayload):
+    event: MessageDeletedEventData
+
+
+## User change event
+# https://api.slack.com/events/user_change
+# (team_join has the same shape)
+
+
+class UserChangeEventData(_BaseEventData):
+    type: Literal['user_change', 'team_join']
+    user: UserData
+
+
+class UserChangeEventPayload(_BaseEventPayload):
+    event: UserChangeEventData
+
+
+## Channel rename event
+# https://api.slack.com/events/channel_rename
+# (channel_created and group_rename have the same shape)
+
+
+class _RenamedChannel(ChannelData):
+    created: int
+
+
+class ChannelRenameEventData(_BaseEventData):
+    type: Literal['channel_rename', 'channel_created', 'group_rename']
+    channel: _RenamedChannel
+
+
+class ChannelRenameEventPayload(_BaseEventPayload):
+    event: ChannelRenameEventData
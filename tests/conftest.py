@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Any
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> bool | None:
+    # Runs `async def` tests in a fresh event loop
+    func = pyfuncitem.obj
+    if not inspect.iscoroutinefunction(func):
+        return None
+
+    args: dict[str, Any] = {
+        name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames
+    }
+    asyncio.run(func(**args))
+
+    return True
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from newbial.core.utils import SingleFlight, TTLCache
+from tests.utils import drain
+
+
+async def test_single_flight_shares_calls() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        n = calls
+        await release.wait()
+        return n
+
+    tasks = [asyncio.create_task(flight.run('U1', fetch)) for _ in range(3)]
+    other = asyncio.create_task(flight.run('U2', fetch))
+    await drain()
+    assert 'U1' in flight and 'U2' in flight
+
+    release.set()
+    assert await asyncio.gather(*tasks) == [1, 1, 1]
+    assert await other == 2
+    assert flight.shared == 2
+    # Finished calls are forgotten
+    assert 'U1' not in flight
+    assert await flight.run('U1', fetch) == 3
+
+
+async def test_single_flight_errors_and_cancellation() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail() -> int:
+        await release.wait()
+        raise LookupError('user_not_found')
+
+    first = asyncio.create_task(flight.run('U1', fail))
+    second = asyncio.create_task(flight.run('U1', fail))
+    await drain()
+
+    # Cancelling a waiter leaves the shared call running for the others
+    first.cancel()
+    await drain()
+    assert 'U1' in flight
+
+    release.set()
+    with pytest.raises(LookupError):
+        await second
+    assert 'U1' not in flight
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires() -> None:
+    clock = Clock()
+    cache: TTLCache[str] = TTLCache(clock=clock)
+    cache.set('users.info:U1', 'one', 10)
+
+    clock.now = 9.9
+    assert cache.get('users.info:U1') == 'one'
+    clock.now = 10
+    assert cache.get('users.info:U1') is None
+    assert len(cache) == 0
+    assert cache.stats() == {'size': 0, 'hits': 1, 'misses': 1, 'invalidations': 0}
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[int] = TTLCache(2, clock=Clock())
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3, 60)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+
+def test_ttl_cache_invalidates_by_tag() -> None:
+    cache: TTLCache[str] = TTLCache(clock=Clock())
+    cache.set('users.info:U1', 'one', 60, tags=('user:U1',))
+    cache.set('conversations.members:C1', 'U1 U2', 60, tags=('user:U1', 'channel:C1'))
+    cache.set('users.info:U2', 'two', 60, tags=('user:U2',))
+
+    assert cache.invalidate('user:U1') == 2
+    assert cache.invalidate('user:U1') == 0
+    assert cache.get('users.info:U1') is None
+    assert cache.get('users.info:U2') == 'two'
+    # Tags of dropped entries are forgotten
+    assert cache.invalidate('channel:C1') == 0
+
+    # Setting a key again replaces its tags
+    cache.set('users.info:U2', 'two', 60)
+    assert cache.invalidate('user:U2') == 0
+    assert cache.get('users.info:U2') == 'two'
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from newbial.core.managers.event_manager import _CallbackIndex
+
+
+def event(**attrs: Any) -> Any:
+    attrs = {
+        'channel_id': 'C1',
+        'user_id': 'U1',
+        'subtype': None,
+        'is_bot': False,
+    } | attrs
+    return SimpleNamespace(**attrs)
+
+
+def callback(name: str) -> Any:
+    def func(event: Any) -> str:
+        return name
+
+    func.__name__ = name
+    return func
+
+
+def names(callbacks: list[Any]) -> list[str]:
+    return [c.__name__ for c in callbacks]
+
+
+def test_unfiltered_callbacks_in_order() -> None:
+    index = _CallbackIndex()
+    for name in 'abc':
+        f = callback(name)
+        index.add(f, f)
+
+    assert names(index.match(event())) == ['a', 'b', 'c']
+    assert len(index) == 3
+
+
+def test_filters() -> None:
+    index = _CallbackIndex()
+    filters: dict[str, dict[str, Any]] = {
+        'channel': {'channel': 'C1'},
+        'other_channel': {'channel': 'C2'},
+        'user': {'user': 'U1'},
+        'subtype': {'subtype': 'message_changed'},
+        'no_subtype': {'subtype': None},
+        'humans': {'bots': False},
+        'channel_bots': {'channel': 'C1', 'bots': True},
+        'all': {},
+    }
+    for name, kwargs in filters.items():
+        f = callback(name)
+        index.add(f, f, **kwargs)
+
+    assert names(index.match(event())) == [
+        'channel',
+        'user',
+        'no_subtype',
+        'humans',
+        'all',
+    ]
+    assert names(index.match(event(channel_id='C2', is_bot=True))) == [
+        'other_channel',
+        'user',
+        'no_subtype',
+        'all',
+    ]
+    assert names(index.match(event(user_id='U2', subtype='message_changed'))) == [
+        'channel',
+        'subtype',
+        'humans',
+        'all',
+    ]
+
+
+def test_events_without_filtered_attributes() -> None:
+    index = _CallbackIndex()
+    f, g = callback('f'), callback('g')
+    index.add(f, f, channel='C1')
+    index.add(g, g)
+
+    assert names(index.match(SimpleNamespace())) == ['g']
+
+
+def test_remove() -> None:
+    index = _CallbackIndex()
+    f, g, h = callback('f'), callback('g'), callback('h')
+    index.add(f, f, channel='C1')
+    index.add(g, g)
+    index.add(h, h, user='U1')
+
+    assert index.remove(f) is not None
+    assert index.remove(f) is None
+    assert 'C1' not in index.by_channel
+    assert names(index.match(event())) == ['g', 'h']
+
+    index.remove(h)
+    assert index.filtered == 0
+    assert names(index.match(event())) == ['g']
+
+
+def test_invoke_is_called() -> None:
+    index = _CallbackIndex()
+    f, wrapper = callback('f'), callback('wrapper')
+    listener = index.add(f, wrapper, channel='C1')
+
+    assert listener.callback is f
+    assert index.match(event()) == [wrapper]
+    # Removed by the registered callback, not the wrapper
+    assert index.remove(wrapper) is None
+    assert index.remove(f) is listener
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from newbial.core.managers import EventManager
+from newbial.slack.events import MessageChangedEvent
+from newbial.slack.structures import Message
+from tests.utils import drain
+
+
+def message(ts: str, text: str, channel_id: str = 'C1') -> Message:
+    return Message._from_fields(None, ts, text, 'U1', channel_id)  # type: ignore
+
+
+def changed(
+    event_ts: str, old: str, new: str, ts: str = '1.0', channel_id: str = 'C1'
+) -> MessageChangedEvent:
+    payload: Any = {'event': {'type': 'message', 'event_ts': event_ts}}
+    return MessageChangedEvent(
+        payload, message(ts, old, channel_id), message(ts, new, channel_id)
+    )
+
+
+def manager(window: float) -> tuple[EventManager, list[MessageChangedEvent]]:
+    events = EventManager()
+    events.set_coalesce_window(MessageChangedEvent, window)
+    received: list[MessageChangedEvent] = []
+    events.add_callback(MessageChangedEvent, received.append)
+
+    return events, received
+
+
+async def test_merge_keeps_first_old_message_and_last_message() -> None:
+    events, received = manager(0.01)
+    events.dispatch(changed('2.0', 'a', 'b'))
+    events.dispatch(changed('3.0', 'b', 'c'))
+    events.dispatch(changed('4.0', 'c', 'd'))
+
+    await asyncio.sleep(0.02)
+    await drain()
+
+    assert len(received) == 1
+    event = received[0]
+    assert event.old_message is not None and event.old_message.text == 'a'
+    assert event.message.text == 'd'
+    assert event.ts == '4.0'
+    assert events.stats()['coalesced'] == 2
+
+
+async def test_keys_are_merged_separately_in_order() -> None:
+    events, received = manager(0.01)
+    events.dispatch(changed('2.0', 'a', 'b', ts='1.0'))
+    events.dispatch(changed('3.0', 'x', 'y', ts='1.5'))
+    events.dispatch(changed('4.0', 'a', 'b', ts='1.0', channel_id='C2'))
+    events.dispatch(changed('5.0', 'b', 'c', ts='1.0'))
+
+    await asyncio.sleep(0.02)
+    await drain()
+
+    # Dispatched in the order their first event arrived
+    assert [(e.channel_id, e.message.ts, e.message.text) for e in received] == [
+        ('C1', '1.0', 'c'),
+        ('C1', '1.5', 'y'),
+        ('C2', '1.0', 'b'),
+    ]
+
+
+async def test_close_flushes_pending_events() -> None:
+    events, received = manager(60)
+    events.dispatch(changed('2.0', 'a', 'b'))
+    events.dispatch(changed('3.0', 'b', 'c'))
+    await drain()
+    assert not received
+
+    await events.close()
+    await drain()
+
+    assert [e.message.text for e in received] == ['c']
+    assert events.stats()['coalescing'] == 0
+
+
+async def test_disabled_by_default() -> None:
+    events = EventManager()
+    received: list[MessageChangedEvent] = []
+    events.add_callback(MessageChangedEvent, received.append)
+
+    events.dispatch(changed('2.0', 'a', 'b'))
+    events.dispatch(changed('3.0', 'b', 'c'))
+    await drain()
+
+    assert [e.message.text for e in received] == ['b', 'c']
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from newbial.core.utils import CompactMessageCache, MessageCache
+from newbial.slack.structures import Message
+
+
+def message(
+    channel_id: str, n: int, text: str | None = None, user_id: str | None = None
+) -> Message:
+    return Message._from_fields(
+        None,  # type: ignore
+        f'1655000000.{n:06d}',
+        text if text is not None else f'text {n}',
+        user_id or f'U{n % 7}',
+        channel_id,
+        'B1' if n % 5 == 0 else None,
+        False,
+        f'1655000000.{n - n % 10:06d}' if n % 3 == 0 else None,
+    )
+
+
+def fields(message: Message | None) -> Any:
+    if message is None:
+        return None
+    return tuple(
+        getattr(message, name)
+        for name in (
+            'channel_id',
+            'ts',
+            'text',
+            'user_id',
+            'bot_id',
+            'hidden',
+            'thread_ts',
+        )
+    )
+
+
+def caches(**kwargs: Any) -> tuple[MessageCache, CompactMessageCache]:
+    return MessageCache(**kwargs), CompactMessageCache(None, **kwargs)  # type: ignore
+
+
+def assert_same(reference: MessageCache, compact: CompactMessageCache) -> None:
+    assert len(compact) == len(reference)
+    assert sorted(map(fields, compact)) == sorted(map(fields, reference))
+    for m in reference:
+        assert fields(compact.get(m.channel_id, m.ts)) == fields(m)
+
+
+def test_insert() -> None:
+    reference, compact = caches()
+    numbers = list(range(200))
+    random.Random(0).shuffle(numbers)
+    for n in numbers:
+        for cache in (reference, compact):
+            cache.add(message(f'C{n % 4}', n))
+
+    assert_same(reference, compact)
+    assert compact.get('C0', '1655000000.000001') is None
+    assert compact.get('C9', '1655000000.000000') is None
+
+
+def test_edit() -> None:
+    reference, compact = caches()
+    for n in range(50):
+        for cache in (reference, compact):
+            cache.add(message('C1', n))
+    for n in range(0, 50, 3):
+        for cache in (reference, compact):
+            cache.add(message('C1', n, text=f'edited {n}', user_id='U99'))
+
+    assert_same(reference, compact)
+
+
+def test_delete() -> None:
+    reference, compact = caches()
+    for n in range(100):
+        for cache in (reference, compact):
+            cache.add(message(f'C{n % 2}', n))
+    for n in range(1, 100, 4):
+        removed = [
+            fields(cache.remove(f'C{n % 2}', message('C', n).ts))
+            for cache in (reference, compact)
+        ]
+        assert removed[0] == removed[1] is not None
+
+    assert_same(reference, compact)
+    assert compact.remove('C1', message('C', 1).ts) is None
+
+
+def test_eviction() -> None:
+    # Inserted oldest first and never read, so least recently used is oldest
+    reference, compact = caches(max_size=60, max_per_channel=25)
+    evicted: tuple[list[Any], list[Any]] = ([], [])
+    for cache, sink in zip((reference, compact), evicted):
+        cache.evict_listeners.append(lambda m, sink=sink: sink.append(fields(m)))
+
+    for n in range(300):
+        channel_id = 'C0' if n % 5 else f'C{n % 3 + 1}'
+        for cache in (reference, compact):
+            cache.add(message(channel_id, n))
+
+    assert_same(reference, compact)
+    assert sorted(evicted[0]) == sorted(evicted[1])
+    assert compact.evictions == reference.evictions
+
+
+def test_removed_rows_are_compacted() -> None:
+    compact = CompactMessageCache(None)  # type: ignore
+    for n in range(100):
+        compact.add(message('C1', n))
+    # Tombstones in the middle of the channel, not only at the front
+    for n in range(10, 90):
+        compact.remove('C1', message('C1', n).ts)
+
+    columns = compact._channels['C1']
+    assert len(columns.ts) < 100
+    assert len(columns.ts) - columns.live < len(columns.ts) / 2
+    assert [m.ts for m in compact.channel('C1')] == [
+        message('C1', n).ts for n in (*range(10), *range(90, 100))
+    ]
+    compact.add(message('C1', 50))
+    assert fields(compact.get('C1', message('C1', 50).ts)) == fields(message('C1', 50))
+
+
+def test_unreferenced_ids_are_dropped() -> None:
+    compact = CompactMessageCache(None)  # type: ignore
+    compact.add(message('C1', 1, user_id='U1'))
+    compact.add(message('C1', 2, user_id='U2'))
+    compact.add(message('C1', 3, user_id='U2'))
+    assert compact.stats()['interned'] == 2
+
+    compact.remove('C1', message('C1', 1).ts)
+    assert compact.stats()['interned'] == 1
+    # Editing away the last reference drops it as well
+    compact.add(message('C1', 2, user_id='U3'))
+    compact.add(message('C1', 3, user_id='U3'))
+    assert compact.stats()['interned'] == 1
+
+    # Freed IDs are reused
+    compact.add(message('C1', 4, user_id='U4'))
+    assert len(compact._strings) == 2
+    assert compact.get('C1', message('C1', 4).ts).user_id == 'U4'  # type: ignore
+    assert compact.get('C1', message('C1', 3).ts).user_id == 'U3'  # type: ignore
+
+
+def test_expiry_after_per_channel_eviction() -> None:
+    now = 999950.0
+    compact = CompactMessageCache(
+        None, max_per_channel=2, ttl=100, clock=lambda: now  # type: ignore
+    )
+
+    def add(channel_id: str, ts: str) -> None:
+        compact.add(Message._from_fields(None, ts, 'hi', 'U1', channel_id))  # type: ignore
+
+    for ts in ('999900.000000', '999960.000000', '999970.000000'):
+        add('C1', ts)
+    # The oldest message was evicted by max_per_channel, not expired
+    assert compact.evictions == 1
+
+    # Adding expires messages older than the cutoff (999955), nothing in C1 is
+    now = 1000055.0
+    add('C2', '1000050.000000')
+    assert [m.ts for m in compact.channel('C1')] == ['999960.000000', '999970.000000']
+    assert compact.expirations == 0
+
+    now = 1000065.0
+    assert compact.get('C1', '999960.000000') is None
+    assert compact.expirations == 1
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from newbial.core.utils.config import _recursive_dict_update
+
+
+def test_local_config_overrides_nested_keys() -> None:
+    config = {'socket': {'connections': 1, 'stagger': 5}, 'ipc': {'port': 1}}
+    _recursive_dict_update(config, {'socket': {'connections': 3}})
+
+    assert config == {'socket': {'connections': 3, 'stagger': 5}, 'ipc': {'port': 1}}
+
+
+def test_unset_env_keys_can_be_overridden() -> None:
+    # "!ENV" keys resolve to None when the variable is unset
+    config = {'slack': {'base_url': None}, 'recording': {'path': 'events.jsonl'}}
+    _recursive_dict_update(
+        config,
+        {'slack': {'base_url': 'http://localhost/api/'}, 'recording': {'path': None}},
+    )
+
+    assert config == {
+        'slack': {'base_url': 'http://localhost/api/'},
+        'recording': {'path': None},
+    }
+
+
+def test_mismatched_types_are_rejected() -> None:
+    with pytest.raises(AssertionError):
+        _recursive_dict_update({'ipc': {'port': 1}}, {'ipc': {'port': 'one'}})
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from newbial.core.managers import EventManager
+from tests.utils import SampleEvent, drain
+
+
+async def test_batch_mode_runs_callbacks_in_order() -> None:
+    events = EventManager(mode='batch')
+    calls: list[Any] = []
+
+    def sync_callback(event: SampleEvent) -> None:
+        calls.append(('sync', event.n))
+
+    async def async_callback(event: SampleEvent) -> None:
+        calls.append(('async', event.n))
+
+    events.add_callback(SampleEvent, sync_callback)
+    events.add_callback(SampleEvent, async_callback)
+    events.dispatch(SampleEvent(1))
+
+    # Sync callbacks are called inline
+    assert calls == [('sync', 1)]
+    await drain()
+    assert calls == [('sync', 1), ('async', 1)]
+
+
+async def test_batch_mode_contains_errors() -> None:
+    events = EventManager(mode='batch')
+    calls: list[int] = []
+
+    def failing(event: SampleEvent) -> None:
+        raise RuntimeError('boom')
+
+    events.add_callback(SampleEvent, failing)
+    events.add_callback(SampleEvent, lambda event: calls.append(event.n))
+    events.dispatch(SampleEvent(1))
+    await drain()
+
+    assert calls == [1]
+
+
+async def test_wait_for() -> None:
+    events = EventManager()
+    waiter = asyncio.create_task(
+        events.wait_for(SampleEvent, lambda e: e.n > 1, channel='C2', timeout=1)
+    )
+    await drain()
+
+    events.dispatch(SampleEvent(2, 'C1'))
+    events.dispatch(SampleEvent(1, 'C2'))
+    events.dispatch(SampleEvent(3, 'C2'))
+    events.dispatch(SampleEvent(4, 'C2'))
+
+    assert (await waiter).n == 3
+    # Waiters are removed once resolved
+    assert not events.has_subscribers(SampleEvent)
+
+
+async def test_wait_for_timeout() -> None:
+    events = EventManager()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await events.wait_for(SampleEvent, timeout=0.01)
+    assert not events.has_subscribers(SampleEvent)
+
+
+async def test_wait_for_unsupported_filter() -> None:
+    events = EventManager()
+
+    # SampleEvent has no user_id
+    with pytest.raises(TypeError):
+        await events.wait_for(SampleEvent, user='U1')
+
+
+async def test_stream() -> None:
+    events = EventManager()
+
+    async with events.stream(SampleEvent, channel='C1', timeout=1) as stream:
+        # Events are collected from the start, before iterating
+        for n in range(3):
+            events.dispatch(SampleEvent(n, 'C1'))
+        events.dispatch(SampleEvent(10, 'C2'))
+
+        received = []
+        async for event in stream:
+            received.append(event.n)
+            if len(received) == 3:
+                stream.close()
+
+    assert received == [0, 1, 2]
+    assert stream.closed
+    assert not events.has_subscribers(SampleEvent)
+
+
+async def test_stream_drops_oldest_and_times_out() -> None:
+    events = EventManager()
+    stream = events.stream(SampleEvent, timeout=0.01, maxsize=2)
+    for n in range(4):
+        events.dispatch(SampleEvent(n))
+
+    assert [event.n async for event in stream] == [2, 3]
+    assert stream.dropped == 2
+    assert stream.closed
+
+
+@pytest.mark.parametrize('mode', ['task', 'batch', 'sharded'])
+async def test_close_cancels_dispatch_tasks(mode: str) -> None:
+    events = EventManager(mode=mode)  # type: ignore
+    cancelled: list[int] = []
+
+    async def callback(event: SampleEvent) -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(event.n)
+            raise
+
+    events.add_callback(SampleEvent, callback)
+    events.dispatch(SampleEvent(1, 'C1'))
+    events.dispatch(SampleEvent(2, 'C2'))
+    await drain()
+
+    await events.close()
+
+    assert sorted(cancelled) == [1, 2]
+    assert not events.stats().get('shards')
+
+
+async def test_queue_never_drops_high_priority_events() -> None:
+    events = EventManager(mode='queue', workers=1, queue_size=2, overflow='block')
+    calls: list[int] = []
+
+    events.add_callback(SampleEvent, lambda event: calls.append(event.n))
+    # SampleEvent is a core event, which has a high priority
+    for n in range(5):
+        events.dispatch(SampleEvent(n))
+
+    assert events.queue is not None
+    assert events.queue.depth() == [5, 0]
+    assert events.queue.overflowed == [0, 0]
+    await drain()
+
+    assert calls == [0, 1, 2, 3, 4]
+    await events.close()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from newbial.core.utils import EventQueue
+from tests.utils import drain
+
+
+async def test_lanes_are_served_by_priority() -> None:
+    queue: EventQueue[str] = EventQueue(2, 10)
+    queue.put_nowait('low 1', 1)
+    queue.put_nowait('high 1', 0)
+    queue.put_nowait('low 2', 1)
+    queue.put_nowait('high 2', 0)
+
+    assert [await queue.get() for _ in range(4)] == ['high 1', 'high 2', 'low 1', 'low 2']
+
+
+async def test_drop_newest() -> None:
+    queue: EventQueue[int] = EventQueue(1, 2, 'drop_newest')
+
+    assert [queue.put_nowait(i, 0) for i in range(3)] == [True, True, False]
+    assert queue.dropped == [1]
+    assert [await queue.get(), await queue.get()] == [0, 1]
+
+
+async def test_drop_oldest() -> None:
+    queue: EventQueue[int] = EventQueue(1, 2, 'drop_oldest')
+
+    assert [queue.put_nowait(i, 0) for i in range(3)] == [True, True, True]
+    assert queue.dropped == [1]
+    assert len(queue) == 2
+    assert [await queue.get(), await queue.get()] == [1, 2]
+
+
+async def test_block_refuses_put_nowait_when_full() -> None:
+    queue: EventQueue[int] = EventQueue(1, 2, 'block')
+
+    assert [queue.put_nowait(i, 0) for i in range(3)] == [True, True, False]
+    assert queue.overflowed == [1]
+    assert len(queue) == 2
+
+
+async def test_block_put_waits_for_room() -> None:
+    queue: EventQueue[int] = EventQueue(2, 1, 'block')
+    queue.put_nowait(0, 0)
+
+    put = asyncio.create_task(queue.put(1, 0))
+    await drain()
+    assert not put.done()
+
+    # Other lanes are bounded separately
+    assert queue.put_nowait(2, 1)
+
+    assert await queue.get() == 0
+    assert await put
+    assert queue.depth() == [1, 1]
+
+
+async def test_join_waits_for_task_done() -> None:
+    queue: EventQueue[int] = EventQueue(1, 10)
+    queue.put_nowait(0, 0)
+    queue.put_nowait(1, 0)
+
+    join = asyncio.create_task(queue.join())
+    await queue.get()
+    queue.task_done()
+    await drain()
+    assert not join.done()
+
+    await queue.get()
+    queue.task_done()
+    await asyncio.wait_for(join, 1)
+
+
+def test_invalid_policy() -> None:
+    with pytest.raises(ValueError):
+        EventQueue(1, 1, 'wait')  # type: ignore
+
+
+async def test_force_ignores_the_bound() -> None:
+    queue: EventQueue[int] = EventQueue(1, 1, 'block')
+    queue.put_nowait(0, 0)
+
+    assert not queue.put_nowait(1, 0)
+    assert queue.put_nowait(2, 0, force=True)
+    assert queue.overflowed == [1]
+    assert [await queue.get(), await queue.get()] == [0, 2]
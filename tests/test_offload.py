@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import pytest
+
+from newbial.core.managers import EventManager
+from newbial.core.utils import offload
+from tests.utils import SampleEvent, drain
+
+
+def analyse(data: dict[str, Any]) -> None:
+    pass
+
+
+class Handler:
+    def on_event(self, event: SampleEvent) -> None:
+        pass
+
+
+async def test_thread_offload() -> None:
+    events = EventManager()
+    threads: list[str] = []
+
+    @offload('thread')
+    def callback(event: SampleEvent) -> None:
+        threads.append(threading.current_thread().name)
+
+    events.add_callback(SampleEvent, callback)
+    events.dispatch(SampleEvent(1))
+    while not threads:
+        await drain()
+
+    assert threads[0] != threading.current_thread().name
+
+    # The pools started for a manager without a bot are its own
+    executors = events._owned_executors
+    assert executors is not None and executors._pools
+    await events.close()
+    assert not executors._pools
+
+
+async def test_process_offload_rejects_unpicklable_callbacks() -> None:
+    events = EventManager()
+
+    with pytest.raises(TypeError, match='method'):
+        events.add_callback(SampleEvent, Handler().on_event, offload='process')
+    with pytest.raises(TypeError, match='pickled'):
+        events.add_callback(SampleEvent, lambda event: None, offload='process')
+    assert not events.has_subscribers(SampleEvent)
+
+    events.add_callback(SampleEvent, analyse, offload='process')
+    assert events.has_subscribers(SampleEvent)
+    # Nothing was started yet
+    assert events._owned_executors is not None
+    assert not events._owned_executors._pools
+
+
+async def test_offload_rejects_coroutine_functions() -> None:
+    events = EventManager()
+
+    async def callback(event: SampleEvent) -> None:
+        pass
+
+    with pytest.raises(TypeError, match='coroutine'):
+        offload('thread')(callback)
+    with pytest.raises(TypeError, match='coroutine'):
+        events.add_callback(SampleEvent, callback, offload='thread')
+    assert not events.has_subscribers(SampleEvent)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from newbial.slack.clients.outbound import OutboundQueue
+from tests.utils import drain
+
+
+class FakeClient:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.posts: list[dict[str, Any]] = []
+
+    async def chat_postMessage(self, **kwargs: Any) -> Any:
+        if self.fail:
+            raise RuntimeError('channel_not_found')
+        self.posts.append(kwargs)
+        return {'ok': True, 'ts': str(len(self.posts))}
+
+
+async def test_messages_are_merged_per_channel_and_thread() -> None:
+    client = FakeClient()
+    queue = OutboundQueue(client, window=0.01)  # type: ignore
+
+    futures = [
+        queue.add('C1', 'one'),
+        queue.add('C2', 'other channel'),
+        queue.add('C1', 'two'),
+        queue.add('C1', 'in thread', thread_ts='1.0'),
+    ]
+    await drain()
+    assert not client.posts
+
+    responses = await asyncio.wait_for(asyncio.gather(*futures), 1)
+
+    assert sorted(
+        (post['channel'], post['thread_ts'] or '', post['text']) for post in client.posts
+    ) == [
+        ('C1', '', 'one\ntwo'),
+        ('C1', '1.0', 'in thread'),
+        ('C2', '', 'other channel'),
+    ]
+    # Merged messages resolve with the response of their shared post
+    assert responses[0] is responses[2]
+    assert queue.stats() == {'pending': 0, 'posts': 3, 'merged': 1}
+
+
+async def test_max_length_starts_a_new_post() -> None:
+    client = FakeClient()
+    queue = OutboundQueue(client, window=60, max_length=10)  # type: ignore
+
+    first = queue.add('C1', 'abcd')
+    second = queue.add('C1', 'efgh')
+    # Does not fit in 10 characters with the other two
+    third = queue.add('C1', 'ijk')
+    await asyncio.wait_for(asyncio.gather(first, second), 1)
+    assert [post['text'] for post in client.posts] == ['abcd\nefgh']
+
+    # A full batch is posted right away
+    fourth = queue.add('C1', 'lmnopq')
+    await asyncio.wait_for(asyncio.gather(third, fourth), 1)
+    assert [post['text'] for post in client.posts] == ['abcd\nefgh', 'ijk\nlmnopq']
+
+
+async def test_flush_posts_pending_batches() -> None:
+    client = FakeClient()
+    queue = OutboundQueue(client, window=60)  # type: ignore
+    future = queue.add('C1', 'now')
+
+    await queue.flush()
+
+    assert future.done()
+    assert [post['text'] for post in client.posts] == ['now']
+
+
+async def test_errors_reach_every_merged_message() -> None:
+    queue = OutboundQueue(FakeClient(fail=True), window=60)  # type: ignore
+    futures = [queue.add('C1', 'one'), queue.add('C1', 'two')]
+
+    await queue.flush()
+
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            await future
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+
+from newbial.slack.clients.rate_limiter import (
+    RateLimiter,
+    RequestPriority,
+    _SWEEP_INTERVAL,
+    request_priority,
+)
+from tests.utils import drain
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wake(limiter: RateLimiter, method: str, channel: str | None = None) -> None:
+    # Runs the bucket's scheduled wake-up now, instead of in real time
+    bucket = limiter._buckets[(method, channel)]
+    assert bucket.handle is not None
+    bucket.handle.cancel()
+    limiter._wake(bucket)
+
+
+async def test_burst_then_wait() -> None:
+    clock = Clock()
+    limiter = RateLimiter(headroom=1.0, clock=clock)
+
+    # Tier 2, 20 per minute with a burst of 3 seconds' worth (one call)
+    await limiter.acquire('users.list')
+    waiting = asyncio.create_task(limiter.acquire('users.list'))
+    await drain()
+    assert not waiting.done()
+    assert limiter.stats()['waiting'] == 1
+
+    clock.now += 3.0
+    wake(limiter, 'users.list')
+    await asyncio.wait_for(waiting, 1)
+    assert limiter.waited == 1
+
+
+async def test_waiters_are_served_by_priority() -> None:
+    clock = Clock()
+    limiter = RateLimiter(headroom=1.0, clock=clock)
+    await limiter.acquire('users.list')
+    order: list[RequestPriority] = []
+
+    async def call(priority: RequestPriority) -> None:
+        with request_priority(priority):
+            await limiter.acquire('users.list')
+        order.append(priority)
+
+    tasks = [
+        asyncio.create_task(call(p))
+        for p in (RequestPriority.LOW, RequestPriority.NORMAL, RequestPriority.HIGH)
+    ]
+    await drain()
+
+    for _ in tasks:
+        clock.now += 3.0
+        wake(limiter, 'users.list')
+        await drain()
+
+    assert order == [RequestPriority.HIGH, RequestPriority.NORMAL, RequestPriority.LOW]
+
+
+async def test_post_message_is_limited_per_channel() -> None:
+    clock = Clock()
+    limiter = RateLimiter(headroom=1.0, clock=clock)
+
+    for _ in range(3):
+        await limiter.acquire('chat.postMessage', 'C1')
+    # Other channels have buckets of their own
+    await limiter.acquire('chat.postMessage', 'C2')
+
+    waiting = asyncio.create_task(limiter.acquire('chat.postMessage', 'C1'))
+    await drain()
+    assert not waiting.done()
+    waiting.cancel()
+    await drain()
+
+
+async def test_pause() -> None:
+    clock = Clock()
+    limiter = RateLimiter(clock=clock)
+    limiter.pause(5)
+    assert limiter.paused
+
+    waiting = asyncio.create_task(limiter.acquire('users.info'))
+    await drain()
+    assert not waiting.done()
+
+    clock.now += 5
+    assert not limiter.paused
+    wake(limiter, 'users.info')
+    await asyncio.wait_for(waiting, 1)
+
+
+async def test_idle_channel_buckets_are_dropped() -> None:
+    clock = Clock()
+    limiter = RateLimiter(headroom=1.0, clock=clock)
+
+    for channel in ('C1', 'C2', 'C3'):
+        await limiter.acquire('chat.postMessage', channel)
+    for _ in range(3):
+        await limiter.acquire('chat.postMessage', 'C4')
+    waiting = asyncio.create_task(limiter.acquire('chat.postMessage', 'C4'))
+    await drain()
+
+    clock.now += _SWEEP_INTERVAL
+    await limiter.acquire('chat.postMessage', 'C5')
+
+    # C1-C3 are full again, C4 still has a waiter
+    assert set(limiter._buckets) == {
+        ('chat.postMessage', None),
+        ('chat.postMessage', 'C4'),
+        ('chat.postMessage', 'C5'),
+    }
+
+    wake(limiter, 'chat.postMessage', 'C4')
+    await asyncio.wait_for(waiting, 1)
+
+
+async def test_unscheduled_methods() -> None:
+    limiter = RateLimiter(clock=Clock())
+    for _ in range(100):
+        await limiter.acquire('apps.connections.open')
+    assert not limiter._buckets
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from newbial.core.utils import MessageIndex, tokenize
+from newbial.slack.structures import Message
+
+
+def message(channel_id: str, n: int, text: str) -> Message:
+    return Message._from_fields(
+        None, f'1655000000.{n:06d}', text, 'U1', channel_id  # type: ignore
+    )
+
+
+def build(*texts: tuple[str, str]) -> MessageIndex:
+    index = MessageIndex()
+    for n, (channel_id, text) in enumerate(texts):
+        index.add(message(channel_id, n, text))
+    return index
+
+
+def ts(*numbers: int) -> list[str]:
+    return [f'1655000000.{n:06d}' for n in numbers]
+
+
+def test_tokenize() -> None:
+    assert tokenize("Deploy: the API's new build, v2!") == [
+        'deploy',
+        'the',
+        'api',
+        's',
+        'new',
+        'build',
+        'v2',
+    ]
+
+
+def test_words_prefixes_and_phrases() -> None:
+    index = build(
+        ('C1', 'Deploying the new build'),
+        ('C1', 'the build is broken'),
+        ('C2', 'new build deployed'),
+        ('C2', 'build new things'),
+    )
+
+    # Newest first
+    assert [key[1] for key in index.search('build')] == ts(3, 2, 1, 0)
+    assert [key[1] for key in index.search('BUILD new')] == ts(3, 2, 0)
+    assert [key[1] for key in index.search('deploy*')] == ts(2, 0)
+    assert [key[1] for key in index.search('"new build"')] == ts(2, 0)
+    assert [key[1] for key in index.search('"new build" deploy*')] == ts(2, 0)
+    assert index.search('build', channel_id='C1', limit=1) == [('C1', ts(1)[0])]
+    assert index.search('missing build') == []
+    assert index.search('') == []
+
+
+def test_edits_and_removals() -> None:
+    index = build(('C1', 'old text'), ('C1', 'other text'))
+
+    index.add(message('C1', 0, 'new words'))
+    assert index.search('old') == []
+    assert index.search('new') == [('C1', ts(0)[0])]
+    assert [key[1] for key in index.search('text')] == ts(1)
+
+    index.remove(message('C1', 1, ''))
+    index.remove(message('C1', 0, ''))
+    assert len(index) == 0
+    # Emptied tokens are dropped entirely
+    assert index.stats() == {'messages': 0, 'tokens': 0}
+    assert index.search('ne*') == []
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from slack_sdk.web.async_client import AsyncWebClient
+
+from newbial.core.managers import EventManager
+from newbial.slack.clients import SocketClient, SocketPool
+from tests.utils import SampleEvent, drain
+
+
+def make_bot(**socket_config: Any) -> Any:
+    return SimpleNamespace(
+        web=AsyncWebClient(token='xoxb-test'),
+        http=SimpleNamespace(session=None),
+        config=SimpleNamespace(
+            slack=SimpleNamespace(socket_token='xapp-test'),
+            socket=socket_config,
+        ),
+    )
+
+
+def make_client(**socket_config: Any) -> SocketClient:
+    return SocketClient(make_bot(**socket_config))
+
+
+async def test_flood_is_bounded() -> None:
+    client = make_client(max_in_flight=8)
+    events = EventManager(mode='queue', workers=1, queue_size=16, overflow='block')
+    gate = asyncio.Event()
+    handled: list[int] = []
+
+    async def callback(event: SampleEvent) -> None:
+        await gate.wait()
+        handled.append(event.n)
+
+    # Like StateManager's listener
+    async def listener(client: SocketClient, message: dict, raw: str | None) -> None:
+        await events.wait_for_capacity()
+        events.dispatch(SampleEvent(message['n']))
+
+    events.add_callback(SampleEvent, callback)
+    client.message_listeners.append(listener)
+
+    count = 500
+    received = 0
+
+    # Stands in for the receive loop
+    async def receive() -> None:
+        nonlocal received
+        for n in range(count):
+            await client.enqueue_message(json.dumps({'type': 'test', 'n': n}))
+            received += 1
+
+    tasks = len(asyncio.all_tasks())
+    receiver = asyncio.create_task(receive())
+    await drain(50)
+
+    # Reading stops once the queue is full and every slot is taken
+    assert received < 8 + 16 + 2
+    assert client.in_flight <= 8
+    assert client.message_queue.qsize() <= 8
+    assert len(events.queue or ()) <= 16
+    assert events.queue is not None and events.queue.overflowed == [0, 0]
+    assert len(asyncio.all_tasks()) <= tasks + 8 + 2
+
+    gate.set()
+    await asyncio.wait_for(receiver, 5)
+    while len(handled) < count:
+        await asyncio.sleep(0.01)
+
+    assert handled == list(range(count))
+    assert client.in_flight == 0
+
+    await events.close()
+    await client.close()
+
+
+async def test_close_releases_queued_frames() -> None:
+    client = make_client(max_in_flight=4)
+    gate = asyncio.Event()
+
+    async def listener(*args: Any) -> None:
+        await gate.wait()
+
+    client.message_listeners.append(listener)
+    for n in range(4):
+        await client.enqueue_message(json.dumps({'type': 'test', 'n': n}))
+    assert client.in_flight == 4
+
+    await client.close()
+    gate.set()
+    await drain()
+
+    assert client.in_flight == 0
+
+
+async def test_pool_forwards_frames_and_shares_slots() -> None:
+    pool = SocketPool(make_bot(connections=2, max_in_flight=3))
+    received: list[tuple[str, int]] = []
+    gate = asyncio.Event()
+
+    async def listener(client: SocketClient, message: dict, raw: str | None) -> None:
+        await gate.wait()
+        received.append((client.name, message['n']))
+
+    async def failing(*args: Any) -> None:
+        raise RuntimeError('boom')
+
+    pool.message_listeners.extend((failing, listener))
+    first, second = pool.clients
+    assert first._frame_slots is second._frame_slots is pool._frame_slots
+
+    await first.enqueue_message(json.dumps({'type': 'test', 'n': 1}))
+    await second.enqueue_message(json.dumps({'type': 'test', 'n': 2}))
+    # Duplicates are left to StateManager's dedup
+    await second.enqueue_message(json.dumps({'type': 'test', 'n': 2}))
+    blocked = asyncio.create_task(
+        first.enqueue_message(json.dumps({'type': 'test', 'n': 3}))
+    )
+    await drain()
+    assert not blocked.done()
+
+    gate.set()
+    await asyncio.wait_for(blocked, 1)
+    await drain()
+
+    assert sorted(received) == [
+        ('socket-0', 1),
+        ('socket-0', 3),
+        ('socket-1', 2),
+        ('socket-1', 2),
+    ]
+    await pool.close()
+
+
+async def test_malformed_frame_releases_slot() -> None:
+    client = make_client(max_in_flight=1)
+    received: list[int] = []
+
+    async def listener(client: SocketClient, message: dict, raw: str | None) -> None:
+        received.append(message['n'])
+
+    client.message_listeners.append(listener)
+
+    await client.enqueue_message('{"type": "test", "n": ')
+    await drain()
+    assert client.in_flight == 0
+
+    await asyncio.wait_for(
+        client.enqueue_message(json.dumps({'type': 'test', 'n': 1})), 1
+    )
+    await drain()
+
+    assert received == [1]
+    assert client.in_flight == 0
+    await client.close()
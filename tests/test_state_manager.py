@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from newbial.core.managers import EventManager, ExecutorManager, StateManager
+from newbial.slack.events import MessageChangedEvent, MessageEvent
+from newbial.slack.structures import Message
+from tests.utils import drain, make_config
+
+
+def make_state(web: Any = None, **state_config: Any) -> StateManager:
+    bot: Any = SimpleNamespace(
+        web=web or SimpleNamespace(),
+        sock=SimpleNamespace(message_listeners=[]),
+        events=EventManager(),
+        executors=ExecutorManager(threads=1),
+        config=make_config({'state': state_config}),
+    )
+    return StateManager(bot)
+
+
+def envelope(envelope_id: str, event_id: str, ts: str = '1655000000.000001') -> Any:
+    return {
+        'envelope_id': envelope_id,
+        'type': 'events_api',
+        'payload': {
+            'event_id': event_id,
+            'event': {
+                'type': 'message',
+                'channel': 'C1',
+                'user': 'U1',
+                'text': 'hi',
+                'ts': ts,
+                'event_ts': ts,
+            },
+        },
+    }
+
+
+async def test_redelivered_envelopes_are_dispatched_once() -> None:
+    state = make_state(dedup={'window': 60})
+    received: list[MessageEvent] = []
+    state._events.add_callback(MessageEvent, received.append)
+
+    # The same frame received twice around a reconnect
+    await state._message_callback(None, envelope('env-1', 'Ev1'), None)
+    await state._message_callback(None, envelope('env-1', 'Ev1'), None)
+    # Retried by Slack, in a new envelope
+    await state._message_callback(None, envelope('env-2', 'Ev1'), None)
+    await state._message_callback(
+        None, envelope('env-3', 'Ev2', ts='1655000000.000002'), None
+    )
+    await drain()
+
+    assert [event.message.ts for event in received] == [
+        '1655000000.000001',
+        '1655000000.000002',
+    ]
+
+
+async def test_dedup_can_be_disabled() -> None:
+    state = make_state(dedup={'window': 0})
+    received: list[MessageEvent] = []
+    state._events.add_callback(MessageEvent, received.append)
+
+    await state._message_callback(None, envelope('env-1', 'Ev1'), None)
+    await state._message_callback(None, envelope('env-1', 'Ev1'), None)
+    await drain()
+
+    assert len(received) == 2
+
+
+async def test_fetch_message_reads_the_snapshot(tmp_path: Any) -> None:
+    path = str(tmp_path / 'state.db')
+    state = make_state(snapshot={'path': path, 'warm': 0})
+    await state.load()
+    await state._message_callback(None, envelope('env-1', 'Ev1'), None)
+    await state.close()
+
+    state = make_state(snapshot={'path': path, 'warm': 0})
+    await state.load()
+    ts = '1655000000.000001'
+
+    # Not cached, and get_message() does not touch the snapshot
+    assert state.get_message('C1', ts) is None
+    message = await state.fetch_message('C1', ts)
+    assert isinstance(message, Message) and message.text == 'hi'
+    assert state.get_message('C1', ts) is message
+    assert await state.fetch_message('C1', '1655000000.000002') is None
+
+    await state.close()
+    await state._executors.close()
+
+
+async def test_edits_read_the_old_message_from_the_snapshot(tmp_path: Any) -> None:
+    path = str(tmp_path / 'state.db')
+    state = make_state(snapshot={'path': path, 'warm': 0})
+    await state.load()
+    await state._message_callback(None, envelope('env-1', 'Ev1'), None)
+    await state.close()
+
+    state = make_state(snapshot={'path': path, 'warm': 0})
+    await state.load()
+    received: list[MessageChangedEvent] = []
+    state._events.add_callback(MessageChangedEvent, received.append)
+
+    ts = '1655000000.000001'
+    edited = envelope('env-2', 'Ev2', ts='1655000000.000002')
+    edited['payload']['event'] = {
+        'type': 'message',
+        'subtype': 'message_changed',
+        'channel': 'C1',
+        'ts': '1655000000.000002',
+        'event_ts': '1655000000.000002',
+        'message': {
+            'type': 'message',
+            'user': 'U1',
+            'text': 'hello',
+            'ts': ts,
+            'edited': {'user': 'U1', 'ts': '1655000000.000002'},
+        },
+    }
+    await state._message_callback(None, edited, None)
+    await drain()
+
+    (event,) = received
+    assert event.old_message is not None and event.old_message.text == 'hi'
+    assert event.message.text == 'hello'
+    message = state.get_message('C1', ts)
+    assert message is not None and message.text == 'hello'
+
+    await state.close()
+    await state._executors.close()
+
+
+async def test_get_message_sees_unwritten_rows(tmp_path: Any) -> None:
+    state = make_state(snapshot={'path': str(tmp_path / 'state.db')})
+    await state.load()
+    await state._message_callback(None, envelope('env-1', 'Ev1'), None)
+    state._messages.clear()
+
+    message = state.get_message('C1', '1655000000.000001')
+    assert message is not None and message.text == 'hi'
+
+    await state.close()
+    await state._executors.close()
+
+
+class PagingWeb:
+    def __init__(self, **pages: Any) -> None:
+        self.pages = pages
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def paginate(self, method: str, **kwargs: Any) -> AsyncIterator[Any]:
+        self.calls.append((method, kwargs))
+        result = self.pages[method]
+        if isinstance(result, Exception):
+            raise result
+        for page in result:
+            yield page
+
+
+async def test_warm_up_logs_failures(caplog: Any) -> None:
+    user = {'id': 'U1', 'name': 'one', 'profile': {}}
+    web = PagingWeb(
+        **{
+            'users.list': [{'members': [user]}],
+            'conversations.list': RuntimeError('missing_scope'),
+        }
+    )
+    state = make_state(web)
+
+    state.start_warm_up()
+    task = state._warm_up_task
+    assert task is not None
+    await task
+
+    # One list failing does not stop the other, nor raise
+    assert 'U1' in state._users
+    assert 'Failed to warm up channels.' in caplog.text
+    # Only public channels by default, the others need more scopes
+    assert web.calls[1] == (
+        'conversations.list',
+        {'limit': 200, 'types': 'public_channel'},
+    )
+
+
+async def test_warm_up_can_be_turned_off() -> None:
+    web = PagingWeb()
+    state = make_state(web, warm_up={'users': False, 'channels': False})
+
+    await state.warm_up()
+    assert not web.calls
+
+
+async def test_bot_messages_have_no_user(tmp_path: Any) -> None:
+    path = str(tmp_path / 'state.db')
+    state = make_state(
+        messages={'backend': 'compact'}, snapshot={'path': path, 'warm': 0}
+    )
+    await state.load()
+    received: list[MessageEvent] = []
+    state._events.add_callback(MessageEvent, received.append)
+
+    payload = envelope('env-1', 'Ev1')
+    event = payload['payload']['event']
+    del event['user']
+    event.update(subtype='bot_message', bot_id='B1', username='deploys')
+    await state._message_callback(None, payload, None)
+    await drain()
+
+    (received_event,) = received
+    assert received_event.user_id is None and received_event.is_bot
+    assert received_event.message.user is None
+    cached = state.get_message('C1', '1655000000.000001')
+    assert cached is not None and cached.user_id is None and cached.bot_id == 'B1'
+
+    await state.close()
+
+    # Survives the snapshot
+    state = make_state(snapshot={'path': path, 'warm': 0})
+    await state.load()
+    message = await state.fetch_message('C1', '1655000000.000001')
+    assert message is not None and message.user_id is None
+
+    await state.close()
+    await state._executors.close()
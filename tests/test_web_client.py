@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from newbial.slack.clients import WebClient
+from tests.utils import drain, make_config
+
+
+def make_client(**web_config: Any) -> WebClient:
+    bot: Any = SimpleNamespace(
+        config=make_config({'slack': {'bot_token': 'xoxb-test'}, 'web': web_config}),
+    )
+    return WebClient(bot)
+
+
+class FakeApi:
+    """Stands in for `api_call()`, serving `pages` pages of users.list."""
+
+    def __init__(self, pages: int, fail_at: int | None = None) -> None:
+        self.pages = pages
+        self.fail_at = fail_at
+        self.calls: list[dict[str, Any]] = []
+
+    async def __call__(self, method: str, *, http_verb: str, params: Any) -> Any:
+        self.calls.append(params)
+        page = int(params.get('cursor', 0))
+        if page == self.fail_at:
+            raise RuntimeError('ratelimited')
+
+        cursor = str(page + 1) if page + 1 < self.pages else ''
+        return {'members': [page], 'response_metadata': {'next_cursor': cursor}}
+
+
+async def test_paginate_follows_cursors() -> None:
+    client = make_client(prefetch=2)
+    api = client.api_call = FakeApi(4)  # type: ignore
+
+    pages = [
+        page['members'][0]
+        async for page in client.paginate('users.list', limit=2, team_id=None)
+    ]
+
+    assert pages == [0, 1, 2, 3]
+    assert api.calls == [
+        {'limit': 2},
+        {'limit': 2, 'cursor': '1'},
+        {'limit': 2, 'cursor': '2'},
+        {'limit': 2, 'cursor': '3'},
+    ]
+
+
+async def test_paginate_prefetches_pages() -> None:
+    client = make_client(prefetch=1)
+    api = client.api_call = FakeApi(5)  # type: ignore
+
+    pages = client.paginate('users.list')
+    assert (await pages.__anext__())['members'] == [0]
+    await drain()
+    # One page is waiting in the queue and the next request is blocked on it
+    assert len(api.calls) == 3
+
+    await pages.__anext__()
+    await drain()
+    assert len(api.calls) == 4
+
+    await pages.aclose()
+
+
+async def test_paginate_without_prefetch() -> None:
+    client = make_client()
+    api = client.api_call = FakeApi(3)  # type: ignore
+
+    pages = client.paginate('users.list', prefetch=0)
+    await pages.__anext__()
+    await drain()
+    assert len(api.calls) == 1
+    assert [page['members'][0] async for page in pages] == [1, 2]
+
+
+async def test_paginate_raises_errors_in_order() -> None:
+    client = make_client(prefetch=3)
+    client.api_call = FakeApi(5, fail_at=2)  # type: ignore
+
+    pages: list[int] = []
+    with pytest.raises(RuntimeError):
+        async for page in client.paginate('users.list'):
+            pages.append(page['members'][0])
+    assert pages == [0, 1]
+
+
+async def test_paginate_stops_fetching_when_closed() -> None:
+    client = make_client(prefetch=1)
+    api = client.api_call = FakeApi(100)  # type: ignore
+
+    async for page in client.paginate('users.list'):
+        break
+    await drain()
+    calls = len(api.calls)
+    await asyncio.sleep(0.01)
+
+    assert calls == len(api.calls) < 100
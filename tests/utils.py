@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from newbial.core.events import BaseEvent
+from newbial.core.utils.config import _ConfigField
+
+__all__ = ('SampleEvent', 'drain', 'make_config')
+
+
+class SampleEvent(BaseEvent):
+    __slots__ = ('n', 'channel_id')
+    __event_name__ = 'test_sample'
+
+    def __init__(self, n: int, channel_id: str = 'C1') -> None:
+        self.n = n
+        self.channel_id = channel_id
+
+
+async def drain(rounds: int = 10) -> None:
+    # Lets scheduled tasks and callbacks run
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+def make_config(data: dict[str, Any]) -> Any:
+    """Builds a config like `Config`, without reading config.yml."""
+    config = _ConfigField()
+    config._update(data)
+    return config